@@ -0,0 +1,151 @@
+"""Headless benchmark of the control GUI chart: delete-all redraw vs. retained WeeklyChart.
+
+The "before" path is the old `_draw_chart` (`canvas.delete("all")`, then every
+bar, day label and legend item created again), run once per tick and once per
+`<Configure>` event. The "after" path is `WeeklyChart.update` per tick and its
+debounced resize handling. Two workloads:
+
+- tick     each tick only today's active time moves, as in the running app
+- resize   a drag-resize: a burst of `<Configure>` events per step, then the
+           debounced redraw; steps alternate width-only and height changes
+
+`update_idletasks()` is included so redisplay work is counted too.
+
+Tk needs a display but the window is never mapped (withdrawn, no mainloop);
+on a machine without one run it under `xvfb-run`:
+
+    xvfb-run python benchmarks/bench_chart.py --days 7 --ticks 300
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parents[0] / "src"))
+sys.path.insert(0, str(HERE))
+
+import tkinter as tk  # noqa: E402
+
+from bench_dashboard import _rows  # noqa: E402
+from timetracker.control_gui import WeeklyChart  # noqa: E402
+
+
+def _legacy_draw(c, rows):
+    c.delete("all")
+    if not rows:
+        c.create_text(10, 20, anchor="w", fill="#94a3b8", font=("Segoe UI", 10),
+                      text="No data for the last 7 days.")
+        return
+    height = int(c.winfo_height() or 180)
+    margin, bar_width, gap = 28, 16, 14
+    max_val = max(max(r["active"], r["pause"]) for r in rows) or 1
+    scale = (height - margin * 2) / max_val
+    x = margin
+    for r in reversed(rows):
+        c.create_rectangle(x, height - margin - r["active"] * scale, x + bar_width, height - margin,
+                           fill="#22c55e", width=0)
+        c.create_rectangle(x + bar_width + 4, height - margin - r["pause"] * scale,
+                           x + 2 * bar_width + 4, height - margin, fill="#f87171", width=0)
+        c.create_text(x + bar_width - 2, height - margin + 12, anchor="e", fill="#cbd5e1",
+                      font=("Segoe UI", 9), text=r["label"])
+        x += 2 * bar_width + gap
+    legend_y = 12
+    c.create_rectangle(margin, legend_y - 6, margin + 12, legend_y + 6, fill="#22c55e", width=0)
+    c.create_text(margin + 16, legend_y, anchor="w", fill="#cbd5e1", font=("Segoe UI", 9), text="Active")
+    c.create_rectangle(margin + 70, legend_y - 6, margin + 82, legend_y + 6, fill="#f87171", width=0)
+    c.create_text(margin + 86, legend_y, anchor="w", fill="#cbd5e1", font=("Segoe UI", 9), text="Pause")
+
+
+def _stats(samples):
+    samples.sort()
+    return {
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p95_ms": samples[max(0, int(len(samples) * 0.95) - 1)] * 1000,
+    }
+
+
+def _ticks(root, update, days, ticks):
+    samples = []
+    for tick in range(ticks):
+        rows = _rows(days, tick)
+        t0 = time.perf_counter()
+        update(rows)
+        root.update_idletasks()
+        samples.append(time.perf_counter() - t0)
+    return _stats(samples)
+
+
+def _resizes(root, canvas, on_configure, settle, steps, burst):
+    """Per step: resize the canvas, deliver `burst` <Configure> events, then `settle()`.
+
+    `settle` stands in for the debounce timer firing, so no wall-clock wait is timed.
+    """
+    samples = []
+    for step in range(steps):
+        if step % 2:
+            canvas.configure(height=180 + (step % 7) * 10)
+        else:
+            canvas.configure(width=420 + (step % 11) * 10)
+        root.update_idletasks()
+        t0 = time.perf_counter()
+        for _ in range(burst):
+            on_configure(None)
+        settle()
+        root.update_idletasks()
+        samples.append(time.perf_counter() - t0)
+    return _stats(samples)
+
+
+def _fire_pending(chart):
+    if chart._pending is not None:
+        chart.canvas.after_cancel(chart._pending)
+        chart._on_resized()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--days", type=int, default=7)
+    ap.add_argument("--ticks", type=int, default=300)
+    ap.add_argument("--resize-steps", type=int, default=20)
+    ap.add_argument("--burst", type=int, default=30, help="<Configure> events per resize step")
+    args = ap.parse_args(argv)
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"no Tk display available ({e}); run under xvfb-run")
+    root.withdraw()
+    rows = _rows(args.days, 0)
+
+    before_canvas = tk.Canvas(root, width=420, height=180)
+    before_canvas.pack()
+    before = {
+        "tick": _ticks(root, lambda r: _legacy_draw(before_canvas, r), args.days, args.ticks),
+        "resize": _resizes(root, before_canvas, lambda _e: _legacy_draw(before_canvas, rows),
+                           lambda: None, args.resize_steps, args.burst),
+    }
+    before_canvas.destroy()
+
+    after_canvas = tk.Canvas(root, width=420, height=180)
+    after_canvas.pack()
+    chart = WeeklyChart(after_canvas, days=args.days)
+    chart.update(rows)
+    after = {
+        "tick": _ticks(root, chart.update, args.days, args.ticks),
+        "resize": _resizes(root, after_canvas, chart._on_configure, lambda: _fire_pending(chart),
+                           args.resize_steps, args.burst),
+    }
+    root.destroy()
+
+    print(f"chart, {args.days} days: {args.ticks} ticks, {args.resize_steps} resize steps x {args.burst} events")
+    for case in ("tick", "resize"):
+        for name, res in (("redraw (before)", before[case]), ("retained (after)", after[case])):
+            print(f"  {case:<7} {name:<17} mean {res['mean_ms']:7.3f} ms   p95 {res['p95_ms']:7.3f} ms")
+        print(f"  {case:<7} speedup           {before[case]['mean_ms'] / after[case]['mean_ms']:.1f}x")
+    return {"before": before, "after": after}
+
+
+if __name__ == "__main__":
+    main()
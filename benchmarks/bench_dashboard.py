@@ -0,0 +1,104 @@
+"""Headless benchmark of the control GUI dashboard tick: full rebuild vs. retained table.
+
+The "before" path is the old `_update_dashboard` body (destroy every child of
+the table frame, rebuild header + one Frame and three Labels per day); the
+"after" path is `DashboardTable.update`. Each tick only today's active time
+moves, as in the running app. `update_idletasks()` is included so geometry
+work is counted too.
+
+Tk needs a display but the window is never mapped (withdrawn, no mainloop);
+on a machine without one run it under `xvfb-run`:
+
+    xvfb-run python benchmarks/bench_dashboard.py --days 7 --ticks 300
+"""
+import argparse
+import datetime as dt
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import tkinter as tk  # noqa: E402
+
+from timetracker.control_gui import DashboardTable  # noqa: E402
+from timetracker.duration import hms  # noqa: E402
+
+
+def _legacy_rebuild(body, rows):
+    for child in body.winfo_children():
+        child.destroy()
+    if not rows:
+        tk.Label(body, text="No recent records.").pack(fill=tk.X)
+        return
+    header = tk.Frame(body, bg="#0f172a")
+    header.pack(fill=tk.X, pady=(0, 2))
+    for txt, w in (("Day", 10), ("Active", 12), ("Pause", 12)):
+        tk.Label(header, text=txt, width=w, font=("Segoe UI Semibold", 10),
+                 fg="#e2e8f0", bg="#0f172a", anchor="w").pack(side=tk.LEFT, padx=(0, 8))
+    for item in rows:
+        row = tk.Frame(body, bg="#0f172a")
+        row.pack(fill=tk.X, pady=1)
+        for text, fg, w in ((item["label"], "#cbd5e1", 10),
+                            (hms(item["active"]), "#22c55e", 12),
+                            (hms(item["pause"]), "#f87171", 12)):
+            tk.Label(row, text=text, width=w, font=("Segoe UI", 10),
+                     fg=fg, bg="#0f172a", anchor="w").pack(side=tk.LEFT, padx=(0, 8))
+
+
+def _rows(days, tick):
+    today = dt.date.today()
+    rows = []
+    for i in range(days):
+        d = today - dt.timedelta(days=i)
+        active = 6 * 3600 + i * 97 + (tick if i == 0 else 0)
+        rows.append({"iso": d.isoformat(), "label": d.strftime("%a %d"),
+                     "active": active, "pause": 3600 + i * 13})
+    return rows
+
+
+def _measure(root, update, days, ticks):
+    samples = []
+    for tick in range(ticks):
+        rows = _rows(days, tick)
+        t0 = time.perf_counter()
+        update(rows)
+        root.update_idletasks()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return {
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p95_ms": samples[int(len(samples) * 0.95) - 1] * 1000,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--days", type=int, default=7)
+    ap.add_argument("--ticks", type=int, default=300)
+    args = ap.parse_args(argv)
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"no Tk display available ({e}); run under xvfb-run")
+    root.withdraw()
+
+    before_body = tk.Frame(root)
+    before = _measure(root, lambda rows: _legacy_rebuild(before_body, rows), args.days, args.ticks)
+    before_body.destroy()
+
+    table = DashboardTable(tk.Frame(root))
+    after = _measure(root, table.update, args.days, args.ticks)
+    root.destroy()
+
+    print(f"dashboard tick, {args.days} days x {args.ticks} ticks")
+    for name, res in (("rebuild (before)", before), ("retained (after)", after)):
+        print(f"  {name:<18} mean {res['mean_ms']:7.3f} ms   p95 {res['p95_ms']:7.3f} ms")
+    print(f"  speedup            {before['mean_ms'] / after['mean_ms']:.1f}x")
+    return {"before": before, "after": after}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Write amplification of the heartbeat journal vs. a heartbeat kept in the DB.
+
+Records "alive at t" `--ticks` times both ways and counts what each tick
+costs the process in write() syscalls and bytes handed to the kernel (Linux
+`/proc/self/io`: syscw, wchar):
+
+- journal   HeartbeatJournal.flush(): one 48-byte record rewritten in place
+- db        one committed UPDATE of a heartbeat row in the tracker's DB
+            (WAL, synchronous=NORMAL, the writer profile; its checkpoints
+            also copy the page back into the DB file and fsync)
+
+The payload per tick is one 8-byte timestamp; amplification is bytes written
+per payload byte. The per-hour figures scale one tick by the flush interval:
+every second (a 1 s tick) and every HEARTBEAT_SEC.
+
+    python benchmarks/bench_heartbeat.py [--ticks 2000]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parents[0] / "src"))
+
+_TMP = Path(tempfile.mkdtemp(prefix="tt-bench-"))
+(_TMP / ".env").write_text("", encoding="utf-8")
+os.environ.update(TT_ENV_FILE=str(_TMP / ".env"), BASE_DIR=str(_TMP),
+                  DB_PATH=str(_TMP / "sessions.db"), LOG_PATH=str(_TMP / "bench.log"))
+
+from timetracker import db  # noqa: E402
+from timetracker.config import HEARTBEAT_SEC  # noqa: E402
+from timetracker.heartbeat import HeartbeatJournal  # noqa: E402
+
+db.logger.setLevel(logging.WARNING)  # keep the migration notices out of the results
+
+PAYLOAD = 8
+
+
+def _io():
+    try:
+        with open("/proc/self/io", encoding="ascii") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+        return {"syscw": int(fields["syscw"]), "wchar": int(fields["wchar"])}
+    except OSError:
+        return None
+
+
+def _measure(tick, ticks):
+    before = _io()
+    t0 = time.perf_counter()
+    for i in range(ticks):
+        tick(1_700_000_000.0 + i)
+    elapsed = time.perf_counter() - t0
+    after = _io()
+    res = {"us_per_tick": elapsed / ticks * 1e6}
+    if before and after:
+        res["writes_per_tick"] = (after["syscw"] - before["syscw"]) / ticks
+        res["bytes_per_tick"] = (after["wchar"] - before["wchar"]) / ticks
+    return res
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--ticks", type=int, default=2000)
+    args = ap.parse_args(argv)
+
+    journal = HeartbeatJournal(path=_TMP / "heartbeat", interval=HEARTBEAT_SEC)
+
+    def journal_tick(ts):
+        journal.beat(ts)
+        journal.flush()
+
+    con = db.connect(path=_TMP / "sessions.db")
+    con.execute("CREATE TABLE heartbeat(id INTEGER PRIMARY KEY CHECK(id=1), ts REAL)")
+    con.execute("INSERT INTO heartbeat VALUES(1, 0)")
+    con.commit()
+
+    def db_tick(ts):
+        con.execute("UPDATE heartbeat SET ts=? WHERE id=1", (ts,))
+        con.commit()
+
+    results = {"journal": _measure(journal_tick, args.ticks), "db": _measure(db_tick, args.ticks)}
+    journal.stop()
+    con.close()
+
+    print(f"heartbeat write cost, {args.ticks} ticks, payload {PAYLOAD} bytes")
+    for name, res in results.items():
+        line = f"  {name:<8} {res['us_per_tick']:8.1f} us/tick"
+        if "bytes_per_tick" in res:
+            amp = res["bytes_per_tick"] / PAYLOAD
+            line += (f"  {res['writes_per_tick']:5.2f} write()s  {res['bytes_per_tick']:8.0f} B/tick"
+                     f"  amplification {amp:6.0f}x"
+                     f"  {res['bytes_per_tick'] * 3600 / 1024:8.0f} KiB/h at 1 s"
+                     f"  {res['bytes_per_tick'] * 3600 / max(HEARTBEAT_SEC, 1) / 1024:6.1f} KiB/h"
+                     f" at {HEARTBEAT_SEC} s")
+        print(line)
+    if "bytes_per_tick" in results["journal"]:
+        ratio = results["db"]["bytes_per_tick"] / results["journal"]["bytes_per_tick"]
+        print(f"  the DB writes {ratio:.0f}x the bytes per tick")
+    return results
+
+
+if __name__ == "__main__":
+    main()
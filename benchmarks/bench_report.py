@@ -0,0 +1,74 @@
+"""Benchmark `report.build` on ten years of synthetic history, with a latency target.
+
+Builds a throwaway DB from `synth` (ending with one open interval today), then times every grouping over
+the full range and over the last 30 days. Exits non-zero if any p95 is above
+--target-ms.
+
+    python benchmarks/bench_report.py [--years 10] [--runs 50] [--target-ms 50]
+"""
+import argparse
+import datetime as dt
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+SRC = HERE.parent / "src"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--runs", type=int, default=50)
+    ap.add_argument("--target-ms", type=float, default=50.0)
+    args = ap.parse_args(argv)
+
+    tmp = Path(tempfile.mkdtemp(prefix="tt-bench-"))
+    (tmp / ".env").write_text("", encoding="utf-8")
+    os.environ.update(TT_ENV_FILE=str(tmp / ".env"), BASE_DIR=str(tmp),
+                      DB_PATH=str(tmp / "sessions.db"), LOG_PATH=str(tmp / "bench.log"))
+    sys.path.insert(0, str(SRC))
+    sys.path.insert(0, str(HERE))
+    import synth
+    from timetracker import db, report
+
+    con = db.connect()
+    t0 = time.perf_counter()
+    first = dt.date.today() - dt.timedelta(days=365 * args.years)
+    n = synth.populate(con, synth.rows_since(first), seed=1)
+    print(f"{n} intervals over {args.years} years generated in {time.perf_counter() - t0:.1f}s")
+    reader = db.connect(profile="reader")
+
+    today = dt.date.today()
+    ranges = {
+        "full": ((today - dt.timedelta(days=365 * args.years)).isoformat(), today.isoformat()),
+        "30d": ((today - dt.timedelta(days=29)).isoformat(), today.isoformat()),
+    }
+    failed = False
+    results = {}
+    for rname, (start, end) in ranges.items():
+        for group in report.GROUPS:
+            samples = []
+            for _ in range(args.runs):
+                t0 = time.perf_counter()
+                report.build(reader, start, end, group)
+                samples.append((time.perf_counter() - t0) * 1000)
+            samples.sort()
+            p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+            ok = p95 <= args.target_ms
+            failed |= not ok
+            results[f"{rname}/{group}"] = {"mean_ms": statistics.fmean(samples), "p95_ms": p95}
+            print(f"  {rname:>4} by {group:<5}  mean {statistics.fmean(samples):7.2f} ms"
+                  f"   p95 {p95:7.2f} ms   {'ok' if ok else 'OVER TARGET'}")
+    reader.close()
+    con.close()
+    if failed:
+        sys.exit(f"p95 above {args.target_ms} ms target")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Schema v1 (TEXT day, REAL seconds, TEXT kind) vs. v2 (integers): size, migration, latency.
+
+For each history size a v1 DB (schema version 3) is filled by `synth.populate`,
+copied, and the copy migrated to v2 by `db.connect()`, which is timed. Both
+files are then VACUUMed and compared by `dbstat` bytes per table and index.
+Finally the hot queries are timed in their v1 form on the v1 file and in
+their v2 form on the v2 file ("view" = the v1 SQL through the `sessions`
+compatibility view on the v2 file):
+
+- open          the open-interval lookup (TrackerState.load, recover)
+- switch        close the open interval, open the next one, commit
+- breakdown     daily_breakdown over the last 30 days
+- export        one month of raw intervals in id order (export, replay checks)
+- rollup        the rollup rebuild aggregate over the whole history
+
+    python benchmarks/bench_schema.py [--rows 1e5,1e6] [--runs 200]
+"""
+import argparse
+import datetime as dt
+import logging
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parents[0] / "src"))
+sys.path.insert(0, str(HERE))
+
+_TMP = Path(tempfile.mkdtemp(prefix="tt-bench-"))
+(_TMP / ".env").write_text("", encoding="utf-8")
+os.environ.update(TT_ENV_FILE=str(_TMP / ".env"), BASE_DIR=str(_TMP),
+                  DB_PATH=str(_TMP / "sessions.db"), LOG_PATH=str(_TMP / "bench.log"))
+
+import synth  # noqa: E402
+from timetracker import db  # noqa: E402
+
+db.logger.setLevel(logging.WARNING)  # keep the migration notices out of the results
+
+END_DAY = dt.date(2024, 6, 28)
+SINCE = (END_DAY - dt.timedelta(days=29)).isoformat()
+MONTH = ((END_DAY - dt.timedelta(days=30)).isoformat(), END_DAY.isoformat())
+NOW = synth.day_intervals(END_DAY)[-1][1]  # a Friday: never empty
+
+V1 = {
+    "open": ("SELECT id, day, kind, start_ts FROM sessions WHERE end_ts IS NULL ORDER BY id DESC LIMIT 1", ()),
+    "breakdown": ("""
+        SELECT day, SUM(active_sec), SUM(pause_sec) FROM (
+            SELECT day, active_sec, pause_sec FROM daily_rollup WHERE day >= ?
+            UNION ALL
+            SELECT day, CASE WHEN kind='active' THEN ? - start_ts ELSE 0 END,
+                        CASE WHEN kind='pause' THEN ? - start_ts ELSE 0 END
+            FROM sessions WHERE end_ts IS NULL AND day >= ?
+        ) GROUP BY day ORDER BY day DESC""", (SINCE, NOW, NOW, SINCE)),
+    "export": ("SELECT id, day, start_ts, end_ts, kind FROM sessions WHERE day BETWEEN ? AND ? ORDER BY id",
+               MONTH),
+    "rollup": (db._ROLLUP_FROM_SESSIONS, ()),
+}
+V2 = {
+    "open": ("SELECT id, day, kind, start_ms FROM intervals WHERE end_ms IS NULL ORDER BY id DESC LIMIT 1", ()),
+    "breakdown": ("""
+        SELECT day, SUM(active_sec), SUM(pause_sec) FROM (
+            SELECT day, active_sec, pause_sec FROM daily_rollup WHERE day >= ?
+            UNION ALL
+            SELECT date(day * 86400, 'unixepoch'),
+                   CASE WHEN kind=0 THEN ? - start_ms / 1000.0 ELSE 0 END,
+                   CASE WHEN kind=1 THEN ? - start_ms / 1000.0 ELSE 0 END
+            FROM intervals WHERE end_ms IS NULL AND day >= ?
+        ) GROUP BY day ORDER BY day DESC""", (SINCE, NOW, NOW, db.epoch_day(SINCE))),
+    "export": ("SELECT id, day, start_ms, end_ms, kind FROM intervals WHERE day BETWEEN ? AND ? ORDER BY id",
+               tuple(db.epoch_day(d) for d in MONTH)),
+    "rollup": (db._ROLLUP_FROM_INTERVALS, ()),
+}
+
+
+def _open(path):
+    con = sqlite3.connect(str(path))
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    return con
+
+
+def _build_v1(path, rows):
+    con = _open(path)
+    for _version, migrate in db.MIGRATIONS[:3]:
+        migrate(con)
+    con.execute("PRAGMA user_version=3")
+    con.commit()
+    synth.populate(con, rows, end_day=END_DAY)  # the rollup triggers keep daily_rollup
+    con.close()
+
+
+def _sizes(path):
+    con = sqlite3.connect(str(path))
+    con.execute("VACUUM")
+    page = con.execute("PRAGMA page_size").fetchone()[0]
+    used = (con.execute("PRAGMA page_count").fetchone()[0]
+            - con.execute("PRAGMA freelist_count").fetchone()[0]) * page
+    per = dict(con.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))
+    con.close()
+    return used, per
+
+
+def _p50_us(fn, runs):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1e6
+
+
+def _switchers(con, v2):
+    state = {"ts": NOW, "kind": 0}
+
+    def switch():
+        state["ts"] += 1.0
+        state["kind"] ^= 1
+        ts, kind = state["ts"], state["kind"]
+        if v2:
+            con.execute("UPDATE intervals SET end_ms=? WHERE end_ms IS NULL", (round(ts * 1000),))
+            con.execute("INSERT INTO intervals(day,start_ms,kind) VALUES(?,?,?)",
+                        (db.epoch_day(END_DAY), round(ts * 1000), kind))
+        else:
+            con.execute("UPDATE sessions SET end_ts=? WHERE end_ts IS NULL", (ts,))
+            con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES(?,?,?)",
+                        (END_DAY.isoformat(), ts, db.KINDS[kind]))
+        con.commit()
+    return switch
+
+
+def _latencies(con, queries, runs, v2):
+    res = {}
+    for name, (sql, params) in queries.items():
+        n = max(runs // 20, 3) if name == "rollup" else runs
+        res[name] = _p50_us(lambda: con.execute(sql, params).fetchall(), n)
+    res["switch"] = _p50_us(_switchers(con, v2), runs)
+    return res
+
+
+def run(rows, runs):
+    v1_path = _TMP / f"v1-{rows}.db"
+    v2_path = _TMP / f"v2-{rows}.db"
+    _build_v1(v1_path, rows)
+    shutil.copyfile(v1_path, v2_path)
+    t0 = time.perf_counter()
+    db.connect(path=v2_path).close()
+    migrate_s = time.perf_counter() - t0
+
+    (v1_size, v1_per), (v2_size, v2_per) = _sizes(v1_path), _sizes(v2_path)
+    print(f"\n{rows:,} rows: migration {migrate_s:.2f} s")
+    print(f"  size   v1 {v1_size / 1024:9.0f} KiB   v2 {v2_size / 1024:9.0f} KiB"
+          f"   ({v2_size / v1_size:.0%})")
+    for v1_name, v2_name in (("sessions", "intervals"), ("idx_sessions_day", "idx_intervals_day"),
+                             ("daily_rollup", "daily_rollup")):
+        a, b = v1_per.get(v1_name, 0), v2_per.get(v2_name, 0)
+        print(f"    {v2_name:<18} {a / 1024:9.0f} -> {b / 1024:9.0f} KiB  ({b / max(a, 1):.0%})")
+
+    v1_con, v2_con = _open(v1_path), _open(v2_path)
+    lat = {"v1": _latencies(v1_con, V1, runs, False),
+           "v2": _latencies(v2_con, V2, runs, True),
+           "view": {name: _p50_us(lambda: v2_con.execute(sql, params).fetchall(),
+                                  max(runs // 20, 3) if name == "rollup" else runs)
+                    for name, (sql, params) in V1.items() if name in ("open", "export", "rollup")}}
+    v1_con.close()
+    v2_con.close()
+    print(f"  {'p50 us':<10} {'v1':>10} {'v2':>10} {'view':>10}")
+    for name in ("open", "switch", "breakdown", "export", "rollup"):
+        view = lat["view"].get(name)
+        print(f"  {name:<10} {lat['v1'][name]:10.1f} {lat['v2'][name]:10.1f}"
+              + (f" {view:10.1f}" if view is not None else ""))
+    return {"migrate_s": migrate_s, "v1_bytes": v1_size, "v2_bytes": v2_size, "latency_us": lat}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", default="1e5,1e6")
+    ap.add_argument("--runs", type=int, default=200)
+    args = ap.parse_args(argv)
+    return {int(float(n)): run(int(float(n)), args.runs) for n in args.rows.split(",")}
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Cold-start cost of each CLI command, from `python -X importtime`.
+
+Every command runs in a fresh interpreter against a throwaway BASE_DIR that
+already holds a small DB (so `report` does not pay for creating it). For each
+one this prints the median wall time, the total import time and the heaviest
+imports, and lists which timetracker modules were loaded.
+
+    python benchmarks/bench_startup.py [--runs 5] [--json out.json]
+
+Exits non-zero if a command's import time is over its entry in BUDGET_MS;
+tests/test_startup.py enforces the same budgets.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# command name -> argv after `python -m timetracker`
+COMMANDS = {
+    "usage": [],
+    "report": ["report", "7"],
+    "export": ["export", "daily", "-o", "{tmp}/daily.csv"],
+    "rollup": ["rollup", "check"],
+    "stats": ["stats"],
+    "status": ["status"],  # no daemon running: exits with an error, still a full start
+}
+
+# total import time budget per command, in ms (generous: CI machines are slow)
+BUDGET_MS = {
+    "usage": 60,
+    "report": 150,
+    "export": 150,
+    "rollup": 150,
+    "stats": 100,
+    "status": 200,
+}
+
+# modules a command must not pull in
+FORBIDDEN = {
+    "usage": ("sqlite3", "argparse", "dotenv", "logging.handlers", "tkinter", "multiprocessing"),
+    "report": ("tkinter", "multiprocessing", "logging.handlers", "timetracker.export", "timetracker.ipc"),
+    "export": ("tkinter", "multiprocessing", "logging.handlers", "timetracker.ipc"),
+    "rollup": ("tkinter", "multiprocessing", "timetracker.report"),
+    "stats": ("sqlite3", "tkinter", "multiprocessing", "logging.handlers"),
+    "status": ("sqlite3", "tkinter", "timetracker.report", "logging.handlers"),
+}
+
+
+def make_env(base: Path) -> dict:
+    """Environment for a child interpreter isolated under `base`."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # measure with .pyc files, as users run it
+    env.update(
+        PYTHONPATH=str(SRC),
+        TT_ENV_FILE=str(base / "none.env"),  # no .env: dotenv must not be imported
+        BASE_DIR=str(base),
+        DB_PATH=str(base / "sessions.db"),
+        LOG_PATH=str(base / "timetracker.log"),
+        IPC_ADDRESS=str(base / "tt.sock"),
+    )
+    return env
+
+
+def prepare(base: Path) -> dict:
+    """Create the DB once (schema + a row) so the measured runs only read it."""
+    env = make_env(base)
+    code = (
+        "from timetracker import db; con = db.connect(); "
+        "con.execute('INSERT INTO intervals(day,start_ms,end_ms,kind) VALUES(19723,0,60000,0)'); "  # 2024-01-01
+        "con.commit(); con.close()"
+    )
+    subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True)
+    return env
+
+
+def parse_importtime(stderr: str):
+    """Return (total_us, {module: (self_us, cumulative_us)}) from -X importtime output."""
+    modules = {}
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_part, cum_part, name = line.split("|")
+        self_us = int(self_part.split(":")[1])
+        modules[name.strip()] = (self_us, int(cum_part))
+        total += self_us
+    return total, modules
+
+
+def measure(name: str, env: dict, tmp: Path) -> dict:
+    argv = [a.format(tmp=tmp) for a in COMMANDS[name]]
+    cmd = [sys.executable, "-X", "importtime", "-m", "timetracker", *argv]
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    wall = (time.perf_counter() - t0) * 1000
+    total, modules = parse_importtime(proc.stderr)
+    return {
+        "wall_ms": wall,
+        "import_ms": total / 1000,
+        "modules": modules,
+        "timetracker": sorted(m for m in modules if m.startswith("timetracker")),
+    }
+
+
+def run(runs: int = 5):
+    tmp = Path(tempfile.mkdtemp(prefix="tt-startup-"))
+    env = prepare(tmp)
+    results = {}
+    for name in COMMANDS:
+        measure(name, env, tmp)  # warm-up: writes .pyc files
+        samples = [measure(name, env, tmp) for _ in range(runs)]
+        last = samples[-1]
+        heaviest = sorted(last["modules"].items(), key=lambda kv: kv[1][0], reverse=True)[:5]
+        results[name] = {
+            "wall_ms": statistics.median(s["wall_ms"] for s in samples),
+            "import_ms": statistics.median(s["import_ms"] for s in samples),
+            "budget_ms": BUDGET_MS[name],
+            "timetracker_modules": last["timetracker"],
+            "heaviest": [(m, us / 1000) for m, (us, _cum) in heaviest],
+            "forbidden_loaded": [m for m in FORBIDDEN[name] if m in last["modules"]],
+        }
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--json", help="write the results here")
+    args = ap.parse_args(argv)
+
+    results = run(args.runs)
+    failed = False
+    for name, r in results.items():
+        over = r["import_ms"] > r["budget_ms"] or r["forbidden_loaded"]
+        failed |= bool(over)
+        print(f"{name:<8} wall {r['wall_ms']:7.1f} ms   imports {r['import_ms']:6.1f} ms"
+              f" (budget {r['budget_ms']})   {'OVER' if over else 'ok'}")
+        print(f"         timetracker: {', '.join(m.split('.', 1)[-1] for m in r['timetracker_modules'])}")
+        print("         heaviest: " + ", ".join(f"{m} {ms:.1f}" for m, ms in r["heaviest"]))
+        if r["forbidden_loaded"]:
+            print(f"         should not import: {', '.join(r['forbidden_loaded'])}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if failed:
+        sys.exit("startup budget exceeded")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Benchmark suite for the DB and core layers, with JSON results for regression checks.
+
+For each history size a fresh DB is filled by `synth.populate`, then every case
+is timed repeatedly:
+
+- db.daily_totals               (last 30 days)
+- core.ensure_mode.noop         (cached TrackerState, nothing to do)
+- core.ensure_mode.transition   (active <-> pause, one transaction)
+- core.ensure_rollover.noop
+- control_gui._reload           (headless: no Tk root is created)
+- control_gui._weekly_rows      (per clock tick, from memory)
+- report.run                    (last 30 days, stdout discarded)
+- report.build.full             (whole history, grouped by month)
+
+and once, on the smallest DB, the cost of logging a tracker event:
+
+- log.info.sync / log.info.async   one INFO record, file + console, written on
+                                   the caller's thread vs. queued for the
+                                   QueueListener thread (logging_setup.start_async)
+- log.debug.gated                  a per-event DEBUG record at LOG_LEVEL=INFO
+- core.ensure_mode.transition.log.sync / .async
+                                   a real transition with the app's logger
+
+    python benchmarks/run.py --rows 1e3,1e5 --out bench.json
+    python benchmarks/run.py --rows 1e3,1e5 --compare bench.json   # exit 1 on regression
+
+A case regresses when its p50 exceeds the baseline's by more than --threshold
+(ratio, default 1.25) and by more than 50 us, so noise on micro-cases is not flagged.
+"""
+import argparse
+import contextlib
+import datetime as dt
+import io
+import json
+import logging
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parents[0] / "src"))
+sys.path.insert(0, str(HERE))
+
+_TMP = Path(tempfile.mkdtemp(prefix="tt-bench-"))
+(_TMP / ".env").write_text("", encoding="utf-8")
+os.environ.update(TT_ENV_FILE=str(_TMP / ".env"), BASE_DIR=str(_TMP),
+                  DB_PATH=str(_TMP / "sessions.db"), LOG_PATH=str(_TMP / "bench.log"))
+
+import synth  # noqa: E402
+from timetracker import core, db, logging_setup, report  # noqa: E402
+
+db.logger.setLevel(logging.WARNING)  # keep the migration notices out of the results table
+
+
+class _QuietLogger:
+    def info(self, *args, **kwargs):
+        pass
+
+    warning = error = exception = debug = info
+
+
+def _time(fn, repeat, min_time=0.0):
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < repeat or time.perf_counter() - start < min_time:
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    samples.sort()
+    return {
+        "n": len(samples),
+        "mean_us": statistics.fmean(samples),
+        "p50_us": samples[len(samples) // 2],
+        "p95_us": samples[max(0, int(len(samples) * 0.95) - 1)],
+    }
+
+
+def _headless_app(writer, reader):
+    from timetracker import control_gui
+    from timetracker.ipc import IpcClient
+    # a standalone window: no daemon answers on this address
+    app = control_gui.ControlApp.headless(reader, writer, IpcClient(address=str(_TMP / "no-daemon.sock")))
+    app.logger = _QuietLogger()
+    return app
+
+
+def cases(path: Path, repeat: int):
+    """Yield (name, stats) for every case against the DB at `path`."""
+    logger = _QuietLogger()
+    db.DB_PATH = path  # report.run connects through the default path
+    writer = db.connect(path=path)
+    reader = db.connect(profile="reader", path=path)
+    today = dt.date.today()
+    since = (today - dt.timedelta(days=29)).isoformat()
+
+    yield "db.daily_totals", _time(lambda: db.daily_totals(reader, since), repeat)
+
+    state = core.TrackerState.load(writer)
+    state.ensure_rollover(writer, logger)
+    yield "core.ensure_mode.noop", _time(lambda: state.ensure_mode(writer, state.kind, logger), repeat)
+    flip = {"active": "pause", "pause": "active"}
+    yield "core.ensure_mode.transition", _time(
+        lambda: state.ensure_mode(writer, flip[state.kind], logger), max(10, repeat // 10))
+    yield "core.ensure_rollover.noop", _time(lambda: state.ensure_rollover(writer, logger), repeat)
+
+    app = _headless_app(writer, reader)
+
+    def _reload():
+        app.day_cache.invalidate()
+        app._reload()
+    yield "control_gui._reload", _time(_reload, repeat)
+    yield "control_gui._weekly_rows", _time(app._weekly_rows, repeat)
+
+    def _report():
+        with contextlib.redirect_stdout(io.StringIO()):
+            report.run(30)
+    yield "report.run", _time(_report, max(10, repeat // 10))
+
+    first = db.iso_day(reader.execute("SELECT MIN(day) FROM intervals").fetchone()[0])
+    yield "report.build.full", _time(
+        lambda: report.build(reader, first, today.isoformat(), "month"), max(10, repeat // 10))
+    reader.close()
+    writer.close()
+
+
+def logging_cases(path: Path, repeat: int):
+    """Yield (name, stats) for per-event logging, sync vs. async, against the DB at `path`."""
+    root = logging_setup.get_logger()
+    devnull = open(os.devnull, "w")
+    for h in root.handlers:
+        if type(h) is logging.StreamHandler:
+            h.setStream(devnull)  # console output would measure the terminal
+    log = logging.getLogger("tt.bench")
+    writer = db.connect(path=path)
+    state = core.TrackerState.load(writer)
+    flip = {"active": "pause", "pause": "active"}
+
+    def _event():
+        log.info("Switching from %s to %s", "active", "pause")
+
+    def _transition():
+        state.ensure_mode(writer, flip[state.kind or "pause"], log)
+
+    yield "log.info.sync", _time(_event, repeat * 5)
+    yield "log.debug.gated", _time(lambda: log.debug("Switched interval: id=%s", 1), repeat * 5)
+    yield "core.ensure_mode.transition.log.sync", _time(_transition, max(10, repeat // 10))
+    logging_setup.start_async()
+    try:
+        yield "log.info.async", _time(_event, repeat * 5)
+        yield "core.ensure_mode.transition.log.async", _time(_transition, max(10, repeat // 10))
+    finally:
+        logging_setup.stop_async()
+    writer.close()
+    devnull.close()
+
+
+def _parse_rows(text):
+    return [int(float(x)) for x in text.split(",") if x.strip()]
+
+
+def compare(results, baseline, threshold):
+    """Return [(size, case, old_p50, new_p50)] for cases slower than the baseline."""
+    slower = []
+    for size, by_case in results["results"].items():
+        for name, stats in by_case.items():
+            old = baseline.get("results", {}).get(size, {}).get(name)
+            if not old:
+                continue
+            if stats["p50_us"] > old["p50_us"] * threshold and stats["p50_us"] - old["p50_us"] > 50:
+                slower.append((size, name, old["p50_us"], stats["p50_us"]))
+    return slower
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", default="1e3,1e4,1e5", help="comma-separated history sizes (up to 1e7)")
+    ap.add_argument("--repeat", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--compare", help="baseline results JSON to check against")
+    ap.add_argument("--threshold", type=float, default=1.25)
+    args = ap.parse_args(argv)
+
+    results = {
+        "meta": {
+            "created": dt.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    for rows in _parse_rows(args.rows):
+        path = _TMP / f"sessions-{rows}.db"
+        con = db.connect(path=path)
+        t0 = time.perf_counter()
+        synth.populate(con, rows, seed=args.seed)
+        con.close()
+        print(f"[{rows} rows] generated in {time.perf_counter() - t0:.1f}s")
+        by_case = results["results"][str(rows)] = {}
+        for name, stats in cases(path, args.repeat):
+            by_case[name] = stats
+            print(f"  {name:<30} p50 {stats['p50_us']:10.1f} us   p95 {stats['p95_us']:10.1f} us")
+        if "logging" not in results["results"]:
+            print("[logging]")
+            by_case = results["results"]["logging"] = {}
+            for name, stats in logging_cases(path, args.repeat):
+                by_case[name] = stats
+                print(f"  {name:<38} p50 {stats['p50_us']:10.1f} us   p95 {stats['p95_us']:10.1f} us")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"results written to {args.out}")
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        slower = compare(results, baseline, args.threshold)
+        for size, name, old, new in slower:
+            print(f"REGRESSION [{size}] {name}: p50 {old:.1f} -> {new:.1f} us")
+        if slower:
+            sys.exit(1)
+        print(f"no regressions against {args.compare}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
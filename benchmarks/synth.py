@@ -0,0 +1,146 @@
+"""Deterministic synthetic `sessions` histories for tests and benchmarks.
+
+Each day is generated from its own RNG (seeded from `seed` and the date), so a
+history of N rows is produced in two streaming passes without holding it in
+memory: the first pass walks back from `end_day` counting rows per day, the
+second regenerates those days oldest-first and trims the oldest one so exactly
+N rows come out.
+
+Shape of a day:
+- weekdays: arrive 07:30-10:00, active blocks of 15-120 min separated by short
+  breaks, a lunch pause, leave after 7-10 h;
+- weekends: usually nothing, sometimes a short session;
+- lock/unlock flapping: bursts of sub-second to few-second alternations
+  (display sleep, RDP reconnects), the thing that bloats real histories;
+- the last row (on `end_day`) can be left open (end_ts NULL).
+
+Timestamps are `days since 1970 * 86400 + seconds`, i.e. UTC-ish, which keeps
+very long (1e7-row) histories free of platform mktime limits.
+"""
+import datetime as dt
+import random
+
+_EPOCH = dt.date(1970, 1, 1)
+
+
+def _day_rng(seed: int, day: dt.date) -> random.Random:
+    return random.Random(seed * 1_000_003 + day.toordinal())
+
+
+def day_intervals(day: dt.date, seed: int = 0, flap_rate: float = 0.15):
+    """Return the closed (start_ts, end_ts, kind) intervals of one synthetic day."""
+    rng = _day_rng(seed, day)
+    base = (day - _EPOCH).days * 86400.0
+    if day.weekday() >= 5:
+        if rng.random() > 0.12:
+            return []
+        t = base + rng.uniform(10, 16) * 3600
+        end = t + rng.uniform(10, 90) * 60
+    else:
+        t = base + rng.uniform(7.5, 10) * 3600
+        end = t + rng.uniform(7, 10) * 3600
+    lunch_at = t + rng.uniform(3, 5) * 3600
+    lunch_done = False
+    out = []
+    kind = "active"
+    while t < end:
+        if kind == "active":
+            length = rng.uniform(15, 120) * 60
+        elif not lunch_done and t >= lunch_at:
+            length, lunch_done = rng.uniform(30, 60) * 60, True
+        else:
+            length = rng.uniform(1, 15) * 60
+        length = min(length, end - t) or 1.0
+        out.append((t, t + length, kind))
+        t += length
+        if rng.random() < flap_rate:
+            # a burst of lock/unlock flapping
+            for _ in range(rng.randint(2, 12)):
+                kind = "pause" if kind == "active" else "active"
+                blip = rng.uniform(0.2, 5.0)
+                out.append((t, t + blip, kind))
+                t += blip
+        kind = "pause" if kind == "active" else "active"
+    return out
+
+
+def rows_since(first_day: dt.date, seed: int = 0, end_day: dt.date | None = None,
+               flap_rate: float = 0.15) -> int:
+    """Number of rows `generate` needs to cover `first_day`..`end_day`."""
+    end_day = end_day or dt.date.today()
+    total, day = 0, first_day
+    while day <= end_day:
+        total += len(day_intervals(day, seed, flap_rate))
+        day += dt.timedelta(days=1)
+    return total
+
+
+def generate(rows: int, seed: int = 0, end_day: dt.date | None = None,
+             open_tail: bool = True, flap_rate: float = 0.15):
+    """Yield exactly `rows` (day, start_ts, end_ts, kind) tuples, oldest first.
+
+    History ends on `end_day` (default today); with `open_tail` its last row
+    has end_ts None, like a running tracker.
+    """
+    if rows <= 0:
+        return
+    end_day = end_day or dt.date.today()
+    # pass 1: walk back until enough rows exist (only per-day counts are kept)
+    counts = []
+    total, day = 0, end_day
+    while total < rows:
+        n = len(day_intervals(day, seed, flap_rate))
+        counts.append(n)
+        total += n
+        day -= dt.timedelta(days=1)
+        if day.year < 2:
+            raise ValueError(f"cannot fit {rows} rows before {end_day}")
+    first_day = day + dt.timedelta(days=1)
+    skip = total - rows  # trimmed from the oldest day
+
+    # pass 2: regenerate oldest-first
+    emitted = 0
+    day = first_day
+    while day <= end_day:
+        iso = day.isoformat()
+        for start, end, kind in day_intervals(day, seed, flap_rate):
+            if skip:
+                skip -= 1
+                continue
+            emitted += 1
+            if emitted == rows and open_tail:
+                end = None
+            yield iso, start, end, kind
+        day += dt.timedelta(days=1)
+
+
+def _as_v2(row):
+    day, start, end, kind = row
+    return ((dt.date.fromisoformat(day) - _EPOCH).days, round(start * 1000),
+            None if end is None else round(end * 1000), 0 if kind == "active" else 1)
+
+
+def populate(con, rows: int, seed: int = 0, end_day: dt.date | None = None,
+             open_tail: bool = True, chunk: int = 50_000) -> int:
+    """Insert a synthetic history into `con` in chunked transactions; returns the row count.
+
+    Works on both layouts: the v1 `sessions` table, or schema v2's `intervals`
+    table directly (not row by row through the `sessions` view's triggers).
+    """
+    v2 = con.execute("SELECT type FROM sqlite_master WHERE name='sessions'").fetchone() == ("view",)
+    sql = ("INSERT INTO intervals(day,start_ms,end_ms,kind) VALUES(?,?,?,?)" if v2
+           else "INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES(?,?,?,?)")
+    buf = []
+    count = 0
+    for row in generate(rows, seed, end_day, open_tail):
+        buf.append(_as_v2(row) if v2 else row)
+        if len(buf) >= chunk:
+            con.executemany(sql, buf)
+            con.commit()
+            count += len(buf)
+            buf.clear()
+    if buf:
+        con.executemany(sql, buf)
+        con.commit()
+        count += len(buf)
+    return count
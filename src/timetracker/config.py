@@ -1,6 +1,5 @@
 import os
 from pathlib import Path
-from dotenv import load_dotenv
 
 """Environment-only configuration loader.
 
@@ -10,16 +9,50 @@ Reads settings from `.env` (if present) or environment variables:
 - LOG_PATH
 - ASSET_DIR
 - ASSET_ICON
+- DB_CACHE_SIZE   (SQLite `cache_size` pragma; negative = KiB, default -8000)
+- DB_MMAP_SIZE    (SQLite `mmap_size` in bytes, default 0 = off)
+- DB_BUSY_TIMEOUT (ms a connection waits on a locked DB, default 5000)
+- METRICS_FLUSH_SEC (how often hot-path metrics are written, default 60)
+- IPC_ADDRESS     (daemon control endpoint: a Unix socket path, or a named pipe
+                   on Windows; default BASE_DIR/tt.sock, pipe timetracker-<user>)
+- LOG_LEVEL       (INFO by default; DEBUG adds one line per DB write/session event)
+- LOG_ASYNC       (1 = long-running commands log through a background thread, default 1)
+- HEARTBEAT_SEC   (how often the tracker records "still alive" in BASE_DIR/heartbeat,
+                   so an interval left open by a crash is closed there; default 60, 0 = off)
+- EVENT_DEBOUNCE_SEC (lock/unlock flaps shorter than this leave no interval;
+                   default 2, fractions such as 0.5 allowed, 0 = write every event)
+- IDLE_THRESHOLD_SEC (seconds without keyboard/mouse input before tracking
+                   pauses, backdated to the last input; default 300, 0 = off)
+- LINUX_EVENT_SOURCE (Linux session events: "logind", a file/FIFO path, or empty
+                   for logind when available, else the FIFO BASE_DIR/events)
 
 If a variable is missing, sensible defaults under `~/.timetracker` are used.
+
+Importing this module has no side effects beyond reading `.env`: python-dotenv
+is only imported when there is a file to load, and nothing is created on disk
+until `ensure_dirs()` (or the first DB/log/metrics write) needs it.
 """
 
+
+def _find_env_file():
+    """The `.env` python-dotenv's `load_dotenv()` would pick: nearest one above this file."""
+    for directory in Path(__file__).resolve().parents:
+        candidate = directory / ".env"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def _load_env_file(path):
+    if path is None or not Path(path).is_file():
+        return
+    from dotenv import load_dotenv
+    load_dotenv(path, override=False)
+
+
 # Allow overriding the .env location via TT_ENV_FILE (useful for tests).
 _ENV_FILE = os.environ.get("TT_ENV_FILE")
-if _ENV_FILE:
-    load_dotenv(Path(_ENV_FILE).expanduser(), override=False)
-else:
-    load_dotenv()
+_load_env_file(Path(_ENV_FILE).expanduser() if _ENV_FILE else _find_env_file())
 
 DEFAULT_BASE = Path.home() / ".timetracker"
 
@@ -32,11 +65,44 @@ def _path_env(key: str, default: Path) -> Path:
     return Path(expanded).expanduser()
 
 
+def _int_env(key: str, default: int) -> int:
+    val = os.environ.get(key)
+    if not val:
+        return default
+    try:
+        return int(val)
+    except ValueError:
+        return default
+
+
+def _float_env(key: str, default: float) -> float:
+    val = os.environ.get(key)
+    if not val:
+        return default
+    try:
+        return float(val)
+    except ValueError:
+        return default
+
+
 BASE_DIR = _path_env("BASE_DIR", DEFAULT_BASE)
 DB_PATH = _path_env("DB_PATH", BASE_DIR / "sessions.db")
 LOG_PATH = _path_env("LOG_PATH", BASE_DIR / "timetracker.log")
 ASSET_DIR = _path_env("ASSET_DIR", BASE_DIR / "assets")
 ASSET_ICON = _path_env("ASSET_ICON", ASSET_DIR / "icon.ico")
+DB_CACHE_SIZE = _int_env("DB_CACHE_SIZE", -8000)
+DB_MMAP_SIZE = _int_env("DB_MMAP_SIZE", 0)
+DB_BUSY_TIMEOUT = _int_env("DB_BUSY_TIMEOUT", 5000)
+METRICS_FLUSH_SEC = _int_env("METRICS_FLUSH_SEC", 60)
+IPC_ADDRESS = os.environ.get("IPC_ADDRESS", "")
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_ASYNC = _int_env("LOG_ASYNC", 1)
+HEARTBEAT_SEC = _float_env("HEARTBEAT_SEC", 60)
+EVENT_DEBOUNCE_SEC = _float_env("EVENT_DEBOUNCE_SEC", 2)
+IDLE_THRESHOLD_SEC = _float_env("IDLE_THRESHOLD_SEC", 300)
+LINUX_EVENT_SOURCE = os.environ.get("LINUX_EVENT_SOURCE", "")
+
 
-# Ensure base dir exists
-BASE_DIR.mkdir(parents=True, exist_ok=True)
+def ensure_dirs() -> None:
+    """Create BASE_DIR; long-running commands call this once at startup."""
+    BASE_DIR.mkdir(parents=True, exist_ok=True)
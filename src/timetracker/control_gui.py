@@ -1,23 +1,29 @@
 import datetime as dt
+import threading
 import time
 import tkinter as tk
+from contextlib import nullcontext
 from tkinter import font as tkfont
+from tkinter import messagebox
 from pathlib import Path
 
-from .db import connect, current_mode, daily_totals
-from .core import ensure_rollover, ensure_mode
+from .counter import ActiveCounter
+from .duration import hms
+from .db import ChangeWatcher, DayTotalsCache, connect
+from .core import TrackerState
+from .ipc import DaemonUnavailable, IpcClient, IpcError, NoReply
 from .logging_setup import get_logger
+from .metrics import timed
 from .config import ASSET_ICON
 
 
-def _fmt(sec: float) -> str:
-    sec = int(round(sec))
-    h, m, s = sec // 3600, (sec % 3600) // 60, sec % 60
-    return f"{h:02d}:{m:02d}:{s:02d}"
-
-
 class RoundedButton(tk.Canvas):
-    """Minimal rounded button implemented on a Canvas."""
+    """Minimal rounded button implemented on a Canvas.
+
+    The corner arcs, fill rectangles and label are created once; a new text
+    or style moves and recolours them, and setting the same ones again draws
+    nothing.
+    """
     def __init__(self, master, textvariable, command, radius=12, padx=14, pady=8, **kwargs):
         self.bg_fill = kwargs.pop("bg_fill", "#22c55e")
         self.fg_fill = kwargs.pop("fg_fill", "#0b1f10")
@@ -29,19 +35,30 @@ class RoundedButton(tk.Canvas):
         # tkfont.Font expects `root`, not `master` (Python 3.12/Windows is strict)
         self.font = tkfont.Font(root=master, family="Segoe UI", size=11, weight="bold")
         super().__init__(master, highlightthickness=0, bd=0, bg=kwargs.get("bg", "#0f172a"))
+        # a rounded rectangle: four quarter arcs and two overlapping rectangles
+        self._fill_items = [
+            self.create_arc(0, 0, 0, 0, start=start, extent=90, outline="") for start in (90, 0, 180, 270)
+        ] + [self.create_rectangle(0, 0, 0, 0, outline="") for _ in range(2)]
+        self._label = self.create_text(0, 0, font=self.font)
+        self._drawn = None  # (text, bg_fill, fg_fill) on screen
         self.textvariable.trace_add("write", lambda *args: self._draw())
         self.bind("<Button-1>", self._on_click)
-        self.bind("<Configure>", lambda e: self._draw())
         self._draw()
 
-    def _rounded_rect(self, x1, y1, x2, y2, r, fill):
-        # Draw a rounded rectangle using arcs and rectangles
-        self.create_arc(x1, y1, x1 + 2 * r, y1 + 2 * r, start=90, extent=90, outline="", fill=fill)
-        self.create_arc(x2 - 2 * r, y1, x2, y1 + 2 * r, start=0, extent=90, outline="", fill=fill)
-        self.create_arc(x1, y2 - 2 * r, x1 + 2 * r, y2, start=180, extent=90, outline="", fill=fill)
-        self.create_arc(x2 - 2 * r, y2 - 2 * r, x2, y2, start=270, extent=90, outline="", fill=fill)
-        self.create_rectangle(x1 + r, y1, x2 - r, y2, outline="", fill=fill)
-        self.create_rectangle(x1, y1 + r, x2, y2 - r, outline="", fill=fill)
+    def _layout(self, w, h):
+        r = self.radius
+        boxes = (
+            (0, 0, 2 * r, 2 * r),
+            (w - 2 * r, 0, w, 2 * r),
+            (0, h - 2 * r, 2 * r, h),
+            (w - 2 * r, h - 2 * r, w, h),
+            (r, 0, w - r, h),
+            (0, r, w, h - r),
+        )
+        for item, box in zip(self._fill_items, boxes):
+            self.coords(item, *box)
+        self.coords(self._label, w / 2, h / 2)
+        self.config(width=w, height=h)
 
     def set_style(self, bg_fill: str, fg_fill: str):
         self.bg_fill = bg_fill
@@ -49,31 +66,269 @@ class RoundedButton(tk.Canvas):
         self._draw()
 
     def _draw(self):
-        self.delete("all")
         text = self.textvariable.get()
-        txt_w = self.font.measure(text)
-        txt_h = self.font.metrics("linespace")
-        w = txt_w + self.padx * 2
-        h = txt_h + self.pady * 2
-        self.config(width=w, height=h)
-        self._rounded_rect(0, 0, w, h, self.radius, self.bg_fill)
-        self.create_text(w / 2, h / 2, text=text, fill=self.fg_fill, font=self.font)
+        drawn = self._drawn or (None, None, None)
+        if (text, self.bg_fill, self.fg_fill) == drawn:
+            return
+        if text != drawn[0]:
+            w = self.font.measure(text) + self.padx * 2
+            h = self.font.metrics("linespace") + self.pady * 2
+            self._layout(w, h)
+            self.itemconfigure(self._label, text=text)
+        if self.bg_fill != drawn[1]:
+            for item in self._fill_items:
+                self.itemconfigure(item, fill=self.bg_fill)
+        if self.fg_fill != drawn[2]:
+            self.itemconfigure(self._label, fill=self.fg_fill)
+        self._drawn = (text, self.bg_fill, self.fg_fill)
 
     def _on_click(self, _event):
         if self.command:
             self.command()
 
 
+def _row_texts(rows):
+    return [(r["label"], hms(r["active"]), hms(r["pause"])) for r in rows]
+
+
+class DashboardTable:
+    """Day / Active / Pause table whose widgets persist between updates.
+
+    Each row is three grid Labels bound to StringVars. `update(rows)` only sets
+    the variables whose text changed and only creates or destroys row widgets
+    when the number of days changes; it returns the number of cells touched.
+    """
+
+    COLUMNS = (("Day", 10, "#cbd5e1"), ("Active", 12, "#22c55e"), ("Pause", 12, "#f87171"))
+
+    def __init__(self, master):
+        self.master = master
+        self._texts = []
+        self._slots = []  # per row: ([StringVar] * 3, [Label] * 3)
+        self.header = []
+        for col, (txt, w, _fg) in enumerate(self.COLUMNS):
+            lbl = tk.Label(
+                master,
+                text=txt,
+                width=w,
+                font=("Segoe UI Semibold", 10),
+                fg="#e2e8f0",
+                bg="#0f172a",
+                anchor="w",
+            )
+            self.header.append(lbl)
+        self.empty_label = tk.Label(
+            master,
+            text="No recent records.",
+            font=("Segoe UI", 10),
+            fg="#94a3b8",
+            bg="#0f172a",
+            anchor="w",
+        )
+        self._show_empty(True)
+
+    def _show_empty(self, empty: bool):
+        if empty:
+            for lbl in self.header:
+                lbl.grid_remove()
+            self.empty_label.grid(row=0, column=0, columnspan=len(self.COLUMNS), sticky="w")
+        else:
+            self.empty_label.grid_remove()
+            for col, lbl in enumerate(self.header):
+                lbl.grid(row=0, column=col, sticky="w", padx=(0, 8), pady=(0, 2))
+
+    def _add_slot(self):
+        row = len(self._slots) + 1
+        tk_vars, labels = [], []
+        for col, (_txt, w, fg) in enumerate(self.COLUMNS):
+            var = tk.StringVar(master=self.master)
+            lbl = tk.Label(
+                self.master,
+                textvariable=var,
+                width=w,
+                font=("Segoe UI", 10),
+                fg=fg,
+                bg="#0f172a",
+                anchor="w",
+            )
+            lbl.grid(row=row, column=col, sticky="w", padx=(0, 8), pady=1)
+            tk_vars.append(var)
+            labels.append(lbl)
+        self._slots.append((tk_vars, labels))
+        self._texts.append((None,) * len(self.COLUMNS))
+
+    def _drop_slot(self):
+        _vars, labels = self._slots.pop()
+        self._texts.pop()
+        for lbl in labels:
+            lbl.destroy()
+
+    def update(self, rows) -> int:
+        new = _row_texts(rows)
+        if bool(new) != bool(self._texts):
+            self._show_empty(not new)
+        while len(self._slots) < len(new):
+            self._add_slot()
+        while len(self._slots) > len(new):
+            self._drop_slot()
+        touched = 0
+        for i, texts in enumerate(new):
+            old = self._texts[i]
+            if texts == old:
+                continue
+            tk_vars = self._slots[i][0]
+            for col, txt in enumerate(texts):
+                if txt != old[col]:
+                    tk_vars[col].set(txt)
+                    touched += 1
+            self._texts[i] = texts
+        return touched
+
+
+class WeeklyChart:
+    """Active/pause bar chart that creates its Canvas items once and moves them.
+
+    Bars, day labels and the legend are created when first needed; later
+    updates only call `coords`/`itemconfigure` for items whose geometry or text
+    changed. The x positions depend only on the number of days and are
+    recomputed only when it changes; the bar heights follow the canvas height.
+    `<Configure>` bursts during a resize are debounced into a single update,
+    which touches nothing when only the width changed.
+    """
+
+    MARGIN = 28
+    BAR_WIDTH = 16
+    GAP = 14
+    DEBOUNCE_MS = 80
+
+    def __init__(self, canvas: tk.Canvas, days: int = 7):
+        self.canvas = canvas
+        self._rows = []
+        self._groups = []  # per day: [active_id, pause_id, label_id]
+        self._item_state = {}  # item id -> last coords / text applied
+        self._layout_key = None
+        self._xs = []
+        self._pending = None
+        self.layouts = 0
+        c = canvas
+        self._empty = c.create_text(
+            10,
+            20,
+            anchor="w",
+            fill="#94a3b8",
+            font=("Segoe UI", 10),
+            text=f"No data for the last {days} days.",
+            state="hidden",
+        )
+        m, legend_y = self.MARGIN, 12
+        self._legend = [
+            c.create_rectangle(m, legend_y - 6, m + 12, legend_y + 6, fill="#22c55e", width=0),
+            c.create_text(m + 16, legend_y, anchor="w", fill="#cbd5e1", font=("Segoe UI", 9), text="Active"),
+            c.create_rectangle(m + 70, legend_y - 6, m + 82, legend_y + 6, fill="#f87171", width=0),
+            c.create_text(m + 86, legend_y, anchor="w", fill="#cbd5e1", font=("Segoe UI", 9), text="Pause"),
+        ]
+        canvas.bind("<Configure>", self._on_configure)
+
+    def _on_configure(self, _event):
+        if self._pending is not None:
+            self.canvas.after_cancel(self._pending)
+        self._pending = self.canvas.after(self.DEBOUNCE_MS, self._on_resized)
+
+    def _on_resized(self):
+        self._pending = None
+        self.update(self._rows)
+
+    def _set_coords(self, item, *coords):
+        if self._item_state.get(item) != coords:
+            self.canvas.coords(item, *coords)
+            self._item_state[item] = coords
+
+    def _set_text(self, item, text):
+        key = (item, "text")
+        if self._item_state.get(key) != text:
+            self.canvas.itemconfigure(item, text=text)
+            self._item_state[key] = text
+
+    def _resize_groups(self, n):
+        c = self.canvas
+        while len(self._groups) < n:
+            self._groups.append([
+                c.create_rectangle(0, 0, 0, 0, fill="#22c55e", width=0),
+                c.create_rectangle(0, 0, 0, 0, fill="#f87171", width=0),
+                c.create_text(0, 0, anchor="e", fill="#cbd5e1", font=("Segoe UI", 9), text=""),
+            ])
+        while len(self._groups) > n:
+            for item in self._groups.pop():
+                c.delete(item)
+                self._item_state.pop(item, None)
+                self._item_state.pop((item, "text"), None)
+
+    def _set_visible(self, has_rows: bool):
+        c = self.canvas
+        c.itemconfigure(self._empty, state="hidden" if has_rows else "normal")
+        for item in self._legend:
+            c.itemconfigure(item, state="normal" if has_rows else "hidden")
+
+    def update(self, rows):
+        self._rows = rows
+        if not rows:
+            if self._groups:
+                self._resize_groups(0)
+            if self._layout_key != ():
+                self._set_visible(False)
+                self._layout_key = ()
+            return
+        height = int(self.canvas.winfo_height() or 180)
+        key = len(rows)
+        if key != self._layout_key:
+            if not self._layout_key:
+                self._set_visible(True)
+            self._resize_groups(len(rows))
+            group_w = 2 * self.BAR_WIDTH + self.GAP
+            self._xs = [self.MARGIN + i * group_w for i in range(len(rows))]
+            self._layout_key = key
+            self.layouts += 1
+
+        margin, bar_w = self.MARGIN, self.BAR_WIDTH
+        base = height - margin
+        max_val = max(max(r["active"], r["pause"]) for r in rows) or 1
+        scale = (height - margin * 2) / max_val
+        # Reverse order so newest days render on the right (left -> older, right -> newer)
+        for x, group, r in zip(self._xs, self._groups, reversed(rows)):
+            active_id, pause_id, label_id = group
+            self._set_coords(active_id, x, base - r["active"] * scale, x + bar_w, base)
+            self._set_coords(pause_id, x + bar_w + 4, base - r["pause"] * scale, x + 2 * bar_w + 4, base)
+            self._set_coords(label_id, x + bar_w - 2, base + 12)
+            self._set_text(label_id, r["label"])
+
+
 class ControlApp:
-    """Small GUI to show current session time and toggle active/pause."""
+    """Small GUI to show current session time and toggle active/pause.
+
+    The clock ticks every second from memory (TrackerState + ActiveCounter +
+    cached closed totals). The DB is read again only when `ChangeWatcher`
+    reports a write (one `PRAGMA data_version` per WATCH_MS), after our own
+    toggle, or when the date changes.
+
+    Toggles go to the tracker daemon over IPC so every write happens in its
+    process. Without a daemon the window only reads: it never rolls the day
+    over or opens an interval by itself, and writes through its own
+    connection only when the user toggles and no daemon can be reached.
+    Whether one is running comes from a status subscription on a background
+    thread, never from a round trip on the Tk thread.
+    """
+
+    # dashboard range; closed days are cached, so 30 or 90 cost the same per tick
+    DASHBOARD_DAYS = 7
+    # how often to ask SQLite whether another process wrote
+    WATCH_MS = 1000
+    # how long to wait before subscribing again after the daemon went away
+    DAEMON_RETRY_SEC = 2.0
 
     def __init__(self):
-        self.logger = get_logger("tt.control")
-        self.con = connect()
-        self._closed = False
-        self._last_rows = []
-
-        ensure_rollover(self.con, self.logger)
+        # dashboard queries use a read-only connection so they never block the tracker
+        self._init_state(IpcClient(timeout=2.0), connect(profile="reader"))
+        threading.Thread(target=self._follow_daemon, name="tt-control-daemon", daemon=True).start()
 
         self.root = tk.Tk()
         self.root.title("TimeTracker Control")
@@ -182,7 +437,7 @@ class ControlApp:
         # Chart block
         self.chart_heading = tk.Label(
             self.dashboard_frame,
-            text="Last 7 days chart (active vs pause)",
+            text=f"Last {self.DASHBOARD_DAYS} days chart (active vs pause)",
             font=("Segoe UI Semibold", 10),
             fg="#cbd5e1",
             bg="#0f172a",
@@ -197,12 +452,12 @@ class ControlApp:
             highlightthickness=0,
         )
         self.chart_canvas.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
-        self.chart_canvas.bind("<Configure>", lambda _e: self._draw_chart(self._last_rows))
+        self.chart = WeeklyChart(self.chart_canvas, days=self.DASHBOARD_DAYS)
 
         # Table block
         self.dashboard_heading = tk.Label(
             self.dashboard_frame,
-            text="Table (last 7 days)",
+            text=f"Table (last {self.DASHBOARD_DAYS} days)",
             font=("Segoe UI Semibold", 10),
             fg="#cbd5e1",
             bg="#0f172a",
@@ -212,42 +467,104 @@ class ControlApp:
         self.dashboard_heading.pack(fill=tk.X)
         self.dashboard_body = tk.Frame(self.dashboard_frame, bg="#0f172a")
         self.dashboard_body.pack(fill=tk.BOTH, expand=True)
+        self.table = DashboardTable(self.dashboard_body)
 
+        self._rendered_mode = self._rendered_over = None  # what _render last applied
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self._reload()
         self._tick()
+        self.root.after(self.WATCH_MS, self._watch)
+
+    def _init_state(self, daemon, reader, writer=None):
+        """Everything but the widgets: DB connections, state, caches, daemon link."""
+        self.logger = get_logger("tt.control")
+        self.daemon = daemon
+        # probed once before the window exists; _follow_daemon keeps it current
+        self._daemon_up = daemon.available()
+        self._stop = threading.Event()
+        self._con = writer  # opened on the first toggle made without a daemon
+        self.reader = reader
+        self._closed = False
+        self.state = TrackerState()
+        self.day_cache = DayTotalsCache(self.DASHBOARD_DAYS)
+        self.counter = ActiveCounter(lambda: nullcontext(self.reader), resync_every=None)
+        # our own toggles and the daemon's transitions (seen by resync) reload it
+        self.state.listeners.append(lambda _con, _state: self.counter.invalidate())
+        self.watcher = ChangeWatcher(self.reader)
+        self._closed_days = {}
+        self._loaded_day = None
+
+    @classmethod
+    def headless(cls, reader, writer=None, daemon=None) -> "ControlApp":
+        """A loaded app without a Tk root or the daemon thread, for benchmarks and tests.
+
+        `_reload()`, `_weekly_rows()` and `_active_today_sec()` work as in the
+        window; nothing is drawn.
+        """
+        app = cls.__new__(cls)
+        app._init_state(daemon or IpcClient(timeout=2.0), reader, writer)
+        app._reload()
+        return app
 
     def _active_today_sec(self) -> int:
-        today = dt.date.today().isoformat()
-        rows = daily_totals(self.con, today, now_ts=time.time())
-        if rows:
-            return int(rows[0][1] or 0)
-        return 0
+        return int(self.counter.seconds())
 
     def _tick(self):
         if self._closed:
             return
         try:
-            ensure_rollover(self.con, self.logger)
-            secs = self._active_today_sec()
-            mode = current_mode(self.con) or "none"
+            with timed("gui.tick"):
+                if self._loaded_day != dt.date.today():
+                    self._reload()
+                self._render()
+        except Exception:
+            self.logger.exception("Tick/update failed")
+        finally:
+            self.root.after(1000, self._tick)
+
+    def _watch(self):
+        if self._closed:
+            return
+        try:
+            if self.watcher.changed():
+                self._reload()
+                self._render()
+        except Exception:
+            self.logger.exception("Change check failed")
+        finally:
+            self.root.after(self.WATCH_MS, self._watch)
+
+    @timed("gui.reload")
+    def _reload(self):
+        # read-only: the tracker daemon (or a toggle of ours) writes; a daemon
+        # that is starting up or shutting down must not race a rollover from here
+        self.state.resync(self.reader)
+        today = dt.date.today()
+        self._closed_days = self.day_cache.closed_totals(self.reader, today)
+        self._loaded_day = today
+        self.counter.invalidate()
+
+    def _render(self):
+        secs = self._active_today_sec()
+        mode = self.state.kind or "none"
+        self.status_time_var.set(hms(secs))
+        # the rest only changes on a transition or once a day: leave it alone per tick
+        over = secs > 7 * 3600
+        if over != self._rendered_over:
+            self._rendered_over = over
             # Highlight only the time in red if over 7 hours
-            self.status_time_var.set(_fmt(secs))
-            self.status_time_label.configure(fg="#ef4444" if secs > 7 * 3600 else "#e5e7eb")
-            if secs > 7 * 3600:
+            self.status_time_label.configure(fg="#ef4444" if over else "#e5e7eb")
+            if over:
                 self.reminder_var.set("🙂 Take a short break and relax.")
-                if not self.reminder_frame.winfo_ismapped():
-                    self.reminder_frame.pack(fill=tk.X, pady=(2, 6), before=self.mode_label)
+                self.reminder_frame.pack(fill=tk.X, pady=(2, 6), before=self.mode_label)
             else:
                 self.reminder_var.set("")
-                if self.reminder_frame.winfo_ismapped():
-                    self.reminder_frame.pack_forget()
+                self.reminder_frame.pack_forget()
+        if mode != self._rendered_mode:
+            self._rendered_mode = mode
             self.mode_var.set(f"Status: {mode}")
             self._apply_mode_style(mode)
-            self._update_dashboard()
-        except Exception:
-            self.logger.exception("Tick/update failed")
-        finally:
-            self.root.after(1000, self._tick)
+        self._update_dashboard()
 
     def _apply_mode_style(self, mode: str):
         if mode == "active":
@@ -261,19 +578,53 @@ class ControlApp:
 
     def on_toggle(self):
         try:
-            ensure_rollover(self.con, self.logger)
-            mode = current_mode(self.con)
-            if mode == "active":
-                ensure_mode(self.con, "pause", self.logger)
-            else:
-                ensure_mode(self.con, "active", self.logger)
+            try:
+                self.daemon.request("toggle")
+                self._daemon_up = True
+            except NoReply as e:
+                # the daemon got the toggle and may still apply it: a second
+                # write from here would toggle twice, so only show what the DB says
+                self.logger.warning("Toggle not confirmed by the tracker daemon: %s", e)
+                messagebox.showwarning("TimeTracker", f"The tracker did not confirm the toggle:\n{e}")
+            except DaemonUnavailable:
+                self._daemon_up = False
+                # no daemon: the user asked for this switch, so write it here
+                # (ensure_mode splits a day-old interval at midnight first)
+                con = self._writer()
+                self.state.resync(con)
+                if self.state.kind == "active":
+                    self.state.ensure_mode(con, "pause", self.logger)
+                else:
+                    self.state.ensure_mode(con, "active", self.logger)
+            self._reload()
+            self._render()
         except Exception:
             self.logger.exception("Failed to toggle mode")
 
+    def _follow_daemon(self):
+        while not self._stop.is_set():
+            try:
+                for _event in self.daemon.subscribe(self._stop):
+                    self._daemon_up = True
+            except IpcError:
+                pass  # no daemon listening
+            except Exception:
+                self.logger.exception("Daemon subscription failed")
+            self._daemon_up = False
+            self._stop.wait(self.DAEMON_RETRY_SEC)
+
+    def _writer(self):
+        if self._con is None:
+            self._con = connect()
+        return self._con
+
     def on_close(self):
         self._closed = True
+        self._stop.set()
         try:
-            self.con.close()
+            self.reader.close()
+            if self._con is not None:
+                self._con.close()
         except Exception:
             self.logger.exception("Failed to close DB connection")
         self.root.destroy()
@@ -284,27 +635,20 @@ class ControlApp:
     def _weekly_rows(self):
         now_ts = time.time()
         today = dt.date.today()
-        start_day = today - dt.timedelta(days=6)
-        days = [start_day + dt.timedelta(days=i) for i in range(7)]
-
-        try:
-            raw = self.con.execute(
-                """
-                SELECT day,
-                       SUM(CASE WHEN kind='active' THEN (COALESCE(end_ts, ?) - start_ts) ELSE 0 END) AS active_sec,
-                       SUM(CASE WHEN kind='pause'  THEN (COALESCE(end_ts, ?) - start_ts) ELSE 0 END) AS pause_sec
-                FROM sessions
-                WHERE day >= ?
-                GROUP BY day
-                ORDER BY day DESC
-                """,
-                (now_ts, now_ts, start_day.isoformat()),
-            ).fetchall()
-        except Exception:
-            self.logger.exception("Failed to load weekly rows")
-            raw = []
+        start_day = today - dt.timedelta(days=self.DASHBOARD_DAYS - 1)
+        days = [start_day + dt.timedelta(days=i) for i in range(self.DASHBOARD_DAYS)]
+
+        by_day = dict(self._closed_days)
+        if self.state.kind and self.state.day:
+            # the open interval is the only part that moves between reloads
+            elapsed = max(0.0, now_ts - self.state.start_ts)
+            active_sec, pause_sec = by_day.get(self.state.day, (0, 0))
+            if self.state.kind == "active":
+                active_sec += elapsed
+            else:
+                pause_sec += elapsed
+            by_day[self.state.day] = (active_sec, pause_sec)
 
-        by_day = {d: (a or 0, p or 0) for d, a, p in raw}
         rows = []
         for d in days:
             iso = d.isoformat()
@@ -323,126 +667,12 @@ class ControlApp:
             )
         return rows
 
+    @timed("gui.dashboard")
     def _update_dashboard(self):
-        for child in self.dashboard_body.winfo_children():
-            child.destroy()
         rows = sorted(self._weekly_rows(), key=lambda r: r["iso"], reverse=True)
-        self._last_rows = rows
-
-        self._draw_chart(rows)
 
-        if not rows:
-            tk.Label(
-                self.dashboard_body,
-                text="No recent records.",
-                font=("Segoe UI", 10),
-                fg="#94a3b8",
-                bg="#0f172a",
-                anchor="w",
-            ).pack(fill=tk.X)
-            return
-        header = tk.Frame(self.dashboard_body, bg="#0f172a")
-        header.pack(fill=tk.X, pady=(0, 2))
-        for txt, w in (("Day", 10), ("Active", 12), ("Pause", 12)):
-            tk.Label(
-                header,
-                text=txt,
-                width=w,
-                font=("Segoe UI Semibold", 10),
-                fg="#e2e8f0",
-                bg="#0f172a",
-                anchor="w",
-            ).pack(side=tk.LEFT, padx=(0, 8))
-        for item in rows:
-            row = tk.Frame(self.dashboard_body, bg="#0f172a")
-            row.pack(fill=tk.X, pady=1)
-            tk.Label(
-                row,
-                text=item["label"],
-                width=10,
-                font=("Segoe UI", 10),
-                fg="#cbd5e1",
-                bg="#0f172a",
-                anchor="w",
-            ).pack(side=tk.LEFT, padx=(0, 8))
-            tk.Label(
-                row,
-                text=_fmt(item["active"]),
-                width=12,
-                font=("Segoe UI", 10),
-                fg="#22c55e",
-                bg="#0f172a",
-                anchor="w",
-            ).pack(side=tk.LEFT, padx=(0, 8))
-            tk.Label(
-                row,
-                text=_fmt(item["pause"]),
-                width=12,
-                font=("Segoe UI", 10),
-                fg="#f87171",
-                bg="#0f172a",
-                anchor="w",
-            ).pack(side=tk.LEFT)
-
-    def _draw_chart(self, rows):
-        c = self.chart_canvas
-        c.delete("all")
-        if not rows:
-            c.create_text(
-                10,
-                20,
-                anchor="w",
-                fill="#94a3b8",
-                font=("Segoe UI", 10),
-                text="No data for the last 7 days.",
-            )
-            return
-        width = int(c.winfo_width() or 420)
-        height = int(c.winfo_height() or 180)
-        margin = 28
-        bar_width = 16
-        gap = 14
-        max_val = max(max(r["active"], r["pause"]) for r in rows) or 1
-        scale = (height - margin * 2) / max_val
-        group_w = 2 * bar_width + gap
-        x = margin
-        # Reverse order so newest days render on the right (left -> older, right -> newer)
-        for r in reversed(rows):
-            # Active bar
-            h_active = r["active"] * scale
-            h_pause = r["pause"] * scale
-            c.create_rectangle(
-                x,
-                height - margin - h_active,
-                x + bar_width,
-                height - margin,
-                fill="#22c55e",
-                width=0,
-            )
-            c.create_rectangle(
-                x + bar_width + 4,
-                height - margin - h_pause,
-                x + 2 * bar_width + 4,
-                height - margin,
-                fill="#f87171",
-                width=0,
-            )
-            c.create_text(
-                x + bar_width - 2,
-                height - margin + 12,
-                anchor="e",
-                fill="#cbd5e1",
-                font=("Segoe UI", 9),
-                text=r["label"],
-            )
-            x += group_w
-
-        # Legend
-        legend_y = 12
-        c.create_rectangle(margin, legend_y - 6, margin + 12, legend_y + 6, fill="#22c55e", width=0)
-        c.create_text(margin + 16, legend_y, anchor="w", fill="#cbd5e1", font=("Segoe UI", 9), text="Active")
-        c.create_rectangle(margin + 70, legend_y - 6, margin + 82, legend_y + 6, fill="#f87171", width=0)
-        c.create_text(margin + 86, legend_y, anchor="w", fill="#cbd5e1", font=("Segoe UI", 9), text="Pause")
+        self.chart.update(rows)
+        self.table.update(rows)
 
 
 def run():
@@ -1,34 +1,227 @@
 import time
 import datetime as dt
-from .db import current_mode, current_day, close_open_interval, start_interval
+from .db import open_interval, stored_ts, switch_interval
+from .metrics import timed
 
 
-def now():
-    return time.time()
+def day_of(ts: float) -> str:
+    return dt.date.fromtimestamp(ts).isoformat()
 
 
-def today_str():
-    return dt.date.today().isoformat()
+def local_midnight(day) -> float:
+    """Epoch seconds of 00:00 local time on `day` (a date or YYYY-MM-DD), DST included."""
+    if isinstance(day, str):
+        day = dt.date.fromisoformat(day)
+    return dt.datetime.combine(day, dt.time()).timestamp()
 
 
-def ensure_rollover(con, logger):
+def next_midnight(ts: float) -> float:
+    """The first local midnight after `ts`."""
+    return local_midnight(dt.datetime.fromtimestamp(ts).date() + dt.timedelta(days=1))
+
+
+class Clock:
+    """Where TrackerState reads the time; the system clock unless replaced."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def today(self) -> str:
+        return dt.date.today().isoformat()
+
+
+class ManualClock(Clock):
+    """A clock that only moves when told to (tests, replay.py)."""
+
+    def __init__(self, t: float = 0.0):
+        self.t = t
+        self._day = None
+        self._span = (0.0, 0.0)  # [start, end) of self._day
+
+    def time(self) -> float:
+        return self.t
+
+    def today(self) -> str:
+        start, end = self._span
+        if not start <= self.t < end:
+            self._day = day_of(self.t)
+            self._span = (local_midnight(self._day), next_midnight(self.t))
+        return self._day
+
+
+SYSTEM_CLOCK = Clock()
+
+
+def coalesce(events, kind, debounce: float):
+    """Reduce (ts, mode) events, in arrival order, to the transitions worth writing.
+
+    Repeats of the current mode are dropped, and so is any interval shorter
+    than `debounce`: a lock/unlock pair 0.3 s apart leaves no trace. `kind`
+    is the mode in force before the first event.
+    """
+    out = []
+    for ts, mode in events:
+        if mode == (out[-1][1] if out else kind):
+            continue
+        if out and ts - out[-1][0] < debounce:
+            out.pop()  # the interval the last transition opened was a flap
+            if mode == (out[-1][1] if out else kind):
+                continue
+        out.append((ts, mode))
+    return out
+
+
+class TrackerState:
+    """In-memory copy of the open interval: id, day, kind, start_ts.
+
+    Loaded from the DB once and then kept current by its own writes, so
+    ensure_rollover/ensure_mode only touch the DB when a transition actually
+    happens (one UPDATE+INSERT in a single transaction). Call `resync()` when
+    another process may have written to the DB.
+
+    `listeners` are called as `listener(con, state)` after every change of the
+    open interval, whether written here or found by `resync()`.
+
+    `idle_pause` is true while the open pause was opened by `ensure_idle()`
+    (and split at midnight since), i.e. while input may end it again.
+
+    All timestamps and "today" come from `clock` (a `Clock`).
+    """
+
+    def __init__(self, clock: Clock | None = None):
+        self.clock = clock or SYSTEM_CLOCK
+        self.id = None
+        self.day = None
+        self.kind = None
+        self.start_ts = None
+        self.idle_pause = False
+        self.loaded = False
+        self.listeners = []
+
+    @classmethod
+    def load(cls, con, clock: Clock | None = None):
+        state = cls(clock)
+        state.resync(con)
+        return state
+
+    @timed("core.resync")
+    def resync(self, con):
+        row = open_interval(con)
+        before = self.id
+        self.id, self.day, self.kind, self.start_ts = row if row else (None, None, None, None)
+        if self.loaded and self.id != before:
+            self.idle_pause = False
+            self._notify(con)
+        self.loaded = True
+
+    def _switch(self, con, kind, ts=None):
+        ts = stored_ts(self.clock.time() if ts is None else ts)  # as the DB keeps it
+        day = day_of(ts)
+        self.id = switch_interval(con, day, ts, kind)
+        self.day, self.kind, self.start_ts = day, kind, ts
+        self.idle_pause = False
+        self._notify(con)
+
+    def _rollover(self, con, ts=None):
+        """Split the open interval at each local midnight up to `ts`, in one transaction."""
+        ts = self.clock.time() if ts is None else ts
+        today = day_of(ts)
+        if self.day > today:
+            self._switch(con, self.kind, ts)  # the clock went back past midnight
+            return
+        day, last = dt.date.fromisoformat(self.day), dt.date.fromisoformat(today)
+        with con.batch():
+            while day < last:
+                day += dt.timedelta(days=1)
+                cut = stored_ts(min(max(local_midnight(day), self.start_ts), ts))
+                self.id = switch_interval(con, day.isoformat(), cut, self.kind)
+                self.start_ts = cut
+        self.day = today
+        self._notify(con)
+
+    def _notify(self, con):
+        for listener in list(self.listeners):
+            listener(con, self)
+
+    @timed("core.ensure_rollover")
+    def ensure_rollover(self, con, logger):
+        """AZnchide sesiunea curentă dacă s-a schimbat ziua."""
+        if not self.loaded:
+            self.resync(con)
+        if not self.kind:
+            logger.info("No open interval found; starting default active interval")
+            self._switch(con, "active")
+            return
+        today = self.clock.today()
+        if self.day != today:
+            logger.info("Rollover detected: %s -> %s", self.day, today)
+            self._rollover(con)
+
+    @timed("core.ensure_mode")
+    def ensure_mode(self, con, desired, logger, since=None):
+        """Comută între modurile active/pause dacă e nevoie.
+
+        `since` backdates the switch (e.g. to the last input before an idle
+        pause); it never reaches back before the open interval's start.
+        """
+        if not self.loaded:
+            self.resync(con)
+        if self.kind != desired:
+            logger.info("Switching from %s to %s", self.kind, desired)
+            self._transition(con, desired, since)
+
+    def _transition(self, con, kind, since=None):
+        ts = self.clock.time()
+        if since is not None and self.start_ts is not None:
+            ts = min(max(since, self.start_ts), ts)
+        if self.kind and self.day < day_of(ts):
+            self._rollover(con, ts)  # a backdated switch may predate the rollover
+        self._switch(con, kind, ts)
+
+    @timed("core.ingest")
+    def ingest(self, con, events, logger, debounce: float = 0.0):
+        """Apply a batch of (ts, mode) events in one transaction.
+
+        The events are coalesced first (see `coalesce`), so flapping costs
+        at most one write per settled transition and one log line per batch.
+        Returns the transitions written.
+        """
+        if not self.loaded:
+            self.resync(con)
+        before = self.kind
+        transitions = coalesce(events, self.kind, debounce)
+        if transitions:
+            with con.batch():
+                for ts, kind in transitions:
+                    self._transition(con, kind, ts)
+            logger.info("Switching from %s to %s (%d events, %d transitions)",
+                        before, self.kind, len(events), len(transitions))
+        return transitions
+
+    def ensure_idle(self, con, idle, since, logger):
+        """Pause for inactivity from `since`, and end only such a pause on input.
+
+        A pause from a lock or a manual toggle is left alone when input comes
+        back; any other switch clears `idle_pause`.
+        """
+        if not self.loaded:
+            self.resync(con)
+        if idle and self.kind == "active":
+            self.ensure_mode(con, "pause", logger, since=since)
+            self.idle_pause = True
+        elif not idle and self.idle_pause:
+            self.ensure_mode(con, "active", logger, since=since)
+
+
+def ensure_rollover(con, logger, state=None):
     """AZnchide sesiunea curentă dacă s-a schimbat ziua."""
-    mode = current_mode(con)
-    last_day = current_day(con)
-    if not mode:
-        logger.info("No open interval found; starting default active interval")
-        start_interval(con, today_str(), now(), "active")
-        return
-    if last_day != today_str():
-        logger.info("Rollover detected: %s -> %s", last_day, today_str())
-        close_open_interval(con)
-        start_interval(con, today_str(), now(), mode)
-
-
-def ensure_mode(con, desired, logger):
+    if state is None:
+        state = TrackerState.load(con)
+    state.ensure_rollover(con, logger)
+
+
+def ensure_mode(con, desired, logger, state=None, since=None):
     """Comută între modurile active/pause dacă e nevoie."""
-    mode = current_mode(con)
-    if mode != desired:
-        logger.info("Switching from %s to %s", mode, desired)
-        close_open_interval(con)
-        start_interval(con, today_str(), now(), desired)
+    if state is None:
+        state = TrackerState.load(con)
+    state.ensure_mode(con, desired, logger, since=since)
@@ -0,0 +1,69 @@
+import datetime as dt
+import threading
+import time
+
+from .db import day_closed_totals, open_interval
+
+
+class ActiveCounter:
+    """Today's active seconds without a query per read.
+
+    `load(con)` reads today's closed-interval total and the open interval once;
+    `seconds()` then adds `monotonic()` time elapsed since the load while the
+    open interval is active. Reload after a mode transition or rollover, either
+    by calling `load(con)` directly (e.g. from a TrackerState listener) or by
+    `invalidate()`, which makes the next read reload through `source`.
+
+    `source` is a callable returning a context manager that yields a connection
+    (e.g. `ConnectionPool.connection`). Without one the counter only reloads
+    when `load()` is called. `resync_every` bounds how long a self-loading
+    counter trusts its baseline, to pick up writes from other processes.
+    """
+
+    def __init__(self, source=None, resync_every: float | None = 60.0, clock=time.monotonic):
+        self.source = source
+        self.resync_every = resync_every
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._day = None
+        self._baseline = 0.0
+        self._active = False
+        self._loaded_at = None
+        self._stale = True
+        self.loads = 0
+
+    def load(self, con) -> None:
+        today = dt.date.today().isoformat()
+        closed_active, _pause = day_closed_totals(con, today)
+        row = open_interval(con)
+        wall, mono = time.time(), self._clock()
+        baseline, active = closed_active, False
+        if row and row[1] == today:
+            _id, _day, kind, start_ts = row
+            if kind == "active":
+                baseline += max(0.0, wall - start_ts)
+                active = True
+        with self._lock:
+            self._day, self._baseline, self._active = today, baseline, active
+            self._loaded_at, self._stale = mono, False
+            self.loads += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._stale = True
+
+    def _needs_load(self, mono: float) -> bool:
+        if self._stale or self._day != dt.date.today().isoformat():
+            return True
+        return self.resync_every is not None and mono - self._loaded_at >= self.resync_every
+
+    def seconds(self) -> float:
+        if self.source is not None and self._needs_load(self._clock()):
+            with self.source() as con:
+                self.load(con)
+        with self._lock:
+            if self._loaded_at is None:
+                return 0.0
+            if not self._active:
+                return self._baseline
+            return self._baseline + (self._clock() - self._loaded_at)
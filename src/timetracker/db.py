@@ -1,12 +1,18 @@
+import datetime as dt
+import queue
 import sqlite3
+import threading
 import time
-from .config import DB_PATH
+from concurrent.futures import Future
+from pathlib import Path
+from .config import DB_PATH, DB_CACHE_SIZE, DB_MMAP_SIZE, DB_BUSY_TIMEOUT
 from .logging_setup import get_logger
+from .metrics import timed
 
 logger = get_logger("tt.db")
 
 
-def _ensure_schema(con: sqlite3.Connection):
+def _m1_sessions(con: sqlite3.Connection):
     con.execute("""CREATE TABLE IF NOT EXISTS sessions(
         id INTEGER PRIMARY KEY,
         day TEXT NOT NULL,
@@ -14,58 +20,846 @@ def _ensure_schema(con: sqlite3.Connection):
         end_ts REAL,
         kind TEXT NOT NULL CHECK(kind in ('active','pause'))
     )""")
-    con.commit()
 
 
-def connect(timeout: float = 5.0, check_same_thread: bool = True) -> sqlite3.Connection:
-    """Open (and initialize) the SQLite DB and return a connection."""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    con = sqlite3.connect(str(DB_PATH), timeout=timeout, check_same_thread=check_same_thread)
-    _ensure_schema(con)
+def _m2_indexes(con: sqlite3.Connection):
+    # Partial index: only the (usually single) open interval lives in it, so
+    # current_mode/current_day/close_open_interval stop scanning the history.
+    con.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sessions_open ON sessions(end_ts) WHERE end_ts IS NULL"
+    )
+    # Covering index for the per-day aggregations (daily_totals, weekly dashboard).
+    con.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sessions_day ON sessions(day, kind, start_ts, end_ts)"
+    )
+
+
+def _rollup_delta(row: str, sign: str) -> str:
+    """Upsert adding (sign=+) or removing (sign=-) one closed interval of NEW/OLD."""
+    return f"""
+        INSERT INTO daily_rollup(day, active_sec, pause_sec, intervals)
+        SELECT {row}.day,
+               {sign}(CASE WHEN {row}.kind='active' THEN {row}.end_ts - {row}.start_ts ELSE 0 END),
+               {sign}(CASE WHEN {row}.kind='pause' THEN {row}.end_ts - {row}.start_ts ELSE 0 END),
+               {sign}1
+        WHERE {row}.end_ts IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET
+            active_sec = active_sec + excluded.active_sec,
+            pause_sec = pause_sec + excluded.pause_sec,
+            intervals = intervals + excluded.intervals;"""
+
+
+def _m3_daily_rollup(con: sqlite3.Connection):
+    # Per-day totals of *closed* intervals. Triggers keep it in step with
+    # `sessions` inside the writing transaction, so readers only add the open
+    # interval live (see daily_totals).
+    con.execute("""CREATE TABLE IF NOT EXISTS daily_rollup(
+        day TEXT PRIMARY KEY,
+        active_sec REAL NOT NULL DEFAULT 0,
+        pause_sec REAL NOT NULL DEFAULT 0,
+        intervals INTEGER NOT NULL DEFAULT 0
+    )""")
+    con.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_rollup_insert AFTER INSERT ON sessions
+        BEGIN {_rollup_delta("NEW", "+")} END""")
+    drop_empty = "DELETE FROM daily_rollup WHERE day=OLD.day AND intervals=0;"
+    con.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_rollup_update
+        AFTER UPDATE OF day, start_ts, end_ts, kind ON sessions
+        BEGIN {_rollup_delta("OLD", "-")} {drop_empty} {_rollup_delta("NEW", "+")} END""")
+    con.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_rollup_delete AFTER DELETE ON sessions
+        BEGIN {_rollup_delta("OLD", "-")} {drop_empty} END""")
+    rebuild_rollup(con, commit=False)
+
+
+# --- schema v2: integer columns ----------------------------------------------
+#
+# `intervals` holds what v1 kept in `sessions`, as integers: `day` is the local
+# calendar day as days since 1970-01-01, timestamps are epoch milliseconds
+# and `kind` is a KIND_CODES code (the same encoding as the ttcol export).
+# `sessions` becomes a view with the v1 columns and INSTEAD OF triggers, so
+# older code and ad-hoc SQL keep reading and writing it; the helpers below
+# query `intervals` directly, where the indexes are.
+
+KIND_CODES = {"active": 0, "pause": 1}
+KINDS = ("active", "pause")
+_EPOCH = dt.date(1970, 1, 1)
+MIGRATION_CHUNK = 50_000  # rows copied per transaction by the v2 migration
+
+# SQL for the conversions; `{}` is a column or NEW.x/OLD.x
+_ISO_DAY = "date({} * 86400, 'unixepoch')"
+_EPOCH_DAY = "CAST(julianday({}) - 2440587.5 AS INTEGER)"
+_TO_MS = "CAST(round({} * 1000) AS INTEGER)"
+_KIND_NAME = "CASE {} WHEN 0 THEN 'active' WHEN 1 THEN 'pause' END"
+_KIND_CODE = "CASE {0} WHEN 'active' THEN 0 WHEN 'pause' THEN 1 ELSE {0} END"  # else: CHECK fails
+
+
+def epoch_day(day) -> int:
+    """ISO day (or date) -> days since 1970-01-01."""
+    if isinstance(day, str):
+        day = dt.date.fromisoformat(day)
+    return (day - _EPOCH).days
+
+
+def iso_day(n: int) -> str:
+    return (_EPOCH + dt.timedelta(days=n)).isoformat()
+
+
+def to_ms(ts: float | None) -> int | None:
+    return None if ts is None else round(ts * 1000)
+
+
+def stored_ts(ts: float) -> float:
+    """`ts` at the resolution the DB keeps (whole milliseconds), as read back."""
+    return round(ts * 1000) / 1000
+
+
+def _create_intervals(con: sqlite3.Connection):
+    con.execute("""CREATE TABLE IF NOT EXISTS intervals(
+        id INTEGER PRIMARY KEY,
+        day INTEGER NOT NULL,
+        start_ms INTEGER NOT NULL,
+        end_ms INTEGER,
+        kind INTEGER NOT NULL CHECK(kind in (0, 1))
+    )""")
+    con.execute(
+        "CREATE INDEX IF NOT EXISTS idx_intervals_open ON intervals(end_ms) WHERE end_ms IS NULL"
+    )
+    con.execute(
+        "CREATE INDEX IF NOT EXISTS idx_intervals_day ON intervals(day, kind, start_ms, end_ms)"
+    )
+
+
+_COPY_V1 = f"""
+    INSERT INTO intervals(id, day, start_ms, end_ms, kind)
+    SELECT id, {_EPOCH_DAY.format("day")}, {_TO_MS.format("start_ts")},
+           {_TO_MS.format("end_ts")}, {_KIND_CODE.format("kind")}
+    FROM sessions"""
+
+
+def _track_v1_changes(con: sqlite3.Connection):
+    con.execute("CREATE TABLE IF NOT EXISTS _v2_changed(id INTEGER PRIMARY KEY)")
+    note = "INSERT OR IGNORE INTO _v2_changed VALUES({}.id);"
+    for event, rows in (("INSERT", ("NEW",)), ("UPDATE", ("OLD", "NEW")), ("DELETE", ("OLD",))):
+        con.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_v2_changed_{event.lower()}
+            AFTER {event} ON sessions BEGIN {" ".join(note.format(r) for r in rows)} END""")
+
+
+def _m4_copy_rows(con: sqlite3.Connection, chunk: int | None = None):
+    """Stream v1 rows into `intervals`, `chunk` rows per transaction.
+
+    Runs before step 4's own transaction, so a big history never holds the
+    write lock (or grows the WAL) for more than one chunk; readers and the
+    tracker keep working on v1 meanwhile, and triggers note the ids they
+    touch in `_v2_changed` for the final step to copy again. Resumable: each
+    chunk continues after the highest id already copied.
+    """
+    chunk = chunk or MIGRATION_CHUNK
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        _create_intervals(con)
+        _track_v1_changes(con)
+        total = con.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    last_log = time.monotonic()
+    while True:
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(con) != 3:
+                con.rollback()  # another process finished the step
+                return
+            done = con.execute("SELECT COALESCE(MAX(id), 0) FROM intervals").fetchone()[0]
+            cur = con.execute(_COPY_V1 + " WHERE id > ? ORDER BY id LIMIT ?", (done, chunk))
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        if cur.rowcount < chunk:
+            return
+        if time.monotonic() - last_log >= 5.0:
+            copied = con.execute("SELECT COUNT(*) FROM intervals").fetchone()[0]
+            logger.info("Schema v2: copied %d of ~%d intervals", copied, total)
+            last_log = time.monotonic()
+
+
+def _rollup_delta_v2(row: str, sign: str) -> str:
+    """_rollup_delta for an `intervals` row."""
+    seconds = f"({row}.end_ms - {row}.start_ms) / 1000.0"
+    return f"""
+        INSERT INTO daily_rollup(day, active_sec, pause_sec, intervals)
+        SELECT {_ISO_DAY.format(row + ".day")},
+               {sign}(CASE WHEN {row}.kind=0 THEN {seconds} ELSE 0 END),
+               {sign}(CASE WHEN {row}.kind=1 THEN {seconds} ELSE 0 END),
+               {sign}1
+        WHERE {row}.end_ms IS NOT NULL
+        ON CONFLICT(day) DO UPDATE SET
+            active_sec = active_sec + excluded.active_sec,
+            pause_sec = pause_sec + excluded.pause_sec,
+            intervals = intervals + excluded.intervals;"""
+
+
+def _m4_intervals(con: sqlite3.Connection):
+    # catch up on what changed in v1 while _m4_copy_rows streamed it
+    _create_intervals(con)
+    _track_v1_changes(con)
+    done = con.execute("SELECT COALESCE(MAX(id), 0) FROM intervals").fetchone()[0]
+    con.execute("DELETE FROM intervals WHERE id IN (SELECT id FROM _v2_changed)")
+    con.execute(_COPY_V1 + " WHERE id > ? OR id IN (SELECT id FROM _v2_changed)", (done,))
+    con.execute("DROP TABLE _v2_changed")
+
+    con.execute("DROP TABLE sessions")  # its indexes and triggers go with it
+    con.execute(f"""CREATE VIEW sessions AS
+        SELECT id,
+               {_ISO_DAY.format("day")} AS day,
+               start_ms / 1000.0 AS start_ts,
+               end_ms / 1000.0 AS end_ts,
+               {_KIND_NAME.format("kind")} AS kind
+        FROM intervals""")
+    values = (f"{_EPOCH_DAY.format('NEW.day')}, {_TO_MS.format('NEW.start_ts')}, "
+              f"{_TO_MS.format('NEW.end_ts')}, {_KIND_CODE.format('NEW.kind')}")
+    con.execute(f"""CREATE TRIGGER trg_sessions_insert INSTEAD OF INSERT ON sessions BEGIN
+        INSERT INTO intervals(id, day, start_ms, end_ms, kind) VALUES(NEW.id, {values}); END""")
+    con.execute(f"""CREATE TRIGGER trg_sessions_update INSTEAD OF UPDATE ON sessions BEGIN
+        UPDATE intervals SET (id, day, start_ms, end_ms, kind) = (NEW.id, {values})
+        WHERE id=OLD.id; END""")
+    con.execute("""CREATE TRIGGER trg_sessions_delete INSTEAD OF DELETE ON sessions BEGIN
+        DELETE FROM intervals WHERE id=OLD.id; END""")
+
+    # daily_rollup's triggers move to the new table
+    con.execute(f"""CREATE TRIGGER trg_rollup_insert AFTER INSERT ON intervals
+        BEGIN {_rollup_delta_v2("NEW", "+")} END""")
+    drop_empty = "DELETE FROM daily_rollup WHERE day=" + _ISO_DAY.format("OLD.day") + " AND intervals=0;"
+    con.execute(f"""CREATE TRIGGER trg_rollup_update
+        AFTER UPDATE OF day, start_ms, end_ms, kind ON intervals
+        BEGIN {_rollup_delta_v2("OLD", "-")} {drop_empty} {_rollup_delta_v2("NEW", "+")} END""")
+    con.execute(f"""CREATE TRIGGER trg_rollup_delete AFTER DELETE ON intervals
+        BEGIN {_rollup_delta_v2("OLD", "-")} {drop_empty} END""")
+    # v1 summed REAL seconds; the rows are now whole milliseconds
+    rebuild_rollup(con, commit=False)
+
+
+# Ordered list of (user_version, migration). Append only; never renumber.
+MIGRATIONS = [
+    (1, _m1_sessions),
+    (2, _m2_indexes),
+    (3, _m3_daily_rollup),
+    (4, _m4_intervals),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Steps with a bulk phase that runs first, in short transactions of its own.
+STREAMING = {4: _m4_copy_rows}
+
+
+def schema_version(con: sqlite3.Connection) -> int:
+    return con.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _ensure_schema(con: sqlite3.Connection, chunk: int | None = None):
+    """Upgrade the DB in place to SCHEMA_VERSION, one transaction per step.
+
+    A step in STREAMING first runs its bulk phase in chunks (see _m4_copy_rows).
+    """
+    if schema_version(con) >= SCHEMA_VERSION:
+        return
+    for version, migrate in MIGRATIONS:
+        if version in STREAMING and schema_version(con) == version - 1:
+            STREAMING[version](con, chunk)
+        # IMMEDIATE takes the write lock up front; re-check the version inside
+        # it so two processes starting together don't run a step twice.
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(con) >= version:
+                con.rollback()
+                continue
+            migrate(con)
+            con.execute(f"PRAGMA user_version={version}")
+            con.commit()
+        except Exception:
+            con.rollback()
+            raise
+        logger.info("Migrated DB schema to version %d", version)
+
+
+class Connection(sqlite3.Connection):
+    """sqlite3 connection whose commit()/rollback() can be deferred to a batch.
+
+    Inside `batch()` the helpers below keep calling commit() as usual, but only
+    the outermost batch actually commits; DBService uses this to group writes.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._batch_depth = 0
+        self.commits = 0
+
+    def commit(self):
+        if self._batch_depth:
+            return
+        super().commit()
+        self.commits += 1
+
+    def rollback(self):
+        # a failing helper inside a batch must not discard the other writes;
+        # the batch owner rolls back to its savepoint instead
+        if self._batch_depth:
+            return
+        super().rollback()
+
+    def batch(self):
+        return _Batch(self)
+
+
+class _Batch:
+    def __init__(self, con: Connection):
+        self.con = con
+
+    def __enter__(self):
+        if self.con._batch_depth == 0 and not self.con.in_transaction:
+            self.con.execute("BEGIN")
+        self.con._batch_depth += 1
+        return self.con
+
+    def __exit__(self, exc_type, exc, tb):
+        self.con._batch_depth -= 1
+        if exc_type is None:
+            self.con.commit()
+        else:
+            self.con.rollback()
+        return False
+
+
+# DB files this process has already migrated; later connects skip the setup.
+_SCHEMA_READY: set[str] = set()
+
+
+# Named connection profiles. The writer runs the DB in WAL mode so readers
+# never wait on it; readers open the file read-only and refuse writes.
+PROFILES = {
+    "writer": {"readonly": False, "journal_mode": "WAL", "synchronous": "NORMAL"},
+    "reader": {"readonly": True, "query_only": "ON"},
+}
+
+
+def connect(timeout: float | None = None, check_same_thread: bool = True,
+            profile: str = "writer", path: str | Path | None = None,
+            cache_size: int | None = None, mmap_size: int | None = None) -> Connection:
+    """Open (and initialize) the SQLite DB and return a connection.
+
+    `profile` picks an entry of PROFILES. `timeout` (seconds) overrides
+    DB_BUSY_TIMEOUT; `cache_size`/`mmap_size` override DB_CACHE_SIZE/DB_MMAP_SIZE.
+    """
+    settings = PROFILES[profile]
+    path = Path(path) if path is not None else DB_PATH
+    busy_ms = int(timeout * 1000) if timeout is not None else DB_BUSY_TIMEOUT
+    if settings["readonly"]:
+        if not path.exists():
+            # nothing to read yet: let a writer create and migrate the file first
+            connect(path=path).close()
+        target, uri = path.resolve().as_uri() + "?mode=ro", True
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        target, uri = str(path), False
+    con = sqlite3.connect(
+        target, timeout=busy_ms / 1000, check_same_thread=check_same_thread,
+        uri=uri, factory=Connection,
+        # readers stay in autocommit so no implicit BEGIN ever pins a WAL snapshot
+        isolation_level=None if settings["readonly"] else "",
+    )
+    con.execute(f"PRAGMA busy_timeout={busy_ms}")
+    con.execute(f"PRAGMA cache_size={int(DB_CACHE_SIZE if cache_size is None else cache_size)}")
+    con.execute(f"PRAGMA mmap_size={int(DB_MMAP_SIZE if mmap_size is None else mmap_size)}")
+    key = str(path.resolve())
+    if settings["readonly"]:
+        if key not in _SCHEMA_READY and schema_version(con) < SCHEMA_VERSION:
+            connect(path=path).close()
+        con.execute(f"PRAGMA query_only={settings['query_only']}")
+    else:
+        if key not in _SCHEMA_READY:
+            # journal_mode is persistent, so it only needs setting once too
+            con.execute(f"PRAGMA journal_mode={settings['journal_mode']}")
+            _ensure_schema(con)
+            _SCHEMA_READY.add(key)
+        con.execute(f"PRAGMA synchronous={settings['synchronous']}")
     return con
 
 
-def close_open_interval(con: sqlite3.Connection) -> None:
-    ts = time.time()
-    logger.info("Closing open intervals with end_ts=%s", ts)
-    con.execute("UPDATE sessions SET end_ts=? WHERE end_ts IS NULL", (ts,))
+class ConnectionPool:
+    """Bounded pool handing each thread its own long-lived connection.
+
+    A thread gets the same connection back on every checkout (after a cheap
+    liveness check); at most `max_size` threads hold one at a time. `opened`
+    and `reused` count how often a checkout had to connect vs. reused one.
+    """
+
+    def __init__(self, profile: str = "reader", max_size: int = 4,
+                 acquire_timeout: float = 5.0, **connect_kwargs):
+        self.profile = profile
+        self.acquire_timeout = acquire_timeout
+        self._connect_kwargs = connect_kwargs
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._cons: dict[threading.Thread, Connection] = {}
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def acquire(self) -> Connection:
+        con = getattr(self._local, "con", None)
+        if con is not None:
+            try:
+                con.execute("SELECT 1").fetchone()
+            except sqlite3.Error:
+                logger.warning("Pooled connection failed its checkout check; reopening")
+                self._discard(threading.current_thread())
+            else:
+                with self._lock:
+                    self.reused += 1
+                return con
+        if not self._slots.acquire(blocking=False):
+            self._reap_dead_threads()
+            if not self._slots.acquire(timeout=self.acquire_timeout):
+                raise RuntimeError(f"connection pool exhausted ({self.profile})")
+        try:
+            # owned by this thread, but close_all() may close it from another one
+            con = connect(profile=self.profile, check_same_thread=False, **self._connect_kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        self._local.con = con
+        with self._lock:
+            self._cons[threading.current_thread()] = con
+            self.opened += 1
+        return con
+
+    def connection(self):
+        """Context-manager form of acquire(); the connection stays with the thread."""
+        return _Checkout(self)
+
+    def release(self) -> None:
+        """Close the calling thread's connection and free its slot."""
+        self._discard(threading.current_thread())
+
+    def close_all(self) -> None:
+        with self._lock:
+            threads = list(self._cons)
+        for thread in threads:
+            self._discard(thread)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"opened": self.opened, "reused": self.reused,
+                    "discarded": self.discarded, "open": len(self._cons)}
+
+    def _discard(self, thread: threading.Thread) -> None:
+        with self._lock:
+            con = self._cons.pop(thread, None)
+            if con is None:
+                return
+            self.discarded += 1
+        if thread is threading.current_thread():
+            self._local.con = None
+        try:
+            con.close()
+        except Exception:
+            logger.exception("Error closing pooled connection")
+        self._slots.release()
+
+    def _reap_dead_threads(self) -> None:
+        # keyed by Thread object, not ident: idents are reused by new threads
+        with self._lock:
+            dead = [thread for thread in self._cons if not thread.is_alive()]
+        for thread in dead:
+            self._discard(thread)
+
+
+class _Checkout:
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def __enter__(self) -> Connection:
+        return self.pool.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _Job:
+    __slots__ = ("fn", "args", "kwargs", "write", "future")
+
+    def __init__(self, fn, args, kwargs, write):
+        self.fn, self.args, self.kwargs, self.write = fn, args, kwargs, write
+        self.future = Future()
+
+
+_STOP = object()
+
+
+class DBService:
+    """One owner thread, one connection; any thread submits work and gets a Future.
+
+    `fn(con, *args, **kwargs)` runs on the DB thread. Writes (write=True) that
+    are queued within `batch_window` seconds of each other share a single
+    transaction and commit; each runs under its own SAVEPOINT so one failing
+    job does not undo the rest.
+
+    `rollback_listeners` are called as `listener(con)` on the DB thread after
+    a write job's changes were rolled back (its savepoint, or the whole batch
+    when the commit fails), so in-memory state such as TrackerState can
+    `resync()` with what the DB still holds.
+    """
+
+    def __init__(self, batch_window: float = 0.01, max_batch: int = 64, **connect_kwargs):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.rollback_listeners = []
+        self._connect_kwargs = connect_kwargs
+        self._queue = queue.Queue()
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+
+    def start(self, timeout: float = 5.0) -> "DBService":
+        if self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name="tt-db", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError("DB thread did not start")
+        if self._error:
+            raise self._error
+        return self
+
+    def submit(self, fn, *args, write: bool = False, **kwargs) -> Future:
+        job = _Job(fn, args, kwargs, write)
+        if self._thread is None or not self._thread.is_alive():
+            job.future.set_exception(RuntimeError("DBService is not running"))
+        else:
+            self._queue.put(job)
+        return job.future
+
+    def call(self, fn, *args, write: bool = False, timeout: float | None = 10.0, **kwargs):
+        """submit() and wait for the result (re-raises the job's exception)."""
+        return self.submit(fn, *args, write=write, **kwargs).result(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Finish the queued jobs, close the connection and join the thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("DB thread did not stop within %.1fs", timeout)
+        self._thread = None
+
+    def _run(self):
+        try:
+            con = connect(**self._connect_kwargs)
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        pending = None
+        try:
+            while True:
+                job = pending if pending is not None else self._queue.get()
+                pending = None
+                if job is _STOP:
+                    break
+                if not job.write:
+                    self._run_one(con, job)
+                    continue
+                batch = [job]
+                deadline = time.monotonic() + self.batch_window
+                while len(batch) < self.max_batch:
+                    try:
+                        nxt = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if nxt is _STOP or not nxt.write:
+                        # keep ordering: a read queued after these writes must see them
+                        pending = nxt
+                        break
+                    batch.append(nxt)
+                self._run_batch(con, batch)
+        finally:
+            self._drain()
+            try:
+                con.close()
+            except Exception:
+                logger.exception("Error closing DB service connection")
+
+    @staticmethod
+    def _run_one(con, job):
+        if not job.future.set_running_or_notify_cancel():
+            return
+        try:
+            job.future.set_result(job.fn(con, *job.args, **job.kwargs))
+        except BaseException as e:
+            job.future.set_exception(e)
+
+    def _run_batch(self, con, batch):
+        done = []
+        try:
+            with con.batch():
+                for job in batch:
+                    if not job.future.set_running_or_notify_cancel():
+                        continue
+                    con.execute("SAVEPOINT tt_job")
+                    try:
+                        result = job.fn(con, *job.args, **job.kwargs)
+                    except BaseException as e:
+                        con.execute("ROLLBACK TO tt_job")
+                        con.execute("RELEASE tt_job")
+                        self._rolled_back(con)
+                        job.future.set_exception(e)
+                        continue
+                    con.execute("RELEASE tt_job")
+                    done.append((job, result))
+        except BaseException as e:
+            logger.exception("DB write batch failed (%d jobs)", len(batch))
+            self._rolled_back(con)
+            for job, _ in done:
+                job.future.set_exception(e)
+            return
+        for job, result in done:
+            job.future.set_result(result)
+
+    def _rolled_back(self, con):
+        for listener in list(self.rollback_listeners):
+            try:
+                listener(con)
+            except Exception:
+                logger.exception("Rollback listener failed")
+
+    def _drain(self):
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if job is not _STOP:
+                job.future.set_exception(RuntimeError("DBService stopped"))
+
+
+def close_open_interval(con: sqlite3.Connection, ts: float | None = None) -> None:
+    ts = time.time() if ts is None else ts
+    logger.debug("Closing open intervals with end_ts=%s", ts)
+    con.execute("UPDATE intervals SET end_ms=? WHERE end_ms IS NULL", (to_ms(ts),))
     con.commit()
 
 
 def start_interval(con: sqlite3.Connection, day: str, start_ts: float, kind: str) -> None:
-    con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES(?,?,?)", (day, start_ts, kind))
+    con.execute("INSERT INTO intervals(day,start_ms,kind) VALUES(?,?,?)",
+                (epoch_day(day), to_ms(start_ts), KIND_CODES.get(kind, kind)))
     con.commit()
-    logger.info("Inserted interval: day=%s start_ts=%s kind=%s", day, start_ts, kind)
+    logger.debug("Inserted interval: day=%s start_ts=%s kind=%s", day, start_ts, kind)
+
+
+@timed("db.switch_interval")
+def switch_interval(con: sqlite3.Connection, day: str, ts: float, kind: str) -> int:
+    """Close any open interval at `ts` and open a new `kind` one, in one transaction.
+
+    Returns the id of the new interval.
+    """
+    ms = to_ms(ts)
+    try:
+        con.execute("UPDATE intervals SET end_ms=? WHERE end_ms IS NULL", (ms,))
+        cur = con.execute("INSERT INTO intervals(day,start_ms,kind) VALUES(?,?,?)",
+                          (epoch_day(day), ms, KIND_CODES.get(kind, kind)))
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    logger.debug("Switched interval: day=%s ts=%s kind=%s id=%s", day, ts, kind, cur.lastrowid)
+    return cur.lastrowid
+
+
+def open_interval(con: sqlite3.Connection):
+    """Return (id, day, kind, start_ts) of the open interval, or None."""
+    row = con.execute(
+        "SELECT id, day, kind, start_ms FROM intervals WHERE end_ms IS NULL ORDER BY id DESC LIMIT 1"
+    ).fetchone()
+    return (row[0], iso_day(row[1]), KINDS[row[2]], row[3] / 1000) if row else None
 
 
 def current_mode(con: sqlite3.Connection):
     row = con.execute(
-        "SELECT kind FROM sessions WHERE end_ts IS NULL ORDER BY id DESC LIMIT 1"
+        "SELECT kind FROM intervals WHERE end_ms IS NULL ORDER BY id DESC LIMIT 1"
     ).fetchone()
-    return row[0] if row else None
+    return KINDS[row[0]] if row else None
 
 
 def current_day(con: sqlite3.Connection):
     row = con.execute(
-        "SELECT day FROM sessions WHERE end_ts IS NULL ORDER BY id DESC LIMIT 1"
+        "SELECT day FROM intervals WHERE end_ms IS NULL ORDER BY id DESC LIMIT 1"
     ).fetchone()
-    return row[0] if row else None
+    return iso_day(row[0]) if row else None
 
 
+@timed("db.daily_totals")
 def daily_totals(con: sqlite3.Connection, since: str, now_ts: float | None = None):
     """Return the active seconds per zi, incluzând intervalul activ deschis (end_ts NULL)."""
+    return [(day, active) for day, active, _pause in daily_breakdown(con, since, now_ts)]
+
+
+@timed("db.daily_breakdown")
+def daily_breakdown(con: sqlite3.Connection, since: str, now_ts: float | None = None):
+    """Return (day, active_sec, pause_sec) per day since `since`, newest first.
+
+    Closed intervals come from `daily_rollup` (one row per day); only the open
+    interval is computed against `now_ts`.
+    """
     if now_ts is None:
         now_ts = time.time()
-    rows = con.execute("""
-        SELECT day,
-               SUM(CASE
-                       WHEN kind='active'
-                         THEN (COALESCE(end_ts, ?) - start_ts)
-                       ELSE 0
-                   END) AS active_sec
-        FROM sessions
-        WHERE day >= ?
+    rows = con.execute(f"""
+        SELECT day, SUM(active_sec), SUM(pause_sec)
+        FROM (
+            SELECT day, active_sec, pause_sec
+            FROM daily_rollup
+            WHERE day >= ?
+            UNION ALL
+            SELECT {_ISO_DAY.format("day")},
+                   CASE WHEN kind=0 THEN ? - start_ms / 1000.0 ELSE 0 END,
+                   CASE WHEN kind=1 THEN ? - start_ms / 1000.0 ELSE 0 END
+            FROM intervals
+            WHERE end_ms IS NULL AND day >= ?
+        )
         GROUP BY day
         ORDER BY day DESC
-    """, (now_ts, since)).fetchall()
+    """, (since, now_ts, now_ts, epoch_day(since))).fetchall()
     return rows
+
+
+def day_closed_totals(con: sqlite3.Connection, day: str):
+    """Return (active_sec, pause_sec) of the closed intervals of `day`."""
+    row = con.execute(
+        "SELECT active_sec, pause_sec FROM daily_rollup WHERE day=?", (day,)
+    ).fetchone()
+    return row if row else (0.0, 0.0)
+
+
+def data_version(con: sqlite3.Connection) -> int:
+    """SQLite's per-connection counter that moves when *another* connection commits."""
+    return con.execute("PRAGMA data_version").fetchone()[0]
+
+
+class ChangeWatcher:
+    """Cheap "did the DB change since I last looked?" for a reader.
+
+    Watches the connection's `PRAGMA data_version`, which moves when any
+    *other* connection, in this process or another one, commits. `changed()`
+    costs one pragma and never reads table pages.
+    """
+
+    def __init__(self, con: sqlite3.Connection):
+        self.con = con
+        self._seen = data_version(con)
+
+    def changed(self) -> bool:
+        version = data_version(self.con)
+        if version == self._seen:
+            return False
+        self._seen = version
+        return True
+
+
+class DayTotalsCache:
+    """(active_sec, pause_sec) of closed intervals per day for the last `days` days.
+
+    The rows are read once and served from memory until the date changes,
+    `PRAGMA data_version` shows another connection wrote to the DB, or
+    `invalidate()` is called (needed for writes made through the same
+    connection, which data_version does not report). The dashboard adds the
+    open interval itself, from its TrackerState, so a tick costs no query.
+    """
+
+    def __init__(self, days: int = 7):
+        self.days = days
+        self._key = None
+        self._closed = {}
+        self.loads = 0
+
+    def invalidate(self) -> None:
+        self._key = None
+
+    def closed_totals(self, con: sqlite3.Connection, today: dt.date | None = None) -> dict:
+        """Return {iso_day: (active_sec, pause_sec)} of closed intervals only, today included."""
+        today = today or dt.date.today()
+        key = (today.isoformat(), data_version(con))
+        if key != self._key:
+            start = (today - dt.timedelta(days=self.days - 1)).isoformat()
+            self._closed = {
+                day: (a or 0, p or 0)
+                for day, a, p in con.execute(
+                    "SELECT day, active_sec, pause_sec FROM daily_rollup WHERE day >= ?", (start,)
+                )
+            }
+            self._key = key
+            self.loads += 1
+        return dict(self._closed)
+
+
+_ROLLUP_FROM_SESSIONS = """
+    SELECT day,
+           SUM(CASE WHEN kind='active' THEN end_ts - start_ts ELSE 0 END),
+           SUM(CASE WHEN kind='pause' THEN end_ts - start_ts ELSE 0 END),
+           COUNT(*)
+    FROM sessions
+    WHERE end_ts IS NOT NULL
+    GROUP BY day
+"""
+
+_ROLLUP_FROM_INTERVALS = f"""
+    SELECT {_ISO_DAY.format("day")},
+           SUM(CASE WHEN kind=0 THEN end_ms - start_ms ELSE 0 END) / 1000.0,
+           SUM(CASE WHEN kind=1 THEN end_ms - start_ms ELSE 0 END) / 1000.0,
+           COUNT(*)
+    FROM intervals
+    WHERE end_ms IS NOT NULL
+    GROUP BY day
+"""
+
+
+def _rollup_source(con: sqlite3.Connection) -> str:
+    # migration 3 builds the rollup from the v1 table; once migration 4 has
+    # swapped it for the view (still inside its transaction) read `intervals`
+    v2 = con.execute("SELECT type FROM sqlite_master WHERE name='sessions'").fetchone() == ("view",)
+    return _ROLLUP_FROM_INTERVALS if v2 else _ROLLUP_FROM_SESSIONS
+
+
+def rebuild_rollup(con: sqlite3.Connection, commit: bool = True) -> int:
+    """Recompute `daily_rollup` from the raw intervals; returns the number of days."""
+    con.execute("DELETE FROM daily_rollup")
+    cur = con.execute(
+        "INSERT INTO daily_rollup(day, active_sec, pause_sec, intervals) " + _rollup_source(con)
+    )
+    if commit:
+        con.commit()
+    logger.info("Rebuilt daily_rollup (%d days)", cur.rowcount)
+    return cur.rowcount
+
+
+def check_rollup(con: sqlite3.Connection, tolerance: float = 1e-3):
+    """Compare `daily_rollup` with the raw table.
+
+    Returns a list of (day, rollup, raw) tuples for the days that disagree,
+    where rollup/raw are (active_sec, pause_sec, intervals) or None if missing.
+    """
+    rollup = {
+        day: (a, p, n)
+        for day, a, p, n in con.execute(
+            "SELECT day, active_sec, pause_sec, intervals FROM daily_rollup"
+        )
+    }
+    raw = {day: (a, p, n) for day, a, p, n in con.execute(_rollup_source(con))}
+    bad = []
+    for day in sorted(rollup.keys() | raw.keys()):
+        r, s = rollup.get(day), raw.get(day)
+        if r is None or s is None or r[2] != s[2] \
+                or abs(r[0] - s[0]) > tolerance or abs(r[1] - s[1]) > tolerance:
+            bad.append((day, r, s))
+    return bad
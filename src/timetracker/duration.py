@@ -0,0 +1,11 @@
+"""Formatting of durations for the GUI, tray, reports and CLI output.
+
+Imports nothing, so client-only commands (`status`, `today`) can use it
+without loading sqlite3 or the tracker core.
+"""
+
+
+def hms(sec: float) -> str:
+    """Seconds -> "HH:MM:SS", rounded to the second; hours go past 24."""
+    sec = int(round(sec))
+    return f"{sec // 3600:02d}:{(sec % 3600) // 60:02d}:{sec % 60:02d}"
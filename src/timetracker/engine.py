@@ -0,0 +1,158 @@
+"""The tracking engine shared by the Windows, macOS and Linux backends.
+
+A backend only turns what its OS reports into calls on a `TrackerEngine`:
+`session("pause" | "active")` for a lock/unlock and `rearm()` after a resume
+or a clock change. Everything else is wired here, once:
+
+- a `DBService` thread owns every write, and a `TrackerState` resyncs when
+  one of its jobs is rolled back;
+- `recover()` closes an interval a dead run left open at its last heartbeat;
+- an `EventIngester` debounces session events into batched writes;
+- a `RolloverScheduler` splits the day at local midnight, and the idle
+  detector pauses on inactivity;
+- an `IpcServer` lets the control GUI and the CLI toggle without writing
+  the DB themselves;
+- `stop()` tears it all down in order, closing the open interval while IPC
+  is still up, so no client ever sees the daemon gone with it open.
+"""
+from .core import TrackerState
+from .counter import ActiveCounter
+from .db import DBService, close_open_interval
+from .heartbeat import HeartbeatJournal, recover
+from .idle import start_detector
+from .ingest import EventIngester
+from .ipc import IpcServer, TrackerCommands
+from .logging_setup import get_logger
+from .rollover import RolloverScheduler
+
+logger = get_logger("tt")
+
+
+class TrackerEngine:
+    """The DB, state and background threads of one tracker process.
+
+    Constructing it opens the DB and recovers a crashed run; `start()` opens
+    the active interval and starts the threads; `stop()` is idempotent.
+    """
+
+    def __init__(self, log=None):
+        self.log = log or logger
+        self.db = DBService().start()
+        self.state = TrackerState()
+        # a write job that fails is rolled back; the state must forget it too
+        self.db.rollback_listeners.append(self.state.resync)
+        # an interval a dead run left open ends at its last heartbeat, not now
+        self.heartbeat = HeartbeatJournal()
+        self.db.call(recover, self.heartbeat, self.log, write=True)
+        # "active today" for the tray and IPC: reloaded on the DB thread after each transition
+        self.counter = ActiveCounter(resync_every=None)
+        self.state.listeners.append(lambda con, _state: self.counter.load(con))
+        self.db.call(self.counter.load)
+        # lock/unlock flaps (RDP, display sleep) are debounced and written in batches
+        self.events = EventIngester(self.state, self._submit, log=self.log)
+        # one wake-up per local midnight; resume and time changes re-arm it
+        self.rollover = RolloverScheduler(lambda: self._submit(self._rollover_tick))
+        self.idle = None
+        self.ipc = None
+        self._stopped = False
+        self._closed = False  # set on the DB thread once stop() closed the interval
+
+    def start(self, detect_idle: bool = True) -> "TrackerEngine":
+        self.heartbeat.start()
+        self.events.start()
+        self.db.call(self._apply_mode, "active", write=True)
+        self.rollover.start()
+        if detect_idle:
+            # no input for IDLE_THRESHOLD_SEC pauses too, backdated to the last input
+            self.idle = start_detector(lambda idle, since: self._submit(self._apply_idle, idle, since))
+        # the control GUI and CLI toggle through here instead of writing the DB
+        try:
+            self.ipc = IpcServer(TrackerCommands(self.db, self.state, self.counter, self._apply_mode)).start()
+        except Exception:
+            self.log.exception("Failed to start IPC server")
+        return self
+
+    # --- called from the platform's event thread; never block ---------------
+    def session(self, mode: str) -> None:
+        """A session lock ("pause") or unlock ("active")."""
+        if self.idle:
+            self.idle.set_locked(mode == "pause")
+        self.events.add(mode)
+
+    def rearm(self) -> None:
+        """Resume from suspend or a wall-clock change: recompute the next midnight."""
+        self.rollover.rearm()
+
+    # --- DB jobs: run on the DBService thread -------------------------------
+    def _apply_mode(self, con, mode):
+        if self._closed:
+            # an IPC toggle racing stop() must not open an interval nobody closes
+            raise RuntimeError("the tracker is stopping")
+        self.events.flush(con)  # session events still pending go first
+        self.state.ensure_rollover(con, self.log)
+        self.state.ensure_mode(con, mode, self.log)
+
+    def _apply_idle(self, con, idle, since):
+        self.events.flush(con)
+        self.state.ensure_idle(con, idle, since, self.log)
+        self.state.ensure_rollover(con, self.log)
+
+    def _rollover_tick(self, con):
+        # a control GUI running without the daemon writes from its own process
+        self.state.resync(con)
+        self.state.ensure_rollover(con, self.log)
+
+    def _submit(self, fn, *args):
+        """Queue a write without blocking the caller; log failures."""
+        def _done(fut):
+            exc = fut.exception()
+            if exc is not None:
+                self.log.error("DB job %s failed", fn.__name__, exc_info=exc)
+        self.db.submit(fn, *args, write=True).add_done_callback(_done)
+
+    def _close(self, con):
+        self.events.flush(con)  # queued behind any events still pending on the DB thread
+        close_open_interval(con)
+        self._closed = True
+        self.state.resync(con)  # subscribers see the tracker stop
+
+    def stop(self) -> None:
+        if self._stopped:
+            return
+        self._stopped = True
+        self.log.info("Cleanup: closing DB")
+        try:
+            self.rollover.stop()
+        except Exception:
+            self.log.exception("Error stopping rollover scheduler")
+        if self.idle:
+            try:
+                self.idle.stop()
+            except Exception:
+                self.log.exception("Error stopping idle detector")
+        try:
+            self.events.stop()
+        except Exception:
+            self.log.exception("Error stopping event ingester")
+        try:
+            # before IPC goes away: a control GUI that loses the daemon only reads,
+            # so the interval must already be closed when it reloads
+            self.db.call(self._close, write=True, timeout=5.0)
+            clean = True
+        except Exception:
+            clean = False
+            self.log.exception("Cleanup error closing open interval")
+        if self.ipc:
+            try:
+                self.ipc.stop()
+            except Exception:
+                self.log.exception("Error stopping IPC server")
+        try:
+            # an empty journal tells the next start there is nothing to recover
+            self.heartbeat.stop(clean=clean)
+        except Exception:
+            self.log.exception("Error stopping heartbeat")
+        try:
+            self.db.stop()
+        except Exception:
+            self.log.exception("Error stopping DB service")
@@ -0,0 +1,241 @@
+"""Streaming export of raw intervals or daily aggregates.
+
+Rows are read with `fetchmany` and written incrementally, so memory use does
+not grow with the size of the history. Formats:
+
+- csv    header row + one line per row
+- jsonl  one JSON object per line
+- ttcol  compact little-endian columnar binary (see `write_columnar`/`read_columnar`)
+
+Output goes to stdout or a file, optionally gzip-compressed.
+"""
+import argparse
+import array
+import csv
+import datetime as dt
+import gzip
+import io
+import json
+import struct
+import sys
+import time
+from math import nan
+
+from .db import connect, epoch_day
+
+BATCH = 5000
+
+# name -> (SQL, [(column, ttcol type)]). ttcol types: q=int64, i=int32 epoch-day,
+# d=float64 (NULL -> NaN), B=uint8 kind code (db.KIND_CODES, as stored).
+DATASETS = {
+    "sessions": (
+        """SELECT id, {day}, start_ms / 1000.0, end_ms / 1000.0, {kind}
+           FROM intervals {where_days} ORDER BY id""",
+        [("id", "q"), ("day", "i"), ("start_ts", "d"), ("end_ts", "d"), ("kind", "B")],
+    ),
+    "daily": (
+        """SELECT day, SUM(active_sec), SUM(pause_sec), SUM(intervals)
+           FROM (
+               SELECT {rollup_day} AS day, active_sec, pause_sec, intervals FROM daily_rollup {where}
+               UNION ALL
+               SELECT {day},
+                      CASE WHEN kind=0 THEN :now - start_ms / 1000.0 ELSE 0 END,
+                      CASE WHEN kind=1 THEN :now - start_ms / 1000.0 ELSE 0 END,
+                      1
+               FROM intervals {where_open}
+           )
+           GROUP BY day
+           ORDER BY day""",
+        [("day", "i"), ("active_sec", "d"), ("pause_sec", "d"), ("intervals", "q")],
+    ),
+}
+
+# How the day and kind columns are selected: as text for csv/jsonl, or as
+# `intervals` stores them (epoch day, kind code) for ttcol, which then packs
+# them without a conversion per row.
+_TEXT = {
+    "day": "date(day * 86400, 'unixepoch')",
+    "kind": "CASE kind WHEN 0 THEN 'active' ELSE 'pause' END",
+    "rollup_day": "day",
+}
+_STORED = {
+    "day": "day",
+    "kind": "kind",
+    "rollup_day": "CAST(julianday(day) - 2440587.5 AS INTEGER)",
+}
+
+
+def _where(since, until, extra=None, days=False):
+    # `days`: compare the integer `intervals.day` (:since_day) instead of ISO text
+    suffix = "_day" if days else ""
+    clauses = [extra] if extra else []
+    if since:
+        clauses.append(f"day >= :since{suffix}")
+    if until:
+        clauses.append(f"day <= :until{suffix}")
+    return ("WHERE " + " AND ".join(clauses)) if clauses else ""
+
+
+def iter_batches(con, dataset: str, since: str | None = None, until: str | None = None,
+                 now_ts: float | None = None, batch: int = BATCH, stored: bool = False):
+    """Yield lists of at most `batch` rows of `dataset` ("sessions" or "daily").
+
+    Days are ISO text and kinds names, or with `stored` epoch days and kind codes.
+    """
+    sql, _cols = DATASETS[dataset]
+    sql = sql.format(**(_STORED if stored else _TEXT),
+                     where=_where(since, until), where_days=_where(since, until, days=True),
+                     where_open=_where(since, until, "end_ms IS NULL", days=True))
+    params = {"since": since, "until": until, "now": time.time() if now_ts is None else now_ts,
+              "since_day": since and epoch_day(since), "until_day": until and epoch_day(until)}
+    cur = con.execute(sql, params)
+    try:
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                return
+            yield rows
+    finally:
+        cur.close()
+
+
+class _CsvWriter:
+    def __init__(self, out, columns):
+        self.out = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=False)
+        self.csv = csv.writer(self.out)
+        self.csv.writerow(columns)
+
+    def write(self, rows):
+        self.csv.writerows(rows)
+
+    def close(self):
+        self.out.flush()
+        self.out.detach()
+
+
+class _JsonlWriter:
+    def __init__(self, out, columns):
+        self.out = io.TextIOWrapper(out, encoding="utf-8", newline="\n", write_through=False)
+        self.columns = columns
+
+    def write(self, rows):
+        cols = self.columns
+        self.out.writelines(
+            json.dumps(dict(zip(cols, row)), separators=(",", ":")) + "\n" for row in rows
+        )
+
+    def close(self):
+        self.out.flush()
+        self.out.detach()
+
+
+# ttcol layout (all little-endian):
+#   b"TTCOL1" | u16 ncols | ncols x (u8 type, u8 len, name utf-8)
+#   blocks:   u32 nrows | per column: nrows packed values
+#   end:      u32 0
+_MAGIC = b"TTCOL1"
+
+
+class _ColumnarWriter:
+    def __init__(self, out, columns, types):
+        self.out = out
+        self.types = types
+        out.write(_MAGIC + struct.pack("<H", len(columns)))
+        for name, t in zip(columns, types):
+            raw = name.encode("utf-8")
+            out.write(struct.pack("<cB", t.encode("ascii"), len(raw)) + raw)
+
+    def write(self, rows):
+        self.out.write(struct.pack("<I", len(rows)))
+        for col, t in enumerate(self.types):
+            if t == "d":
+                arr = array.array(t, (nan if row[col] is None else row[col] for row in rows))
+            else:
+                arr = array.array(t, [row[col] for row in rows])
+            if sys.byteorder == "big":
+                arr.byteswap()
+            self.out.write(arr.tobytes())
+
+    def close(self):
+        self.out.write(struct.pack("<I", 0))
+        self.out.flush()
+
+
+def read_columnar(fp):
+    """Yield {column: array} blocks from a ttcol stream (inverse of the writer)."""
+    if fp.read(len(_MAGIC)) != _MAGIC:
+        raise ValueError("not a ttcol stream")
+    (ncols,) = struct.unpack("<H", fp.read(2))
+    header = []
+    for _ in range(ncols):
+        t, n = struct.unpack("<cB", fp.read(2))
+        header.append((fp.read(n).decode("utf-8"), t.decode("ascii")))
+    while True:
+        (nrows,) = struct.unpack("<I", fp.read(4))
+        if nrows == 0:
+            return
+        block = {}
+        for name, t in header:
+            arr = array.array(t)
+            arr.frombytes(fp.read(nrows * arr.itemsize))
+            if sys.byteorder == "big":
+                arr.byteswap()
+            block[name] = arr
+        yield block
+
+
+FORMATS = ("csv", "jsonl", "ttcol")
+
+
+def export(con, out, dataset: str = "sessions", fmt: str = "csv",
+           since: str | None = None, until: str | None = None,
+           now_ts: float | None = None, batch: int = BATCH) -> int:
+    """Stream `dataset` to the binary file object `out`; returns the row count."""
+    _sql, spec = DATASETS[dataset]
+    columns = [name for name, _t in spec]
+    if fmt == "csv":
+        writer = _CsvWriter(out, columns)
+    elif fmt == "jsonl":
+        writer = _JsonlWriter(out, columns)
+    elif fmt == "ttcol":
+        writer = _ColumnarWriter(out, columns, [t for _name, t in spec])
+    else:
+        raise ValueError(f"unknown format: {fmt}")
+    count = 0
+    for rows in iter_batches(con, dataset, since, until, now_ts, batch, stored=fmt == "ttcol"):
+        writer.write(rows)
+        count += len(rows)
+    writer.close()
+    return count
+
+
+def main(argv=None):
+    """`python -m timetracker export [sessions|daily] [--format F] [--since D] [--until D] [-o PATH] [--gzip]`."""
+    ap = argparse.ArgumentParser(prog="python -m timetracker export")
+    ap.add_argument("dataset", nargs="?", choices=sorted(DATASETS), default="sessions")
+    ap.add_argument("--format", choices=FORMATS, default="csv")
+    ap.add_argument("--since", type=dt.date.fromisoformat, help="first day, YYYY-MM-DD")
+    ap.add_argument("--until", type=dt.date.fromisoformat, help="last day, YYYY-MM-DD")
+    ap.add_argument("-o", "--output", default="-", help="file path, or - for stdout (default)")
+    ap.add_argument("--gzip", action="store_true", help="gzip the output (implied by a .gz path)")
+    args = ap.parse_args(argv)
+
+    use_gzip = args.gzip or args.output.endswith(".gz")
+    raw = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    out = gzip.GzipFile(fileobj=raw, mode="wb") if use_gzip else raw
+    con = connect(profile="reader")
+    try:
+        n = export(
+            con, out, args.dataset, args.format,
+            since=args.since.isoformat() if args.since else None,
+            until=args.until.isoformat() if args.until else None,
+        )
+    finally:
+        con.close()
+        if use_gzip:
+            out.close()
+        if raw is not sys.stdout.buffer:
+            raw.close()
+        else:
+            raw.flush()
+    print(f"exported {n} rows", file=sys.stderr)
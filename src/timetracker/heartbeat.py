@@ -0,0 +1,153 @@
+"""Crash-safe closing of the open interval via a low-write heartbeat file.
+
+If the tracker dies (killed, crashed, power lost) its open interval keeps
+`end_ts NULL`: readers count it up to "now" and the next start used to close
+it at restart time, crediting the whole outage to the last mode.
+
+`HeartbeatJournal` keeps "last known alive" in memory and, every `interval`
+seconds (HEARTBEAT_SEC), overwrites one fixed-size record at offset 0 of
+BASE_DIR/heartbeat: one small write() per interval into the same page, no
+fsync, no DB transaction. After a crash or power loss the record is at most
+`interval` seconds stale (or, if the OS never wrote it back, older or
+missing; that is no worse than without a journal). A torn record fails its
+checksum and is ignored. A clean shutdown truncates the file.
+
+On startup `recover()` closes an orphaned interval at that last heartbeat,
+split at any midnight in between like a regular rollover. An interval that
+started after the last heartbeat could have been flushed was not the dead
+tracker's (e.g. the control window toggled without a daemon) and is left
+alone.
+"""
+import os
+import threading
+import time
+import zlib
+
+from .config import BASE_DIR, HEARTBEAT_SEC
+from .core import ManualClock, TrackerState
+from .db import close_open_interval, open_interval
+from .logging_setup import get_logger
+
+logger = get_logger("tt.heartbeat")
+
+RECORD_SIZE = 48  # one write of this size, always at offset 0
+
+
+def _encode(ts: float, pid: int) -> bytes:
+    body = f"tt1 {ts:.3f} {pid}"
+    line = f"{body} {zlib.crc32(body.encode('ascii')):08x}"
+    return line.ljust(RECORD_SIZE - 1).encode("ascii") + b"\n"
+
+
+def _decode(data: bytes):
+    """Return (ts, pid) from a record, or None if it is empty, torn or foreign."""
+    try:
+        magic, ts, pid, crc = data.decode("ascii").split()
+        body = f"{magic} {ts} {pid}"
+        if magic != "tt1" or int(crc, 16) != zlib.crc32(body.encode("ascii")):
+            return None
+        return float(ts), int(pid)
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+class HeartbeatJournal:
+    def __init__(self, path=None, interval: float = HEARTBEAT_SEC, clock=time.time):
+        self.path = path or BASE_DIR / "heartbeat"
+        self.interval = interval
+        self._clock = clock
+        self._fd = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last = None      # last known alive, in memory
+        self._flushed = None  # what the file holds
+        self.flushes = 0
+        self.bytes_written = 0
+
+    def read(self):
+        """The last heartbeat on disk (epoch seconds), or None."""
+        try:
+            with open(self.path, "rb") as f:
+                rec = _decode(f.read(RECORD_SIZE))
+        except OSError:
+            return None
+        return rec[0] if rec else None
+
+    def beat(self, ts: float | None = None) -> None:
+        """Record "alive at `ts`" in memory only; the flush thread writes it out."""
+        self.last = self._clock() if ts is None else ts
+
+    def flush(self) -> bool:
+        """Write the in-memory heartbeat if it moved; True if something was written."""
+        with self._lock:
+            last = self.last
+            if last is None or last == self._flushed:
+                return False
+            if self._fd is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o600)
+            record = _encode(last, os.getpid())
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            os.write(self._fd, record)  # page cache only; the OS writes it back
+            self._flushed = last
+            self.flushes += 1
+            self.bytes_written += len(record)
+            return True
+
+    def start(self) -> "HeartbeatJournal":
+        if self.interval <= 0:
+            return self
+        self.beat()
+        self.flush()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="tt-heartbeat", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, clean: bool = True, timeout: float = 2.0) -> None:
+        """Stop beating; `clean` (nothing left open) truncates the record."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        with self._lock:
+            if self._fd is None:
+                return
+            if clean:
+                os.ftruncate(self._fd, 0)
+            os.close(self._fd)
+            self._fd = None
+            self._flushed = None
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.beat()
+                self.flush()
+            except Exception:
+                logger.exception("Heartbeat flush failed")
+
+
+def recover(con, journal: HeartbeatJournal, log=None):
+    """Close an interval orphaned by a dead tracker at its last heartbeat.
+
+    Runs before the tracker loads its state. Returns the closing timestamp,
+    or None when there was nothing to recover.
+    """
+    log = log or logger
+    last = journal.read()
+    row = open_interval(con)
+    if last is None or row is None:
+        return None
+    _id, _day, kind, start_ts = row
+    if start_ts > last + max(journal.interval, 0):
+        return None  # opened after the dead tracker's last beat: not its interval
+    ts = max(last, start_ts)
+    log.info("Closing %s interval left open by a dead tracker at its last heartbeat (%.0fs before now)",
+             kind, time.time() - ts)
+    with con.batch():
+        # split at every midnight up to the heartbeat, then close there
+        TrackerState.load(con, ManualClock(ts)).ensure_rollover(con, log)
+        close_open_interval(con, ts)
+    return ts
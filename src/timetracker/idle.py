@@ -0,0 +1,189 @@
+"""Pauses tracking when there is no input, without the session being locked.
+
+A probe returns the seconds since the last keyboard/mouse input (None when
+it cannot tell): `GetLastInputInfo` on Windows, Quartz on macOS, `xprintidle`
+under X11 on Linux. `IdleDetector` samples it and reports:
+
+- `on_idle(since)` once input is `threshold` seconds old, with `since` the
+  time of that last input, so the pause is backdated to it;
+- `on_active(since)` once input is fresher than `resume_below` seconds again.
+
+The gap between the two thresholds is the hysteresis: after coming back it
+takes a full `threshold` without input to go idle again. Sampling adapts to
+the reading: the next sample is due when the threshold could be reached at
+the earliest (`threshold - idle_sec`, so rarely while input is recent and
+often close to it), and every `idle_interval` while idle, to notice the
+return quickly. While the session is locked the detector does not sample.
+
+The trackers start one with `start_detector()` and apply its reports with
+`TrackerState.ensure_idle()`, which only ends a pause it opened itself.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+from .config import IDLE_THRESHOLD_SEC
+from .logging_setup import get_logger
+
+logger = get_logger("tt.idle")
+
+
+# --- probes: () -> seconds since the last input, or None -------------------
+
+def windows_probe():
+    import ctypes
+    from ctypes import wintypes
+
+    class LASTINPUTINFO(ctypes.Structure):
+        _fields_ = [("cbSize", wintypes.UINT), ("dwTime", wintypes.DWORD)]
+
+    user32, kernel32 = ctypes.windll.user32, ctypes.windll.kernel32
+    kernel32.GetTickCount.restype = wintypes.DWORD
+    info = LASTINPUTINFO()
+    info.cbSize = ctypes.sizeof(info)
+
+    def probe():
+        if not user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        # both are 32-bit millisecond tick counts that wrap every 49.7 days
+        return ((kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF) / 1000.0
+    return probe
+
+
+def macos_probe():
+    import Quartz
+
+    def probe():
+        return Quartz.CGEventSourceSecondsSinceLastEventType(
+            Quartz.kCGEventSourceStateCombinedSessionState, Quartz.kCGAnyInputEventType)
+    return probe
+
+
+def xprintidle_probe():
+    if not os.environ.get("DISPLAY") or shutil.which("xprintidle") is None:
+        return None
+
+    def probe():
+        out = subprocess.run(["xprintidle"], capture_output=True, text=True, timeout=2.0)
+        return int(out.stdout) / 1000.0 if out.returncode == 0 else None
+    return probe
+
+
+def default_probe():
+    """The probe for this platform, or None when last-input time is unavailable."""
+    try:
+        if sys.platform == "win32":
+            return windows_probe()
+        if sys.platform == "darwin":
+            return macos_probe()
+        return xprintidle_probe()
+    except Exception:
+        logger.exception("Idle probe unavailable")
+        return None
+
+
+class IdleDetector:
+    def __init__(self, probe, on_idle, on_active, threshold: float = 300.0,
+                 resume_below: float = 5.0, min_interval: float = 1.0,
+                 idle_interval: float = 2.0, max_interval: float | None = None,
+                 clock=time.time):
+        if not 0 < resume_below < threshold:
+            raise ValueError("need 0 < resume_below < threshold")
+        self.probe = probe
+        self.on_idle = on_idle
+        self.on_active = on_active
+        self.threshold = threshold
+        self.resume_below = resume_below
+        self.min_interval = min_interval
+        self.idle_interval = idle_interval
+        self.max_interval = threshold if max_interval is None else max_interval
+        self._clock = clock
+        self.idle = False
+        self.locked = False
+        self.samples = 0
+        self._failed = False
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def _next(self, idle_sec: float) -> float:
+        return min(max(self.threshold - idle_sec, self.min_interval), self.max_interval)
+
+    def step(self) -> float | None:
+        """Take one sample; return the seconds until the next one (None: until woken)."""
+        if self.locked:
+            return None
+        try:
+            idle_sec = self.probe()
+        except Exception:
+            idle_sec = None
+            if not self._failed:
+                logger.exception("Idle probe failed")
+        now = self._clock()
+        self.samples += 1
+        self._failed = idle_sec is None
+        if idle_sec is None:
+            return self.max_interval
+        if not self.idle:
+            if idle_sec < self.threshold:
+                return self._next(idle_sec)
+            self.idle = True
+            logger.debug("Idle for %.0fs", idle_sec)
+            self.on_idle(now - idle_sec)
+            return self.idle_interval
+        if idle_sec >= self.resume_below:
+            return self.idle_interval
+        self.idle = False
+        logger.debug("Input again after idle")
+        self.on_active(now - idle_sec)
+        return self._next(idle_sec)
+
+    def set_locked(self, locked: bool) -> None:
+        """Lock/unlock decide the mode themselves; an unlock also ends idleness."""
+        self.locked = locked
+        if not locked:
+            self.idle = False
+        self._wake.set()
+
+    def start(self) -> "IdleDetector":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="tt-idle", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self):
+        delay = 0.0
+        while True:
+            self._wake.wait(delay)
+            if self._stop.is_set():
+                return
+            self._wake.clear()
+            try:
+                delay = self.step()
+            except Exception:
+                logger.exception("Idle detector step failed")
+                delay = self.max_interval
+
+
+def start_detector(report):
+    """Start a detector calling `report(idle, since)`; None when off or unsupported."""
+    if IDLE_THRESHOLD_SEC <= 0:
+        return None
+    probe = default_probe()
+    if probe is None:
+        logger.info("No idle probe on this system; pausing on lock only")
+        return None
+    detector = IdleDetector(probe, lambda since: report(True, since),
+                            lambda since: report(False, since), threshold=IDLE_THRESHOLD_SEC)
+    logger.info("Idle detection on: pause after %ss without input", IDLE_THRESHOLD_SEC)
+    return detector.start()
@@ -0,0 +1,117 @@
+"""Debounced, batched intake of session events for the platform trackers.
+
+Lock/unlock callbacks call `EventIngester.add(mode)` and return at once. A
+batch is handed to the DB thread once no event has arrived for `debounce`
+seconds (or `max_delay` after its first event, should flapping never stop);
+`TrackerState.ingest` then coalesces it and writes it in one transaction.
+A burst of display-sleep or RDP flapping thus becomes at most one write
+instead of an UPDATE, an INSERT and a commit per edge.
+
+A batch the timer closes after `debounce` quiet seconds ends on a settled
+transition. A batch cut at `max_delay`, or flushed early because a toggle or
+an idle report has to be applied, can end in the middle of a burst: a flap
+straddling that cut is written as a short interval of its own instead of
+being absorbed into the mode around it.
+
+The timer thread never takes the events itself: it queues a `flush` job, so
+the batch is taken on the DB thread in queue order. A toggle or idle job
+queued earlier flushes them first; one queued later finds them written.
+"""
+import threading
+import time
+
+from .config import EVENT_DEBOUNCE_SEC
+from .logging_setup import get_logger
+
+logger = get_logger("tt.ingest")
+
+
+class EventIngester:
+    """Batches (ts, mode) events for `submit(fn, *args)`, the tracker's DB-thread queue.
+
+    `flush(con)` runs as that job and writes what is pending with `write()`:
+    `state.ingest()` plus a rollover check. A tracker applying anything else
+    (a toggle, an idle pause) first calls `flush(con)` on the DB thread, so
+    events keep their order.
+    """
+
+    def __init__(self, state, submit, debounce: float = EVENT_DEBOUNCE_SEC, max_delay: float = 30.0,
+                 log=None, monotonic=time.monotonic):
+        self.state = state
+        self.submit = submit
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.log = log or logger
+        self._monotonic = monotonic
+        self._cond = threading.Condition()
+        self._pending = []
+        self._first = self._last = 0.0  # monotonic arrival of the batch's first/last event
+        self._queued = False  # a flush job for the pending events is on the DB queue
+        self._stopping = False
+        self._thread = None
+        self.batches = 0
+        self.events = 0
+
+    def start(self) -> "EventIngester":
+        self._stopping = False
+        self._thread = threading.Thread(target=self._loop, name="tt-ingest", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the timer thread; pending events stay for a final `flush()`."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def add(self, mode: str, ts: float | None = None) -> None:
+        ts = self.state.clock.time() if ts is None else ts
+        now = self._monotonic()
+        with self._cond:
+            if not self._pending:
+                self._first = now
+            self._last = now
+            self._pending.append((ts, mode))
+            self._cond.notify()
+
+    def take(self) -> list:
+        with self._cond:
+            batch, self._pending = self._pending, []
+            self._queued = False
+        return batch
+
+    def flush(self, con) -> None:
+        """Write whatever is pending now; runs on the DB thread."""
+        batch = self.take()
+        if batch:
+            self.write(con, batch)
+
+    def write(self, con, batch) -> None:
+        self.batches += 1
+        self.events += len(batch)
+        self.state.ingest(con, batch, self.log, self.debounce)
+        self.state.ensure_rollover(con, self.log)
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while (not self._pending or self._queued) and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                due = min(self._last + self.debounce, self._first + self.max_delay)
+                wait = due - self._monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                self._queued = True
+            try:
+                self.submit(self.flush)
+            except Exception:
+                logger.exception("Could not queue the session events flush")
+                with self._cond:
+                    self._queued = False
+                    self._first = self._last = self._monotonic()  # retry after another debounce
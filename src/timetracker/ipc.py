@@ -0,0 +1,345 @@
+"""Local control endpoint of the tracker daemon.
+
+The daemon owns the only writing connection; the control GUI and the CLI ask
+it to act instead of writing to the DB themselves. Transport is
+`multiprocessing.connection`: a Unix socket (mode 0600) on Linux/macOS, a
+named pipe on Windows. Each message is one length-prefixed JSON object; no
+pickling is involved, so a client can only send data, never code.
+
+Requests and replies:
+
+    {"cmd": "status"}                   -> {"ok": true, "mode", "day", "since", "active_today"}
+    {"cmd": "toggle"}                   -> same as status, after the switch
+    {"cmd": "toggle", "mode": "pause"}  -> force a mode
+    {"cmd": "today"}                    -> {"ok": true, "day", "active", "pause"}
+    {"cmd": "subscribe"}                -> a status message now, then one per transition
+    anything else                       -> {"ok": false, "error": "..."}
+"""
+import datetime as dt
+import getpass
+import json
+import os
+import queue
+import sys
+import threading
+from multiprocessing.connection import Client, Listener
+
+from .config import BASE_DIR, IPC_ADDRESS
+from .duration import hms
+from .logging_setup import get_logger
+
+logger = get_logger("tt.ipc")
+
+MODES = ("active", "pause")
+
+
+class IpcError(RuntimeError):
+    """The daemon answered with an error."""
+
+
+class DaemonUnavailable(IpcError):
+    """No daemon is listening on the address."""
+
+
+class NoReply(IpcError):
+    """The request went out but no reply came back; the daemon may have acted on it."""
+
+
+def default_address() -> str:
+    if IPC_ADDRESS:
+        return IPC_ADDRESS
+    if sys.platform == "win32":
+        return rf"\\.\pipe\timetracker-{getpass.getuser()}"
+    # AF_UNIX paths are limited to ~100 bytes; set IPC_ADDRESS if BASE_DIR is deep
+    return str(BASE_DIR / "tt.sock")
+
+
+def _family(address: str) -> str:
+    return "AF_PIPE" if address.startswith("\\\\") else "AF_UNIX"
+
+
+def _send(conn, obj) -> None:
+    conn.send_bytes(json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+
+def _recv(conn, timeout: float | None = None):
+    if timeout is not None and not conn.poll(timeout):
+        raise TimeoutError("no reply from the tracker daemon")
+    return json.loads(conn.recv_bytes(64 * 1024).decode("utf-8"))
+
+
+class TrackerCommands:
+    """The daemon side of each command, run against its DBService and TrackerState.
+
+    `apply_mode(con, mode)` is the platform tracker's own transition job, so a
+    toggle goes through exactly the same path as a lock/unlock event.
+    """
+
+    def __init__(self, db, state, counter, apply_mode):
+        self.db = db
+        self.state = state
+        self.counter = counter
+        self.apply_mode = apply_mode
+
+    def status(self) -> dict:
+        state = self.state
+        return {
+            "mode": state.kind,
+            "day": state.day,
+            "since": state.start_ts,
+            "active_today": round(self.counter.seconds(), 3),
+        }
+
+    def toggle(self, mode: str | None = None) -> dict:
+        if mode is not None and mode not in MODES:
+            raise ValueError(f"unknown mode: {mode}")
+        self.db.call(self._toggle, mode, write=True)
+        return self.status()
+
+    def _toggle(self, con, mode):
+        # decided on the DB thread, so two racing toggles flip twice, not once
+        if mode is None:
+            mode = "pause" if self.state.kind == "active" else "active"
+        self.apply_mode(con, mode)
+
+    def today(self) -> dict:
+        from .db import daily_breakdown  # keeps sqlite3 out of client-only imports
+        day = dt.date.today().isoformat()
+        rows = self.db.call(daily_breakdown, day)
+        active, pause = (rows[0][1] or 0, rows[0][2] or 0) if rows else (0, 0)
+        return {"day": day, "active": round(active, 3), "pause": round(pause, 3)}
+
+
+class IpcServer:
+    """Accepts clients on `address`, one thread each; `publish()` feeds subscribers."""
+
+    def __init__(self, commands: TrackerCommands, address: str | None = None):
+        self.commands = commands
+        self.address = address or default_address()
+        self._listener = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._subscribers: set[queue.Queue] = set()
+        self._clients = set()
+
+    def start(self) -> "IpcServer":
+        family = _family(self.address)
+        if family == "AF_UNIX":
+            os.makedirs(os.path.dirname(self.address) or ".", exist_ok=True)
+            self._remove_stale_socket()
+            # bound 0600 from the start; a chmod after bind would leave a window
+            # in which other local users can connect
+            umask = os.umask(0o177)
+            try:
+                self._listener = Listener(self.address, family=family)
+            finally:
+                os.umask(umask)
+        else:
+            self._listener = Listener(self.address, family=family)
+        # our own transitions reach subscribers as they happen
+        listeners = self.commands.state.listeners
+        if self._on_change not in listeners:
+            listeners.append(self._on_change)
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._accept_loop, name="tt-ipc", daemon=True)
+        self._thread.start()
+        logger.info("IPC listening on %s", self.address)
+        return self
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.address):
+            return
+        try:
+            Client(self.address, family="AF_UNIX").close()
+        except OSError:
+            os.unlink(self.address)  # left behind by a daemon that died
+        else:
+            raise RuntimeError(f"another tracker daemon is listening on {self.address}")
+
+    def stop(self, timeout: float = 2.0) -> None:
+        if self._listener is None:
+            return
+        self._stopping.set()
+        try:
+            # wake the blocking accept()
+            Client(self.address, family=_family(self.address)).close()
+        except OSError:
+            pass
+        self._thread.join(timeout)
+        self._listener.close()
+        self._listener = None
+        with self._lock:
+            for q in self._subscribers:
+                q.put(None)
+            clients = list(self._clients)
+        for conn in clients:
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _on_change(self, _con, _state):
+        self.publish()
+
+    def publish(self) -> None:
+        """Send the current status to every subscriber (never blocks the caller)."""
+        with self._lock:
+            if not self._subscribers:
+                return
+            subscribers = list(self._subscribers)
+        event = {"ok": True, "event": "status", **self.commands.status()}
+        for q in subscribers:
+            q.put(event)
+
+    def _accept_loop(self):
+        while not self._stopping.is_set():
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                if self._stopping.is_set():
+                    return
+                logger.exception("IPC accept failed")
+                continue
+            if self._stopping.is_set():
+                conn.close()
+                return
+            threading.Thread(target=self._serve, args=(conn,), name="tt-ipc-client", daemon=True).start()
+
+    def _serve(self, conn):
+        with self._lock:
+            self._clients.add(conn)
+        try:
+            while not self._stopping.is_set():
+                try:
+                    request = _recv(conn)
+                except (EOFError, OSError):
+                    return
+                except ValueError:
+                    _send(conn, {"ok": False, "error": "malformed request"})
+                    continue
+                if isinstance(request, dict) and request.get("cmd") == "subscribe":
+                    self._stream(conn)
+                    return
+                _send(conn, self._dispatch(request))
+        finally:
+            with self._lock:
+                self._clients.discard(conn)
+            conn.close()
+
+    def _dispatch(self, request) -> dict:
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "request must be a JSON object"}
+        cmd = request.get("cmd")
+        try:
+            if cmd == "status":
+                return {"ok": True, **self.commands.status()}
+            if cmd == "toggle":
+                return {"ok": True, **self.commands.toggle(request.get("mode"))}
+            if cmd == "today":
+                return {"ok": True, **self.commands.today()}
+        except Exception as e:
+            logger.exception("IPC command %s failed", cmd)
+            return {"ok": False, "error": str(e)}
+        return {"ok": False, "error": f"unknown command: {cmd}"}
+
+    def _stream(self, conn):
+        q = queue.Queue()
+        with self._lock:
+            self._subscribers.add(q)
+        try:
+            _send(conn, {"ok": True, "event": "status", **self.commands.status()})
+            while True:
+                event = q.get()
+                if event is None:
+                    return
+                _send(conn, event)
+        except OSError:
+            return  # subscriber went away
+        finally:
+            with self._lock:
+                self._subscribers.discard(q)
+
+
+class IpcClient:
+    """Talks to the daemon; every call opens a short-lived connection."""
+
+    def __init__(self, address: str | None = None, timeout: float = 5.0):
+        self.address = address or default_address()
+        self.timeout = timeout
+
+    def _connect(self):
+        try:
+            return Client(self.address, family=_family(self.address))
+        except OSError as e:
+            raise DaemonUnavailable(f"tracker daemon not reachable at {self.address}") from e
+
+    def request(self, cmd: str, **args) -> dict:
+        conn = self._connect()
+        try:
+            _send(conn, {"cmd": cmd, **args})
+            reply = _recv(conn, self.timeout)
+        except (EOFError, OSError) as e:
+            # not DaemonUnavailable: a slow daemon may still apply the request
+            raise NoReply(f"no reply from the tracker daemon: {e}") from e
+        finally:
+            conn.close()
+        if not reply.get("ok"):
+            raise IpcError(reply.get("error", "request failed"))
+        return reply
+
+    def available(self) -> bool:
+        try:
+            self.request("status")
+        except IpcError:
+            return False
+        return True
+
+    def subscribe(self, stop: threading.Event | None = None, poll: float = 0.5):
+        """Yield status events until the daemon goes away or `stop` is set."""
+        conn = self._connect()
+        try:
+            _send(conn, {"cmd": "subscribe"})
+            while stop is None or not stop.is_set():
+                if not conn.poll(poll):
+                    continue
+                try:
+                    yield _recv(conn)
+                except (EOFError, OSError):
+                    return
+        finally:
+            conn.close()
+
+
+def _print_status(reply):
+    print(f"{reply['mode'] or 'none'}  since {reply['day'] or '-'}  active today {hms(reply['active_today'])}")
+
+
+def main(cmd: str, argv=None):
+    """`python -m timetracker status [--watch] | toggle [active|pause] | today`."""
+    import argparse
+    ap = argparse.ArgumentParser(prog=f"python -m timetracker {cmd}")
+    if cmd == "status":
+        ap.add_argument("--watch", action="store_true", help="keep printing on every transition")
+    elif cmd == "toggle":
+        ap.add_argument("mode", nargs="?", choices=MODES)
+    args = ap.parse_args(argv)
+
+    client = IpcClient()
+    try:
+        if cmd == "status" and args.watch:
+            for event in client.subscribe():
+                _print_status(event)
+        elif cmd == "status":
+            _print_status(client.request("status"))
+        elif cmd == "toggle":
+            _print_status(client.request("toggle", **({"mode": args.mode} if args.mode else {})))
+        elif cmd == "today":
+            reply = client.request("today")
+            print(f"{reply['day']}  active {hms(reply['active'])}  pause {hms(reply['pause'])}")
+    except DaemonUnavailable as e:
+        sys.exit(f"{e}; start it with `python -m timetracker start`")
+    except IpcError as e:
+        sys.exit(f"error: {e}")
+    except KeyboardInterrupt:
+        pass
@@ -1,24 +1,112 @@
+"""Logging for the app: every `tt.*` logger propagates to the `tt` logger,
+which owns the rotating log file and the console handler.
+
+Long-running commands call `start_async()`: the `tt` logger then only puts
+records on a queue and a `QueueListener` thread does the file writes and the
+rotation, so the tracker's message loop never waits on disk. `stop_async()`
+(also registered with atexit) drains the queue and restores direct logging.
+
+Per-event messages (DB writes, raw session notifications) are logged at
+DEBUG, so at the default LOG_LEVEL=INFO they cost one level check.
+"""
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
-from .config import LOG_PATH
+import threading
+from .config import LOG_LEVEL, LOG_PATH
+
+_ROOT = "tt"
+_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+_lock = threading.Lock()
+_listener = None
+_direct_handlers = None
+
+
+class _LazyFileHandler(logging.Handler):
+    """Rotating log file that is only created (with its directory) on the first record.
+
+    Keeps `get_logger()` free of disk access and of the `logging.handlers`
+    import, so short-lived commands that never log pay for neither.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._handler = None
+
+    def emit(self, record):
+        if self._handler is None:
+            from logging.handlers import RotatingFileHandler
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handler = RotatingFileHandler(
+                self.path, maxBytes=2_000_000, backupCount=3, encoding="utf-8"
+            )
+            self._handler.setFormatter(self.formatter)
+        self._handler.emit(record)
+
+    def flush(self):
+        if self._handler is not None:
+            self._handler.flush()
+
+    def close(self):
+        if self._handler is not None:
+            self._handler.close()
+        super().close()
+
+
+def _configure_root():
+    root = logging.getLogger(_ROOT)
+    if getattr(root, "_configured", False):
+        return root
+    with _lock:
+        if getattr(root, "_configured", False):
+            return root
+        root.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+        fmt = logging.Formatter(_FORMAT)
+        fh = _LazyFileHandler(LOG_PATH)
+        fh.setFormatter(fmt)
+        root.addHandler(fh)
+        ch = logging.StreamHandler()
+        ch.setFormatter(fmt)
+        root.addHandler(ch)
+        root._configured = True
+    return root
+
 
 def get_logger(name="tt"):
     """Returnează un logger configurat pentru aplicație."""
-    logger = logging.getLogger(name)
-    if getattr(logger, "_configured", False):
-        return logger
+    _configure_root()
+    return logging.getLogger(name)
+
 
-    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    logger.setLevel(logging.INFO)
+def start_async() -> None:
+    """Move the file/console writes of the `tt` loggers to a background thread."""
+    global _listener, _direct_handlers
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
 
-    fh = RotatingFileHandler(LOG_PATH, maxBytes=2_000_000, backupCount=3, encoding="utf-8")
-    fmt = logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
-    fh.setFormatter(fmt)
-    logger.addHandler(fh)
+    root = _configure_root()
+    with _lock:
+        if _listener is not None:
+            return
+        _direct_handlers = list(root.handlers)
+        q = queue.SimpleQueue()
+        _listener = QueueListener(q, *_direct_handlers, respect_handler_level=True)
+        root.handlers = [QueueHandler(q)]  # one assignment: no record sees zero handlers
+        _listener.start()
+    atexit.register(stop_async)
 
-    ch = logging.StreamHandler()
-    ch.setFormatter(fmt)
-    logger.addHandler(ch)
 
-    logger._configured = True
-    return logger
+def stop_async() -> None:
+    """Write out everything still queued and go back to direct logging."""
+    global _listener, _direct_handlers
+    with _lock:
+        if _listener is None:
+            return
+        root = logging.getLogger(_ROOT)
+        # direct first: a record another thread logs while the listener drains
+        # must not land in a queue nobody reads any more
+        root.handlers = _direct_handlers
+        _listener.stop()  # processes the records already queued, then joins
+        for h in _direct_handlers:
+            h.flush()
+        _listener = _direct_handlers = None
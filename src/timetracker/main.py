@@ -1,49 +1,82 @@
-import sys, platform, subprocess, os
-from pathlib import Path
-# Allow running both as a package (recommended: `python -m timetracker ...`)
-# and as a script from inside the package directory (`python main.py ...`).
-try:
-    from .logging_setup import get_logger
-    from . import report
-except Exception:
-    # fallback to non-package imports when running main.py directly
-    from logging_setup import get_logger
-    import report
+import sys
+# Each command imports only what it uses, so short-lived commands (report,
+# status, ...) start fast; see benchmarks/bench_startup.py.
 
-logger = get_logger("tt.main")
 
 def main():
     if len(sys.argv) < 2:
         print("Usage:")
         print("python -m timetracker start")
-        print("  python -m timetracker report [days]")
+        print("  python -m timetracker report [days] [--from YYYY-MM-DD] [--to YYYY-MM-DD]")
+        print("                                   [--by day|week|month|year] [--columns active,pause,ratio]")
         print("  python -m timetracker control")
+        print("  python -m timetracker export [sessions|daily] [--format csv|jsonl|ttcol]")
+        print("                                   [--since YYYY-MM-DD] [--until YYYY-MM-DD] [-o PATH] [--gzip]")
+        print("  python -m timetracker rollup [check|rebuild]")
+        print("  python -m timetracker stats [--prom]")
+        print("  python -m timetracker replay TRACE | --generate N [--batch N]")
+        print("  python -m timetracker status [--watch] | toggle [active|pause] | today")
         return
 
     cmd = sys.argv[1].lower()
 
     if cmd == "start":
+        import platform
+        from . import config, logging_setup, metrics
+        config.ensure_dirs()
+        metrics.init("start")
+        if config.LOG_ASYNC:
+            logging_setup.start_async()
         if platform.system() == "Windows":
             from .platform.windows import run as run_win
-            # launch control GUI in a side process so start continues to run background window/tray
-            try:
-                env = os.environ.copy()
-                env.setdefault("PYTHONPATH", str(Path(__file__).resolve().parents[1]))
-                subprocess.Popen([sys.executable, "-m", "timetracker", "control"], env=env)
-            except Exception:
-                logger.exception("Failed to launch control GUI")
-            run_win()
+            # the tracker opens the control GUI itself once its IPC server is up
+            run_win(open_control=True)
         elif platform.system() == "Darwin":
             from .platform.macos import run as run_mac
             run_mac()
+        elif platform.system() == "Linux":
+            from .platform.linux import run as run_linux
+            run_linux()
         else:
             print("Unsupported OS for this project.")
     elif cmd == "report":
-        days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
-        report.run(days)
+        from . import report
+        report.main(sys.argv[2:])
     elif cmd == "control":
-        from . import control_gui
+        from . import config, control_gui, logging_setup, metrics
+        config.ensure_dirs()
+        metrics.init("control")
+        if config.LOG_ASYNC:
+            logging_setup.start_async()
         control_gui.run()
+    elif cmd == "export":
+        from . import export
+        export.main(sys.argv[2:])
+    elif cmd == "rollup":
+        from .db import connect, check_rollup, rebuild_rollup
+        action = sys.argv[2].lower() if len(sys.argv) > 2 else "check"
+        con = connect()
+        try:
+            if action == "rebuild":
+                print(f"daily_rollup rebuilt: {rebuild_rollup(con)} days")
+            elif action == "check":
+                bad = check_rollup(con)
+                for day, rollup, raw in bad:
+                    print(f"{day}  rollup={rollup}  raw={raw}")
+                print("daily_rollup OK" if not bad else f"{len(bad)} day(s) out of sync; run `rollup rebuild`")
+            else:
+                print(f"Unknown rollup action: {action}")
+        finally:
+            con.close()
+    elif cmd in ("status", "toggle", "today"):
+        from . import ipc
+        ipc.main(cmd, sys.argv[2:])
+    elif cmd == "stats":
+        from . import metrics
+        metrics.main(sys.argv[2:])
+    elif cmd == "replay":
+        from . import replay
+        replay.main(sys.argv[2:])
     else:
         print(f"Unknown command: {cmd}")
 
@@ -0,0 +1,251 @@
+"""In-process call counters and latency histograms for the hot paths.
+
+Instrumented code wraps a call in `timed("name")` (decorator or context
+manager); a record costs two `perf_counter()` calls, a bisect and a few adds
+under a lock, and never touches the disk. The process-wide `REGISTRY` is
+written by its own thread every METRICS_FLUSH_SEC seconds and once more at
+exit, to
+
+    BASE_DIR/metrics/<process>.json   read by `python -m timetracker stats`
+    BASE_DIR/metrics/<process>.prom   Prometheus textfile-collector format
+
+where <process> is the name given to `init()` ("start", "control", ...).
+Without `init()` nothing is written, so tests and one-shot commands pay only
+for the in-memory counts.
+"""
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from .config import BASE_DIR, METRICS_FLUSH_SEC as FLUSH_SEC
+
+METRICS_DIR = BASE_DIR / "metrics"
+
+# upper bounds in seconds, 10 us .. 10 s; the last bucket is +Inf
+BUCKETS = (
+    1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+    1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, sec):
+        self.counts[bisect.bisect_left(BUCKETS, sec)] += 1
+        self.count += 1
+        self.sum += sec
+        if sec > self.max:
+            self.max = sec
+
+    def to_dict(self):
+        return {"count": self.count, "sum": self.sum, "max": self.max, "buckets": list(self.counts)}
+
+
+def quantile(hist: dict, q: float) -> float:
+    """Estimate the q-quantile (0..1) of a histogram dict, interpolating inside its bucket."""
+    total = hist["count"]
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for i, n in enumerate(hist["buckets"]):
+        if n and seen + n >= rank:
+            lo = BUCKETS[i - 1] if i else 0.0
+            hi = BUCKETS[i] if i < len(BUCKETS) else hist["max"]
+            return min(lo + (hi - lo) * (rank - seen) / n, hist["max"])
+        seen += n
+    return hist["max"]
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._hists = {}
+        self.process = None
+        self.started = time.time()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def observe(self, name, sec):
+        with self._lock:
+            hist = self._hists.get(name)
+            if hist is None:
+                hist = self._hists[name] = Histogram()
+            hist.observe(sec)
+
+    def start(self, process: str, interval: float = FLUSH_SEC) -> "Registry":
+        """Name this process's files and write them every `interval` seconds from a thread."""
+        self.process = process
+        if self._thread is None and interval > 0:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, args=(interval,),
+                                            name="tt-metrics", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the flush thread and write a last snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _loop(self, interval):
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {name: h.to_dict() for name, h in self._hists.items()}
+
+    def reset(self):
+        with self._lock:
+            self._hists.clear()
+
+    def flush(self, directory: Path | None = None):
+        """Write the JSON and textfile snapshots for this process; no-op before `init()`."""
+        if not self.process or not self._flush_lock.acquire(blocking=False):
+            return  # another thread is already writing
+        try:
+            self._flush(directory)
+        finally:
+            self._flush_lock.release()
+
+    def _flush(self, directory):
+        directory = Path(directory or METRICS_DIR)
+        data = {
+            "process": self.process,
+            "pid": os.getpid(),
+            "started": self.started,
+            "written": time.time(),
+            "buckets": list(BUCKETS),
+            "metrics": self.snapshot(),
+        }
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            _write_atomic(directory / f"{self.process}.json", json.dumps(data))
+            _write_atomic(directory / f"{self.process}.prom", to_prometheus(data))
+        except OSError:
+            pass  # metrics must never take the tracker down
+
+
+REGISTRY = Registry()
+
+
+def _write_atomic(path: Path, text: str):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def to_prometheus(data: dict) -> str:
+    """Render a snapshot dict in the Prometheus text exposition format."""
+    proc = data["process"]
+    lines = [
+        "# HELP timetracker_call_seconds Latency of instrumented timetracker calls.",
+        "# TYPE timetracker_call_seconds histogram",
+    ]
+    for name, hist in sorted(data["metrics"].items()):
+        labels = f'process="{proc}",name="{name}"'
+        cumulative = 0
+        for bound, n in zip((*BUCKETS, "+Inf"), hist["buckets"]):
+            cumulative += n
+            lines.append(f'timetracker_call_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"timetracker_call_seconds_sum{{{labels}}} {hist['sum']:.9f}")
+        lines.append(f"timetracker_call_seconds_count{{{labels}}} {hist['count']}")
+    return "\n".join(lines) + "\n"
+
+
+class timed:
+    """Record the duration of a block or function under `name`.
+
+        with timed("db.daily_totals"): ...
+
+        @timed("core.ensure_mode")
+        def ensure_mode(...): ...
+    """
+
+    __slots__ = ("name", "registry", "_t0")
+
+    def __init__(self, name, registry=None):
+        self.name = name
+        self.registry = registry
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        (self.registry or REGISTRY).observe(self.name, time.perf_counter() - self._t0)
+        return False
+
+    def __call__(self, fn):
+        name, registry = self.name, self.registry
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                (registry or REGISTRY).observe(name, time.perf_counter() - t0)
+        return wrapper
+
+
+def init(process: str):
+    """Name this process's metrics files and flush them periodically and at exit."""
+    REGISTRY.start(process)
+    atexit.register(REGISTRY.stop)
+
+
+def load_all(directory: Path | None = None):
+    """Return the snapshot dicts of every process found in the metrics directory."""
+    directory = Path(directory or METRICS_DIR)
+    out = []
+    for path in sorted(directory.glob("*.json")):
+        try:
+            out.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return out
+
+
+def _ms(sec):
+    return f"{sec * 1000:9.3f}"
+
+
+def main(argv=None):
+    """`python -m timetracker stats [--prom]`: print per-call percentiles from the metrics files."""
+    import argparse
+    ap = argparse.ArgumentParser(prog="python -m timetracker stats")
+    ap.add_argument("--prom", action="store_true", help="print the textfile-exporter format instead")
+    args = ap.parse_args(argv)
+
+    snapshots = load_all()
+    if not snapshots:
+        print(f"No metrics in {METRICS_DIR} yet (written by `start`/`control` every {FLUSH_SEC}s and at exit).")
+        return
+    for data in snapshots:
+        if args.prom:
+            print(to_prometheus(data), end="")
+            continue
+        written = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(data["written"]))
+        print(f"[{data['process']}] pid {data['pid']}, written {written}")
+        print(f"  {'name':<28} {'count':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for name, hist in sorted(data["metrics"].items()):
+            print(f"  {name:<28} {hist['count']:>9} {_ms(quantile(hist, .5))} {_ms(quantile(hist, .95))}"
+                  f" {_ms(quantile(hist, .99))} {_ms(hist['max'])}")
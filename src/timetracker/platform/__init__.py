@@ -1 +1 @@
-# Platform-specific modules: windows.py, macos.py
+# Platform-specific modules: windows.py, macos.py, linux.py
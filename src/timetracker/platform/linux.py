@@ -0,0 +1,298 @@
+"""Linux tracker: session lock/unlock events from a pluggable source.
+
+An `EventSource` runs on its own thread and calls `emit("pause" | "active")`
+for every session change, and `emit("resume")` after a suspend. Two are
+provided:
+
+- `LogindSource`: follows systemd-logind on the system bus (`dbus-monitor`),
+  i.e. the session's Lock/Unlock signals, its LockedHint property and
+  suspend/resume.
+- `FileSource`: reads one word per line (lock/unlock/pause/active/resume)
+  from a file or FIFO, so a script, a test or a CI job can stand in for the
+  desktop.
+
+`LINUX_EVENT_SOURCE` picks one: "logind", a path, or empty for logind when it
+is available and a FIFO at BASE_DIR/events otherwise. The events drive the
+same `TrackerEngine` as the Windows and macOS trackers, and the tracker runs
+for as long as its source does; "resume" re-arms the midnight rollover.
+Under X11 with `xprintidle` installed, inactivity pauses too (see idle.py).
+"""
+import abc
+import os
+import re
+import select
+import shutil
+import signal
+import stat
+import subprocess
+import threading
+from pathlib import Path
+
+from ..config import BASE_DIR, LINUX_EVENT_SOURCE
+from ..engine import TrackerEngine
+from ..logging_setup import get_logger
+
+logger = get_logger("tt.linux")
+
+
+class EventSource(abc.ABC):
+    """Blocks in `run(emit, stop)` until `stop` is set or the source ends."""
+
+    name = "events"
+
+    @abc.abstractmethod
+    def run(self, emit, stop: threading.Event) -> None:
+        ...
+
+
+# --- logind -----------------------------------------------------------------
+
+LOGIN1 = "org.freedesktop.login1"
+SESSION_IFACE = LOGIN1 + ".Session"
+SESSION_PREFIX = "/org/freedesktop/login1/session/"
+
+MATCH_RULES = (
+    f"type='signal',sender='{LOGIN1}',interface='{SESSION_IFACE}'",
+    f"type='signal',sender='{LOGIN1}',interface='{LOGIN1}.Manager',member='PrepareForSleep'",
+    f"type='signal',sender='{LOGIN1}',interface='org.freedesktop.DBus.Properties',member='PropertiesChanged'",
+)
+
+_HEADER = re.compile(r"path=([^;]*); interface=([^;]*); member=(\S+)")
+
+
+def session_path(session_id: str) -> str:
+    """D-Bus object path of a logind session, escaped the way systemd does ("2" -> "_32")."""
+    label = "".join(
+        c if c.isascii() and c.isalnum() and not (i == 0 and c.isdigit()) else f"_{ord(c):02x}"
+        for i, c in enumerate(session_id)
+    )
+    return SESSION_PREFIX + (label or "_")
+
+
+class LogindParser:
+    """Turns `dbus-monitor` output, line by line, into session events.
+
+    With `session` set only that session's signals count; otherwise any
+    session's do (fine on a single-seat workstation).
+    """
+
+    def __init__(self, session: str | None = None):
+        self.session = session
+        self.locked = False
+        self._want = None  # which boolean argument of the current signal we wait for
+
+    def _ours(self, path: str) -> bool:
+        return path == self.session if self.session else path.startswith(SESSION_PREFIX)
+
+    def _lock(self, locked: bool) -> list[str]:
+        self.locked = locked
+        return ["pause" if locked else "active"]
+
+    def feed(self, line: str) -> list[str]:
+        """The events `line` completes, usually none."""
+        line = line.strip()
+        if line.startswith(("signal ", "method ", "error ")):
+            self._want = None
+            m = _HEADER.search(line)
+            if not line.startswith("signal ") or not m:
+                return []
+            path, iface, member = m.groups()
+            if iface == SESSION_IFACE and self._ours(path):
+                if member == "Lock":
+                    return self._lock(True)
+                if member == "Unlock":
+                    return self._lock(False)
+            elif member == "PrepareForSleep":
+                self._want = "sleep"
+            elif member == "PropertiesChanged" and self._ours(path):
+                self._want = "props"
+            return []
+        if self._want == "sleep" and line.startswith("boolean "):
+            self._want = None
+            if line.endswith("true"):
+                return ["pause"]
+            # resuming: a locked session stays paused until its Unlock
+            return ["resume"] if self.locked else ["resume", "active"]
+        if self._want == "props" and line == 'string "LockedHint"':
+            self._want = "locked_hint"
+        elif self._want == "locked_hint" and "boolean " in line:
+            self._want = "props"
+            return self._lock(line.endswith("true"))
+        return []
+
+
+class LogindSource(EventSource):
+    """Session events from systemd-logind, read from a `dbus-monitor --system` child."""
+
+    name = "logind"
+
+    def __init__(self, session: str | None = None, restart_sec: float = 5.0):
+        if session is None and os.environ.get("XDG_SESSION_ID"):
+            session = session_path(os.environ["XDG_SESSION_ID"])
+        self.session = session
+        self.restart_sec = restart_sec
+
+    @staticmethod
+    def available() -> bool:
+        return shutil.which("dbus-monitor") is not None and os.path.isdir("/run/systemd/system")
+
+    def run(self, emit, stop):
+        if shutil.which("dbus-monitor") is None:
+            raise RuntimeError("dbus-monitor not found; install dbus or set LINUX_EVENT_SOURCE")
+        parser = LogindParser(self.session)
+        logger.info("Following logind session %s", self.session or "(any)")
+        while not stop.is_set():
+            self._monitor(parser, emit, stop)
+            # the bus or dbus-monitor went away: try again, unless we are stopping
+            if stop.wait(self.restart_sec):
+                return
+            logger.warning("dbus-monitor exited; restarting")
+
+    def _monitor(self, parser, emit, stop):
+        proc = subprocess.Popen(
+            ["dbus-monitor", "--system", *MATCH_RULES],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        done = threading.Event()
+
+        def _kill_on_stop():
+            while not done.is_set():
+                if stop.wait(0.5):
+                    proc.terminate()
+                    return
+        threading.Thread(target=_kill_on_stop, name="tt-logind-stop", daemon=True).start()
+        try:
+            for line in proc.stdout:
+                for event in parser.feed(line):
+                    emit(event)
+        finally:
+            done.set()
+            proc.stdout.close()
+            proc.wait()
+
+
+# --- file / FIFO --------------------------------------------------------------
+
+WORDS = {"lock": "pause", "pause": "pause", "unlock": "active", "active": "active", "resume": "resume"}
+
+
+class FileSource(EventSource):
+    """Reads lock/unlock/pause/active/resume lines from a file or FIFO.
+
+    A missing `path` is created as a FIFO, so `echo lock > BASE_DIR/events`
+    drives the tracker. A regular file is followed like `tail -f` from its
+    current end; `from_start=True, follow=False` replays it once instead and
+    ends the source (and the tracker) at EOF.
+    """
+
+    name = "file"
+
+    def __init__(self, path, from_start: bool = False, follow: bool = True, poll: float = 0.5):
+        self.path = Path(path)
+        self.from_start = from_start
+        self.follow = follow
+        self.poll = poll
+
+    def run(self, emit, stop):
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            os.mkfifo(self.path, 0o600)
+        fifo = stat.S_ISFIFO(os.stat(self.path).st_mode)
+        # holding a FIFO open for writing ourselves means we never see EOF
+        # between two writers, only blocking reads (Linux semantics)
+        fd = os.open(self.path, (os.O_RDWR if fifo else os.O_RDONLY) | os.O_NONBLOCK)
+        logger.info("Reading session events from %s %s", "FIFO" if fifo else "file", self.path)
+        try:
+            if not fifo and not self.from_start:
+                os.lseek(fd, 0, os.SEEK_END)
+            buf = b""
+            while not stop.is_set():
+                if fifo and not select.select([fd], [], [], self.poll)[0]:
+                    continue
+                try:
+                    chunk = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    if not self.follow:
+                        break
+                    if os.fstat(fd).st_size < os.lseek(fd, 0, os.SEEK_CUR):
+                        os.lseek(fd, 0, os.SEEK_SET)  # truncated: start over
+                    stop.wait(self.poll)
+                    continue
+                *lines, buf = (buf + chunk).split(b"\n")
+                for line in lines:
+                    self._emit_line(line, emit)
+            if buf:
+                self._emit_line(buf, emit)
+        finally:
+            os.close(fd)
+
+    def _emit_line(self, line: bytes, emit):
+        word = line.strip().decode("utf-8", "replace").lower()
+        if not word or word.startswith("#"):
+            return
+        mode = WORDS.get(word)
+        if mode is None:
+            logger.warning("Ignoring unknown session event %r", word)
+            return
+        emit(mode)
+
+
+def default_source() -> EventSource:
+    spec = LINUX_EVENT_SOURCE
+    if spec == "logind" or (not spec and LogindSource.available()):
+        return LogindSource()
+    return FileSource(Path(spec).expanduser() if spec else BASE_DIR / "events")
+
+
+# --- tracker ------------------------------------------------------------------
+
+class LinuxTracker:
+    """Feeds one `EventSource` into a `TrackerEngine` for as long as the source runs."""
+
+    def __init__(self, source: EventSource):
+        self.source = source
+        self.engine = TrackerEngine(log=logger)
+
+    def on_event(self, event):
+        logger.debug("Session event from %s: %s", self.source.name, event)
+        if event == "resume":
+            self.engine.rearm()
+        else:
+            self.engine.session(event)
+
+    def _run_source(self, stop):
+        try:
+            self.source.run(self.on_event, stop)
+        except Exception:
+            logger.exception("Event source %s failed", self.source.name)
+        finally:
+            stop.set()
+
+    def run(self, stop: threading.Event | None = None, detect_idle: bool = True):
+        """Track until `stop` is set or the source ends, then clean up."""
+        stop = stop or threading.Event()
+        thread = threading.Thread(target=self._run_source, args=(stop,), name="tt-events", daemon=True)
+        self.engine.start(detect_idle=detect_idle)
+        logger.info("Tracker started source=%s", self.source.name)
+        thread.start()
+        try:
+            # wake up now and then so Python can run signal handlers
+            while not stop.wait(1.0):
+                pass
+        finally:
+            stop.set()
+            thread.join(5.0)
+            self.engine.stop()
+
+
+def run(source: EventSource | None = None):
+    stop = threading.Event()
+
+    def _on_signal(signum, _frame):
+        logger.info("Signal %s caught; closing...", signum)
+        stop.set()
+    for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+        signal.signal(sig, _on_signal)
+    LinuxTracker(source or default_source()).run(stop)
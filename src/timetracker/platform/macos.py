@@ -1,7 +1,6 @@
-from Cocoa import NSWorkspace, NSObject, NSRunLoop, NSDate, NSTimer
+from Cocoa import NSWorkspace, NSObject, NSRunLoop, NSDate, NSNotificationCenter
 import objc, datetime as dt, time, os, sqlite3
-from ..core import ensure_rollover, ensure_mode
-from ..db import connect
+from ..engine import TrackerEngine
 from ..logging_setup import get_logger
 
 logger = get_logger("tt.macos")
@@ -10,24 +9,22 @@ class Observer(NSObject):
     def init(self):
         self = objc.super(Observer, self).init()
         if self is None: return None
-        self.con = connect()
-        ensure_rollover(self.con, logger)
-        ensure_mode(self.con, "active", logger)
-        self.timer = NSTimer.scheduledTimerWithTimeInterval_target_selector_userInfo_repeats_(
-            60.0, self, objc.selector(self.tick_, signature=b'v@:@'), None, True
-        )
+        # the run loop only ends when the process is killed, so the interval
+        # it leaves open is closed at the last heartbeat on the next start
+        self.engine = TrackerEngine(log=logger).start()
         return self
 
-    def tick_(self, _):
-        ensure_rollover(self.con, logger)
+    def didWake_(self, notif):
+        self.engine.rearm()
+
+    def clockDidChange_(self, notif):
+        self.engine.rearm()
 
     def sessionDidResignActive_(self, notif):
-        ensure_rollover(self.con, logger)
-        ensure_mode(self.con, "pause", logger)
+        self.engine.session("pause")
 
     def sessionDidBecomeActive_(self, notif):
-        ensure_rollover(self.con, logger)
-        ensure_mode(self.con, "active", logger)
+        self.engine.session("active")
 
 def run():
     obs = Observer.alloc().init()
@@ -38,4 +35,10 @@ def run():
     ws.addObserver_selector_name_object_(
         obs, objc.selector(Observer.sessionDidBecomeActive_, signature=b'v@:@'),
         "NSWorkspaceSessionDidBecomeActiveNotification", None)
+    ws.addObserver_selector_name_object_(
+        obs, objc.selector(Observer.didWake_, signature=b'v@:@'),
+        "NSWorkspaceDidWakeNotification", None)
+    NSNotificationCenter.defaultCenter().addObserver_selector_name_object_(
+        obs, objc.selector(Observer.clockDidChange_, signature=b'v@:@'),
+        "NSSystemClockDidChangeNotification", None)
     NSRunLoop.currentRunLoop().runUntilDate_(NSDate.distantFuture())
@@ -1,9 +1,7 @@
-import threading, time, signal, ctypes, subprocess, sys, os
+import threading, time, signal, subprocess, sys, os
 from pathlib import Path
-from ctypes import wintypes
 import win32con, win32gui, win32api, win32ts
-from ..core import ensure_mode, ensure_rollover
-from ..db import connect, close_open_interval
+from ..engine import TrackerEngine
 from ..logging_setup import get_logger
 from ..config import ASSET_ICON
 try:
@@ -16,34 +14,13 @@ except Exception:
 WM_WTSSESSION_CHANGE = 0x02B1
 WTS_SESSION_LOCK = 0x7
 WTS_SESSION_UNLOCK = 0x8
-WM_TIMER = 0x0113
-TIMER_ID = 1
-TIMER_MS = 60_000
+WM_TIMECHANGE = 0x001E
+WM_POWERBROADCAST = 0x0218
+PBT_APMRESUMESUSPEND = 0x7
+PBT_APMRESUMEAUTOMATIC = 0x12
 
 logger = get_logger("tt")
 
-# ctypes wrappers for user32 SetTimer/KillTimer — used when pywin32 doesn't expose SetTimer
-_user32 = ctypes.windll.user32
-try:
-    _user32.SetTimer.argtypes = (wintypes.HWND, wintypes.UINT, wintypes.UINT, ctypes.c_void_p)
-    _user32.SetTimer.restype = wintypes.UINT
-    _user32.KillTimer.argtypes = (wintypes.HWND, wintypes.UINT)
-    _user32.KillTimer.restype = wintypes.BOOL
-    _CTYPES_AVAILABLE = True
-except Exception:
-    _CTYPES_AVAILABLE = False
-
-def ctypes_set_timer(hwnd, timer_id, ms):
-    if not _CTYPES_AVAILABLE:
-        return False
-    res = _user32.SetTimer(hwnd, timer_id, ms, None)
-    return bool(res)
-
-def ctypes_kill_timer(hwnd, timer_id):
-    if not _CTYPES_AVAILABLE:
-        return False
-    return bool(_user32.KillTimer(hwnd, timer_id))
-
 
 def _launch_control_gui():
     """Spawn the control GUI in a separate process (guard one at a time)."""
@@ -69,8 +46,7 @@ def _launch_control_gui():
 
 
 class HiddenWindow:
-    def __init__(self):
-        self.db_lock = threading.Lock()
+    def __init__(self, open_control: bool = False):
         self.hinst = win32api.GetModuleHandle(None)
         wc = win32gui.WNDCLASS()
         wc.hInstance = self.hinst
@@ -79,43 +55,14 @@ class HiddenWindow:
         self.classAtom = win32gui.RegisterClass(wc)
         self.hwnd = win32gui.CreateWindow(self.classAtom, "TT", 0, 0, 0, 0, 0, 0, 0, self.hinst, None)
         win32ts.WTSRegisterSessionNotification(self.hwnd, 0)
-        # prefer native SetTimer via pywin32, then ctypes, otherwise fall back to thread
-        self._timer_thread = None
-        self._timer_stop = None
-        self._using_ctypes_timer = False
-        self._using_pywin32_timer = False
-        try:
-            # try pywin32 helper first
-            win32gui.SetTimer(self.hwnd, TIMER_ID, TIMER_MS, None)
-            self._using_pywin32_timer = True
-            logger.info("Using win32gui.SetTimer for WM_TIMER (interval_ms=%d)", TIMER_MS)
-        except Exception:
-            # try ctypes native user32.SetTimer next
-            try:
-                if ctypes_set_timer(self.hwnd, TIMER_ID, TIMER_MS):
-                    self._using_ctypes_timer = True
-                    logger.info("Using ctypes user32.SetTimer for WM_TIMER (interval_ms=%d)", TIMER_MS)
-                else:
-                    raise RuntimeError("ctypes SetTimer failed")
-            except Exception:
-                logger.info("win32gui.SetTimer not available; starting thread fallback for WM_TIMER (interval_ms=%d)", TIMER_MS)
-                # unele versiuni/instalări nu expun SetTimer; postăm WM_TIMER periodic din thread
-                self._timer_stop = threading.Event()
-                def _timer_loop():
-                    interval = TIMER_MS / 1000.0
-                    while not self._timer_stop.wait(interval):
-                        try:
-                            win32gui.PostMessage(self.hwnd, WM_TIMER, TIMER_ID, 0)
-                        except Exception:
-                            logger.exception("Error posting WM_TIMER from fallback thread")
-                self._timer_thread = threading.Thread(target=_timer_loop, daemon=True)
-                self._timer_thread.start()
-
-        self.con = connect(check_same_thread=False)
-        with self.db_lock:
-            ensure_rollover(self.con, logger)
-            ensure_mode(self.con, "active", logger)
+
+        # every tracker write (this thread, the rollover scheduler, cleanup) goes through
+        # the engine's DB thread and connection; the tray reads read-only
+        self.engine = TrackerEngine(log=logger).start()
         logger.info("Tracker started hwnd=%s", self.hwnd)
+        if open_control:
+            # only now: a window started before IPC listens would find no daemon
+            _launch_control_gui()
         # Start tray icon if available so user can see the app is running
         if start_tray:
             try:
@@ -126,7 +73,8 @@ class HiddenWindow:
                     except Exception:
                         logger.exception("Error posting WM_CLOSE from tray exit callback")
 
-                start_tray(str(ASSET_ICON), title="TimeTracker", on_exit=_exit_cb, on_control=_launch_control_gui)
+                start_tray(str(ASSET_ICON), title="TimeTracker", on_exit=_exit_cb,
+                           on_control=_launch_control_gui, counter=self.engine.counter)
                 logger.info("Tray icon started: %s", ASSET_ICON)
             except Exception:
                 logger.exception("Failed to start tray icon")
@@ -134,20 +82,19 @@ class HiddenWindow:
     def _wndproc(self, hWnd, msg, wParam, lParam):
         try:
             if msg == WM_WTSSESSION_CHANGE:
-                logger.info("WM_WTSSESSION_CHANGE received wParam=%s lParam=%s", wParam, lParam)
+                logger.debug("WM_WTSSESSION_CHANGE received wParam=%s lParam=%s", wParam, lParam)
                 if wParam == WTS_SESSION_LOCK:
                     logger.info("Session lock detected")
-                    with self.db_lock:
-                        ensure_rollover(self.con, logger)
-                        ensure_mode(self.con, "pause", logger)
+                    self.engine.session("pause")
                 elif wParam == WTS_SESSION_UNLOCK:
                     logger.info("Session unlock detected")
-                    with self.db_lock:
-                        ensure_rollover(self.con, logger)
-                        ensure_mode(self.con, "active", logger)
-            elif msg == WM_TIMER and wParam == TIMER_ID:
-                with self.db_lock:
-                    ensure_rollover(self.con, logger)
+                    self.engine.session("active")
+            elif msg == WM_POWERBROADCAST and wParam in (PBT_APMRESUMESUSPEND, PBT_APMRESUMEAUTOMATIC):
+                logger.info("Resumed from suspend; re-arming rollover")
+                self.engine.rearm()
+            elif msg == WM_TIMECHANGE:
+                logger.info("System time changed; re-arming rollover")
+                self.engine.rearm()
             elif msg in (win32con.WM_CLOSE, win32con.WM_DESTROY):
                 self.cleanup()
         except Exception:
@@ -158,11 +105,7 @@ class HiddenWindow:
         if getattr(self, "_cleaned", False):
             return
         self._cleaned = True
-        logger.info("Cleanup: closing DB")
         try:
-            with self.db_lock:
-                close_open_interval(self.con)
-                self.con.close()
             win32ts.WTSUnRegisterSessionNotification(self.hwnd)
         except Exception:
             logger.exception("Cleanup error")
@@ -173,45 +116,18 @@ class HiddenWindow:
                 logger.info("Tray icon stopped")
             except Exception:
                 logger.exception("Error stopping tray icon")
-        # stop/kill timer (pywin32, ctypes) or fallback thread
-        try:
-            if getattr(self, '_using_pywin32_timer', False):
-                try:
-                    # KillTimer is provided by pywin32
-                    win32gui.KillTimer(self.hwnd, TIMER_ID)
-                    logger.info("Killed pywin32 timer")
-                except Exception:
-                    logger.exception("Error killing pywin32 timer")
-            elif getattr(self, '_using_ctypes_timer', False):
-                try:
-                    if ctypes_kill_timer(self.hwnd, TIMER_ID):
-                        logger.info("Killed ctypes timer")
-                    else:
-                        logger.warning("ctypes KillTimer reported failure")
-                except Exception:
-                    logger.exception("Error killing ctypes timer")
-            else:
-                # stop fallback thread if present
-                if self._timer_stop:
-                    try:
-                        self._timer_stop.set()
-                    except Exception:
-                        logger.exception("Error setting timer stop event")
-                if self._timer_thread:
-                    try:
-                        self._timer_thread.join(timeout=1.0)
-                    except Exception:
-                        logger.exception("Error joining timer thread")
-        except Exception:
-            logger.exception("Error stopping timer")
+        self.engine.stop()
+
+def run(open_control: bool = False):
+    """Start the tracker message loop on the SAME thread that owns the window.
 
-def run():
-    """Start the tracker message loop on the SAME thread that owns the window."""
+    `open_control` also opens the control GUI once the tracker accepts IPC.
+    """
     ready = threading.Event()
     wnd_holder = {}
 
     def loop():
-        wnd = HiddenWindow()
+        wnd = HiddenWindow(open_control)
         wnd_holder["wnd"] = wnd
         try:
             # record the thread id so the main thread can post WM_QUIT to this message loop
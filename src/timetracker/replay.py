@@ -0,0 +1,269 @@
+"""Replays a lock/unlock trace through the tracking engine in simulated time.
+
+A trace is text, one event per line: `<epoch seconds> <event>`, with times
+never going back. Events map to what the trackers do:
+
+    lock, suspend   -> pause
+    unlock          -> active
+    resume          -> active, unless the session is locked
+    tick            -> rollover only (the midnight timer)
+
+Each event sets a `ManualClock` and runs the same `ensure_rollover` +
+`ensure_mode` pair as a platform tracker, against a scratch DB, as fast as
+the DB allows. At the end the per-day totals read back from the DB are
+compared with totals integrated straight from the trace.
+
+    python -m timetracker replay TRACE [--batch N] [--db PATH]
+    python -m timetracker replay --generate 1000000 [--days 30] [--seed 0] [--save TRACE]
+
+`--batch N` commits every N events in one transaction, as DBService groups
+bursts; the default commits per event. The trace is streamed, so a trace of
+millions of events needs no more memory than a short one.
+"""
+import datetime as dt
+import itertools
+import logging
+import random
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from .core import ManualClock, TrackerState, day_of, local_midnight, next_midnight
+from .db import close_open_interval, connect, daily_breakdown, stored_ts
+from .duration import hms
+from .logging_setup import get_logger
+
+logger = get_logger("tt.replay")
+
+EVENTS = ("lock", "unlock", "suspend", "resume", "tick")
+TOLERANCE = 1e-3  # seconds per day; float sums of epoch differences drift a little
+
+
+def read_trace(path):
+    """Yield (ts, event) from a trace file, checking it as it goes."""
+    last = float("-inf")
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                ts_text, event = line.split()
+                ts = float(ts_text)
+            except ValueError:
+                raise ValueError(f"{path}:{lineno}: expected '<ts> <event>', got {line!r}") from None
+            if event not in EVENTS:
+                raise ValueError(f"{path}:{lineno}: unknown event {event!r}")
+            if ts < last:
+                raise ValueError(f"{path}:{lineno}: time goes back")
+            last = ts
+            yield ts, event
+
+
+def write_trace(events, path) -> int:
+    n = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for ts, event in events:
+            f.write(f"{ts:.6f} {event}\n")
+            n += 1
+    return n
+
+
+def generate(n: int, start: dt.date, days: int = 30, seed: int = 0):
+    """Yield `n` events spread over `days` local days from `start`.
+
+    Mostly lock/unlock alternations with some repeats (no-ops), a rollover
+    tick at every midnight and the odd suspend/resume pair. Deterministic.
+    """
+    rng = random.Random(seed)
+    t = local_midnight(start)
+    mean_gap = (local_midnight(start + dt.timedelta(days=days)) - t) / max(n, 1)
+    midnight = next_midnight(t)
+    locked = asleep = False
+    for _ in range(n):
+        t += rng.expovariate(1.0 / mean_gap)
+        if t >= midnight:
+            t, midnight, event = midnight, next_midnight(midnight), "tick"
+        elif asleep:
+            event, asleep = "resume", False
+        else:
+            r = rng.random()
+            if r < 0.01:
+                event, asleep = "suspend", True
+            elif r < 0.04:
+                event = "tick"
+            elif r < 0.14:
+                event = "lock" if locked else "unlock"  # a repeat: no transition
+            else:
+                event = "unlock" if locked else "lock"
+            if event in ("lock", "unlock"):
+                locked = event == "lock"
+        yield t, event
+
+
+class ExpectedTotals:
+    """Active/pause seconds per day, integrated from the events alone."""
+
+    def __init__(self):
+        self.days = defaultdict(lambda: [0.0, 0.0])
+        self.kind = None
+        self.since = None
+        self._day = None
+        self._day_end = float("-inf")
+
+    def switch(self, ts: float, kind: str | None):
+        """Account up to `ts`, then continue in `kind` (None: unchanged)."""
+        if self.kind is None:
+            self.kind, self.since = "active", ts  # the tracker starts active
+        slot = 0 if self.kind == "active" else 1
+        t = self.since
+        while t < ts:
+            if t >= self._day_end:
+                self._day, self._day_end = day_of(t), next_midnight(t)
+            cut = min(self._day_end, ts)
+            self.days[self._day][slot] += cut - t
+            t = cut
+        self.since = ts
+        if kind is not None:
+            self.kind = kind
+
+
+def _quiet_logger():
+    # one INFO line per transition would dominate a replay
+    log = logging.getLogger("tt.replay.core")
+    log.setLevel(logging.WARNING)
+    return log
+
+
+def replay(events, con, batch: int = 1) -> dict:
+    """Drive a fresh TrackerState on `con` through `events`; return the report."""
+    clock = ManualClock()
+    state = TrackerState(clock)
+    transitions = [0]
+    state.listeners.append(lambda _con, _state: transitions.__setitem__(0, transitions[0] + 1))
+    log = _quiet_logger()
+    expected = ExpectedTotals()
+    locked = False
+    count = 0
+    first = last = None
+    commits = con.commits
+
+    def apply(ts, event):
+        nonlocal locked
+        clock.t = ts = stored_ts(ts)  # the DB keeps milliseconds; so does the check
+        mode = None
+        if event in ("lock", "suspend"):
+            mode, locked = "pause", locked or event == "lock"
+        elif event == "unlock":
+            mode, locked = "active", False
+        elif event == "resume" and not locked:
+            mode = "active"
+        state.ensure_rollover(con, log)
+        if mode:
+            state.ensure_mode(con, mode, log)
+        expected.switch(ts, mode)
+
+    t0 = time.perf_counter()
+    it = iter(events)
+    while True:
+        chunk = list(itertools.islice(it, max(batch, 1)))
+        if not chunk:
+            break
+        if first is None:
+            first = chunk[0][0]
+        if batch > 1:
+            with con.batch():
+                for ts, event in chunk:
+                    apply(ts, event)
+        else:
+            for ts, event in chunk:
+                apply(ts, event)
+        count += len(chunk)
+        last = stored_ts(chunk[-1][0])
+    if last is not None:
+        close_open_interval(con, last)
+        expected.switch(last, None)
+    elapsed = time.perf_counter() - t0
+
+    actual = {}
+    if first is not None:
+        for day, active, pause in daily_breakdown(con, day_of(first), now_ts=last):
+            actual[day] = (active or 0.0, pause or 0.0)
+    days = sorted(set(actual) | set(expected.days))
+    diffs = {}
+    for day in days:
+        got = actual.get(day, (0.0, 0.0))
+        want = expected.days.get(day, (0.0, 0.0))
+        diff = max(abs(got[0] - want[0]), abs(got[1] - want[1]))
+        if diff > TOLERANCE:
+            diffs[day] = (got, tuple(want))
+    max_diff = max((max(abs(actual.get(d, (0, 0))[i] - expected.days.get(d, (0, 0))[i]) for i in (0, 1))
+                    for d in days), default=0.0)
+    writes = con.commits - commits
+    return {
+        "events": count,
+        "seconds": elapsed,
+        "events_per_sec": count / elapsed if elapsed else 0.0,
+        "transitions": transitions[0],
+        "commits": writes,
+        "commits_per_event": writes / count if count else 0.0,
+        "rows": con.execute("SELECT COUNT(*) FROM intervals").fetchone()[0],
+        "days": len(days),
+        "totals": {d: actual.get(d, (0.0, 0.0)) for d in days},
+        "mismatches": diffs,
+        "max_diff": max_diff,
+    }
+
+
+def main(argv=None):
+    import argparse
+    import tempfile
+
+    ap = argparse.ArgumentParser(prog="python -m timetracker replay", description=__doc__.splitlines()[0])
+    ap.add_argument("trace", nargs="?", help="trace file (omit with --generate)")
+    ap.add_argument("--generate", type=int, metavar="N", help="replay N synthetic events instead")
+    ap.add_argument("--days", type=int, default=30, help="days the synthetic events span (default 30)")
+    ap.add_argument("--start", type=dt.date.fromisoformat, default=dt.date(2024, 1, 1),
+                    help="first synthetic day (default 2024-01-01)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--save", metavar="PATH", help="also write the synthetic trace here")
+    ap.add_argument("--batch", type=int, default=1, help="events per transaction (default 1)")
+    ap.add_argument("--db", metavar="PATH", help="scratch DB to create (default: a temp file)")
+    ap.add_argument("--show-days", action="store_true", help="print the per-day totals")
+    args = ap.parse_args(argv)
+    if (args.trace is None) == (args.generate is None):
+        ap.error("give a trace file or --generate N")
+
+    if args.generate is not None:
+        events = generate(args.generate, args.start, args.days, args.seed)
+        if args.save:
+            write_trace(events, args.save)
+            events = read_trace(args.save)
+    else:
+        events = read_trace(args.trace)
+
+    path = Path(args.db) if args.db else Path(tempfile.mkdtemp(prefix="tt-replay-")) / "replay.db"
+    if path.exists():
+        ap.error(f"{path} exists; replay needs a fresh DB")
+    con = connect(path=path)
+    try:
+        report = replay(events, con, batch=args.batch)
+    except ValueError as e:
+        raise SystemExit(f"error: {e}")
+    finally:
+        con.close()
+
+    print(f"events       {report['events']:>12,}  in {report['seconds']:.2f} s"
+          f"  ({report['events_per_sec']:,.0f} events/s)")
+    print(f"transitions  {report['transitions']:>12,}")
+    print(f"DB commits   {report['commits']:>12,}  ({report['commits_per_event']:.3f} per event)")
+    print(f"rows         {report['rows']:>12,}  in {path}")
+    if args.show_days:
+        for day, (active, pause) in report["totals"].items():
+            print(f"  {day}  active {hms(active)}  pause {hms(pause)}")
+    if report["mismatches"]:
+        for day, (got, want) in report["mismatches"].items():
+            print(f"  {day}  db active/pause {got[0]:.3f}/{got[1]:.3f}  expected {want[0]:.3f}/{want[1]:.3f}")
+        raise SystemExit(f"{len(report['mismatches'])} of {report['days']} day(s) differ from the trace")
+    print(f"days         {report['days']:>12,}  totals match the trace (max diff {report['max_diff']:.6f} s)")
+    return report
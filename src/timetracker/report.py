@@ -1,25 +1,115 @@
+import argparse
 import datetime as dt
 import time
-from .db import connect, daily_totals
+from .db import connect, epoch_day
+from .duration import hms
 
-def fmt(sec):
-    sec = int(round(sec))
-    h, m, s = sec // 3600, (sec % 3600) // 60, sec % 60
-    return f"{h:02d}:{m:02d}:{s:02d}"
+# SQL key per grouping, applied to the ISO `day` column. ISO weeks belong to
+# the year of their Thursday: shift back 3 days, jump to the next Thursday.
+_ISO_THURSDAY = "date(day, '-3 days', 'weekday 4')"
+GROUPS = {
+    "day": "day",
+    "week": (
+        f"strftime('%Y', {_ISO_THURSDAY}) || '-W' || "
+        f"printf('%02d', (strftime('%j', {_ISO_THURSDAY}) - 1) / 7 + 1)"
+    ),
+    "month": "substr(day, 1, 7)",
+    "year": "substr(day, 1, 4)",
+}
+COLUMNS = ("active", "pause", "ratio")
+_HEADINGS = {
+    "day": "Ziua",
+    "week": "Săptămâna",
+    "month": "Luna",
+    "year": "Anul",
+    "active": "Timp activ",
+    "pause": "Timp pauză",
+    "ratio": "Activ %",
+}
 
-def run(days=30):
-    """Afișează raportul cu timpul activ din ultimele X zile."""
-    since = (dt.date.today() - dt.timedelta(days=days-1)).isoformat()
-    con = connect()
-    now_ts = time.time()
-    rows = daily_totals(con, since, now_ts=now_ts)
-    con.close()
+
+def build(con, start: str, end: str, group: str = "day", now_ts: float | None = None):
+    """Return [(period, active_sec, pause_sec)] for days in [start, end], newest first.
+
+    One grouped pass over `daily_rollup` (one row per day) plus the open
+    interval, so the cost follows the number of days, not of intervals.
+    """
+    if now_ts is None:
+        now_ts = time.time()
+    key = GROUPS[group]
+    return con.execute(f"""
+        SELECT {key} AS period, SUM(active_sec), SUM(pause_sec)
+        FROM (
+            SELECT day, active_sec, pause_sec
+            FROM daily_rollup
+            WHERE day BETWEEN ? AND ?
+            UNION ALL
+            SELECT date(day * 86400, 'unixepoch'),
+                   CASE WHEN kind=0 THEN ? - start_ms / 1000.0 ELSE 0 END,
+                   CASE WHEN kind=1 THEN ? - start_ms / 1000.0 ELSE 0 END
+            FROM intervals
+            WHERE end_ms IS NULL AND day BETWEEN ? AND ?
+        )
+        GROUP BY period
+        ORDER BY period DESC
+    """, (start, end, now_ts, now_ts, epoch_day(start), epoch_day(end))).fetchall()
+
+
+def _cell(column, active, pause):
+    if column == "active":
+        return hms(active)
+    if column == "pause":
+        return hms(pause)
+    total = active + pause
+    return f"{100.0 * active / total:.1f}%" if total else "-"
+
+
+def run_range(start: str, end: str, group: str = "day", columns=("active",)):
+    """Afișează raportul pentru intervalul [start, end], grupat pe zi/săptămână/lună/an."""
+    con = connect(profile="reader")
+    try:
+        rows = build(con, start, end, group, now_ts=time.time())
+    finally:
+        con.close()
 
     if not rows:
         print("Niciun interval găsit.")
         return
 
-    print("Ziua          Timp activ")
-    print("------------------------")
-    for day, sec in rows:
-        print(f"{day}    {fmt(sec or 0)}")
+    widths = [max(len(_HEADINGS[group]), 10)] + [max(len(_HEADINGS[c]), 10) for c in columns]
+    header = "    ".join(_HEADINGS[k].ljust(w) for k, w in zip((group, *columns), widths)).rstrip()
+    print(header)
+    print("-" * len(header))
+    for period, active, pause in rows:
+        cells = [period] + [_cell(c, active or 0, pause or 0) for c in columns]
+        print("    ".join(c.ljust(w) for c, w in zip(cells, widths)).rstrip())
+
+
+def run(days=30):
+    """Afișează raportul cu timpul activ din ultimele X zile."""
+    today = dt.date.today()
+    since = (today - dt.timedelta(days=days-1)).isoformat()
+    run_range(since, today.isoformat())
+
+
+def main(argv=None):
+    """`python -m timetracker report [days] [--from D] [--to D] [--by G] [--columns C,...]`."""
+    ap = argparse.ArgumentParser(prog="python -m timetracker report")
+    ap.add_argument("days", nargs="?", type=int, default=30,
+                    help="last N days, ending today (ignored when --from is given)")
+    ap.add_argument("--from", dest="start", type=dt.date.fromisoformat, help="first day, YYYY-MM-DD")
+    ap.add_argument("--to", dest="end", type=dt.date.fromisoformat, help="last day, YYYY-MM-DD (default today)")
+    ap.add_argument("--by", choices=sorted(GROUPS), default="day")
+    ap.add_argument("--columns", default="active",
+                    help="comma-separated: " + ",".join(COLUMNS))
+    args = ap.parse_args(argv)
+
+    columns = tuple(c.strip() for c in args.columns.split(",") if c.strip())
+    unknown = [c for c in columns if c not in COLUMNS]
+    if unknown or not columns:
+        ap.error(f"unknown column(s): {', '.join(unknown) or '(none)'}")
+    end = args.end or dt.date.today()
+    start = args.start or end - dt.timedelta(days=args.days - 1)
+    if start > end:
+        ap.error("--from is after --to")
+    run_range(start.isoformat(), end.isoformat(), args.by, columns)
@@ -0,0 +1,90 @@
+"""Runs the day rollover once per local midnight instead of polling for it.
+
+`RolloverScheduler` sleeps on a single one-shot deadline, the next local
+midnight (DST-aware, see `core.next_midnight`), and calls `callback()` once
+it has passed. The trackers' callback queues `ensure_rollover`, which splits
+the open interval exactly at midnight however late it runs.
+
+A monotonic sleep does not notice the wall clock being set or the machine
+being suspended, so the sleep is capped at `max_sleep` and every wake-up
+compares wall-clock and monotonic progress; a jump re-arms the deadline (and
+fires if midnight has passed). Platforms that get resume or time-change
+notifications call `rearm()` to do the same at once.
+"""
+import datetime as dt
+import threading
+import time
+
+from .core import next_midnight
+from .logging_setup import get_logger
+
+logger = get_logger("tt.rollover")
+
+
+class RolloverScheduler:
+    def __init__(self, callback, max_sleep: float = 300.0, jump_tolerance: float = 2.0,
+                 clock=time.time, monotonic=time.monotonic):
+        self.callback = callback
+        self.max_sleep = max_sleep
+        self.jump_tolerance = jump_tolerance
+        self._clock = clock
+        self._monotonic = monotonic
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self.deadline = None
+        self.fired = 0
+        self.rearmed = 0
+
+    def start(self) -> "RolloverScheduler":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="tt-rollover", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def rearm(self) -> None:
+        """Recompute the deadline now, e.g. after resume or a time change."""
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            deadline = self.deadline = next_midnight(self._clock())
+            logger.debug("Next rollover at %s", dt.datetime.fromtimestamp(deadline))
+            if not self._sleep_until(deadline):
+                return
+            if self._clock() >= deadline:
+                self._fire()
+
+    def _sleep_until(self, deadline) -> bool:
+        """Return when `deadline` passed or the clock moved under us; False on stop."""
+        while True:
+            wall, mono = self._clock(), self._monotonic()
+            remaining = deadline - wall
+            if remaining <= 0:
+                return True
+            woken = self._wake.wait(min(remaining, self.max_sleep))
+            if self._stop.is_set():
+                return False
+            if woken:
+                self._wake.clear()
+                self.rearmed += 1
+                return True
+            drift = (self._clock() - wall) - (self._monotonic() - mono)
+            if abs(drift) > self.jump_tolerance:
+                logger.info("Wall clock jumped %+.0fs; re-arming rollover", drift)
+                self.rearmed += 1
+                return True
+
+    def _fire(self):
+        self.fired += 1
+        try:
+            self.callback()
+        except Exception:
+            logger.exception("Rollover callback failed")
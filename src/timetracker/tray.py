@@ -1,12 +1,13 @@
 import os
 import threading
-import time
-import datetime as dt
 from typing import Optional, Callable
 
 import logging
 
-from .db import connect, daily_totals
+from .counter import ActiveCounter
+from .db import ChangeWatcher, ConnectionPool
+from .duration import hms
+from .metrics import timed
 
 try:
     import pystray
@@ -21,24 +22,14 @@ _TRAY_ICON: Optional[object] = None
 _TRAY_THREAD: Optional[threading.Thread] = None
 _TITLE_THREAD: Optional[threading.Thread] = None
 _TITLE_STOP: Optional[threading.Event] = None
+# read-only connections for the tray's own ActiveCounter, when it needs one
+_POOL = ConnectionPool(profile="reader", max_size=2)
 
 
-def _fmt(sec: float) -> str:
-    sec = int(round(sec))
-    h, m, s = sec // 3600, (sec % 3600) // 60, sec % 60
-    return f"{h:02d}:{m:02d}:{s:02d}"
-
-
-def _active_today_sec() -> int:
+def _active_today_sec(counter: ActiveCounter) -> int:
     """Return active seconds for today, including open interval."""
     try:
-        con = connect()
-        today = dt.date.today().isoformat()
-        rows = daily_totals(con, today, now_ts=time.time())
-        con.close()
-        if rows:
-            # rows ordered DESC; today is the only/first when since=today
-            return int(rows[0][1] or 0)
+        return int(counter.seconds())
     except Exception:
         logger.exception("Failed to compute active seconds for today")
     return 0
@@ -59,9 +50,16 @@ def _load_tray_icon_image(icon_path: str | None):
 
 def start_tray(icon_path: str | None = None, title: str = "TimeTracker",
                on_exit: Optional[Callable[[], None]] = None,
-               on_control: Optional[Callable[[], None]] = None) -> None:
+               on_control: Optional[Callable[[], None]] = None,
+               counter: Optional[ActiveCounter] = None) -> None:
     """Start a system tray icon with a minimal menu.
 
+    The title and status item read "active today" from `counter`; the tracker
+    passes one it reloads on every transition. Without it the tray builds a
+    self-loading counter on its pooled read-only connections and reloads it
+    only when a `ChangeWatcher` sees a write. Either way the per-second title
+    update is a clock tick that does not query the DB.
+
     Menu items:
     - Status: shows application is running (no-op)
     - Control: opens the control GUI (if callback provided)
@@ -87,9 +85,13 @@ def start_tray(icon_path: str | None = None, title: str = "TimeTracker",
             except Exception:
                 pass
 
+    own_counter = counter is None
+    if own_counter:
+        counter = ActiveCounter(_POOL.connection, resync_every=None)
+
     image = _load_tray_icon_image(icon_path)
     def _status_text(item):
-        return f"Activ azi: {_fmt(_active_today_sec())}"
+        return f"Activ azi: {hms(_active_today_sec(counter))}"
 
     items = [pystray.MenuItem(_status_text, None, enabled=False)]
     if on_control:
@@ -116,15 +118,24 @@ def start_tray(icon_path: str | None = None, title: str = "TimeTracker",
 
     # Update tooltip/title every second so user sees elapsed active time
     def _title_loop():
+        watcher = None
         while _TITLE_STOP and not _TITLE_STOP.wait(1.0):
             try:
-                secs = _active_today_sec()
-                if _TRAY_ICON:
-                    _TRAY_ICON.title = f"{title} - {_fmt(secs)}"
-                    try:
-                        _TRAY_ICON.update_menu()
-                    except Exception:
-                        logger.exception("Error updating tray menu")
+                if own_counter:
+                    with _POOL.connection() as con:
+                        if watcher is None or watcher.con is not con:
+                            watcher = ChangeWatcher(con)
+                            counter.invalidate()
+                        elif watcher.changed():
+                            counter.invalidate()
+                with timed("tray.title"):
+                    secs = _active_today_sec(counter)
+                    if _TRAY_ICON:
+                        _TRAY_ICON.title = f"{title} - {hms(secs)}"
+                        try:
+                            _TRAY_ICON.update_menu()
+                        except Exception:
+                            logger.exception("Error updating tray menu")
             except Exception:
                 logger.exception("Error updating tray title")
 
@@ -146,6 +157,7 @@ def stop_tray(timeout: float = 2.0) -> None:
         except Exception:
             logger.exception("Error joining title thread")
     if _TRAY_ICON is None:
+        _close_pool()
         return
     try:
         _TRAY_ICON.stop()
@@ -156,7 +168,16 @@ def stop_tray(timeout: float = 2.0) -> None:
             _TRAY_THREAD.join(timeout=timeout)
         except Exception:
             logger.exception("Error joining tray thread")
+    _close_pool()
     _TRAY_ICON = None
     _TRAY_THREAD = None
     _TITLE_THREAD = None
     _TITLE_STOP = None
+
+
+def _close_pool() -> None:
+    try:
+        logger.info("Tray DB pool stats: %s", _POOL.stats())
+        _POOL.close_all()
+    except Exception:
+        logger.exception("Error closing tray DB pool")
@@ -1,8 +1,69 @@
+import importlib
 import os
+import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure pytest has a usable temp directory even on restricted setups.
 _root_tmp = Path(__file__).resolve().parent / ".tmp"
 _root_tmp.mkdir(parents=True, exist_ok=True)
 os.environ.setdefault("TMP", str(_root_tmp))
 os.environ.setdefault("TEMP", str(_root_tmp))
+
+_SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+
+class DummyLogger:
+    """Stands in for a tracker logger; `lines` keeps the args of every call."""
+
+    def __init__(self):
+        self.lines = []
+
+    def info(self, *args, **kwargs):
+        self.lines.append(args)
+
+    warning = error = info
+
+
+class TTEnv:
+    """The isolated environment of one test; `load()` reloads modules into it."""
+
+    def __init__(self, tmp_path, monkeypatch):
+        self.tmp_path = tmp_path
+        self.monkeypatch = monkeypatch
+        self.base = tmp_path / "tt"
+
+    def load(self, *names):
+        """Reload `timetracker.config`, then `timetracker.<name>` for each name, in order.
+
+        Set extra variables with `monkeypatch.setenv` before calling it.
+        """
+        modules = []
+        for name in ("config", *names):
+            modules.append(importlib.reload(importlib.import_module(f"timetracker.{name}")))
+        return modules[1] if len(names) == 1 else tuple(modules[1:])
+
+
+@pytest.fixture(autouse=True)
+def _tt_isolated_env(tmp_path, monkeypatch):
+    # never the repo's .env, and every BASE_DIR/DB/log path under tmp_path,
+    # whether or not the test reloads anything
+    if _SRC not in sys.path:
+        sys.path.insert(0, _SRC)
+    local_env = tmp_path / ".env"
+    local_env.write_text("", encoding="utf-8")
+    monkeypatch.setenv("TT_ENV_FILE", str(local_env))
+    base = tmp_path / "tt"
+    for k, v in {
+        "BASE_DIR": str(base),
+        "DB_PATH": str(base / "sessions.db"),
+        "LOG_PATH": str(base / "timetracker.log"),
+    }.items():
+        monkeypatch.setenv(k, v)
+
+
+@pytest.fixture
+def tt_env(tmp_path, monkeypatch):
+    """Point timetracker at tmp_path: `db, core = tt_env.load("db", "core")`."""
+    return TTEnv(tmp_path, monkeypatch)
@@ -58,7 +58,9 @@ def test_config_env_override(tmp_path, monkeypatch):
     assert config.LOG_PATH == base / "timetracker.log"
     assert config.ASSET_DIR == base / "assets"
     assert config.ASSET_ICON == base / "assets" / "icon.ico"
-    assert config.BASE_DIR.exists()  # auto-created
+    assert not config.BASE_DIR.exists()  # importing config has no side effects
+    config.ensure_dirs()
+    assert config.BASE_DIR.exists()
 
 
 def test_config_defaults_use_home(tmp_path, monkeypatch):
@@ -71,4 +73,14 @@ def test_config_defaults_use_home(tmp_path, monkeypatch):
     assert config.LOG_PATH == expected_base / "timetracker.log"
     assert config.ASSET_DIR == expected_base / "assets"
     assert config.ASSET_ICON == expected_base / "assets" / "icon.ico"
+    config.ensure_dirs()
     assert config.BASE_DIR.exists()
+
+
+def test_config_second_intervals_accept_fractions(tmp_path, monkeypatch):
+    env = {"EVENT_DEBOUNCE_SEC": "0.4", "IDLE_THRESHOLD_SEC": "90.5", "HEARTBEAT_SEC": "bogus"}
+    config = _reload_config(monkeypatch, tmp_path, env=env)
+
+    assert config.EVENT_DEBOUNCE_SEC == 0.4  # a sub-second RDP flap window
+    assert config.IDLE_THRESHOLD_SEC == 90.5
+    assert config.HEARTBEAT_SEC == 60  # unparsable: the default
@@ -0,0 +1,259 @@
+import collections
+import datetime as dt
+import itertools
+import time
+
+
+def _rows(con):
+    return con.execute("SELECT day, kind, end_ts IS NULL FROM sessions ORDER BY id").fetchall()
+
+
+def test_headless_app_without_a_daemon_only_reads(tt_env):
+    db, ipc, control_gui = tt_env.load("db", "ipc", "control_gui")
+    writer = db.connect()
+    yesterday = (dt.date.today() - dt.timedelta(days=1)).isoformat()
+    db.start_interval(writer, yesterday, time.time() - 86400, "active")  # left open by a crash
+    reader = db.connect(profile="reader")
+
+    app = control_gui.ControlApp.headless(
+        reader, daemon=ipc.IpcClient(address=str(tt_env.tmp_path / "no-daemon.sock")))
+    assert not app._daemon_up
+    assert app.state.kind == "active" and app.state.day == yesterday
+    app._reload()
+    # no rollover from the window: the daemon's heartbeat recovery decides where it ends
+    assert app._con is None
+    assert _rows(writer) == [(yesterday, "active", 1)]
+    reader.close()
+    writer.close()
+
+
+class RecordingCanvas:
+    """Just enough of tk.Canvas for WeeklyChart, counting every item operation."""
+
+    def __init__(self, width=420, height=180):
+        self.width, self.height = width, height
+        self.ops = collections.Counter()
+        self.items = set()
+        self._ids = itertools.count(1)
+        self.pending = {}
+
+    def _create(self, *_args, **_kwargs):
+        self.ops["create"] += 1
+        item = next(self._ids)
+        self.items.add(item)
+        return item
+
+    create_rectangle = create_text = _create
+
+    def coords(self, item, *coords):
+        self.ops["coords"] += 1
+
+    def itemconfigure(self, item, **options):
+        self.ops["itemconfigure"] += 1
+
+    def delete(self, item):
+        self.ops["delete"] += 1
+        self.items.discard(item)
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def bind(self, _sequence, _func):
+        pass
+
+    def after(self, _ms, func):
+        timer = next(self._ids)
+        self.pending[timer] = func
+        return timer
+
+    def after_cancel(self, timer):
+        del self.pending[timer]
+
+    def fire_timers(self):
+        timers, self.pending = self.pending, {}
+        for func in timers.values():
+            func()
+
+    def take_ops(self):
+        ops, self.ops = self.ops, collections.Counter()
+        return dict(ops)
+
+
+def _chart_rows(days, today_active):
+    # today first, as ControlApp sorts them; an older day holds the maximum
+    rows = [{"label": f"D{i}", "active": 3600.0 * (i + 1), "pause": 600.0} for i in range(days)]
+    rows[0]["active"] = today_active
+    return rows
+
+
+def test_weekly_chart_touches_only_what_changed(tt_env):
+    control_gui = tt_env.load("control_gui")
+    canvas = RecordingCanvas()
+    chart = control_gui.WeeklyChart(canvas, days=5)
+    canvas.take_ops()
+
+    chart.update(_chart_rows(5, 60.0))
+    ops = canvas.take_ops()
+    assert ops["create"] == 5 * 3 and "delete" not in ops
+
+    chart.update(_chart_rows(5, 60.0))
+    assert canvas.take_ops() == {}  # nothing moved: no Tk calls at all
+    chart.update(_chart_rows(5, 61.0))
+    assert canvas.take_ops() == {"coords": 1}  # today's active bar
+
+    # a resize burst is one update; a width-only resize moves nothing
+    canvas.width = 640
+    for _ in range(20):
+        chart._on_configure(None)
+    assert len(canvas.pending) == 1
+    canvas.fire_timers()
+    assert canvas.take_ops() == {}
+    assert chart.layouts == 1
+    canvas.height = 240
+    chart._on_configure(None)
+    canvas.fire_timers()
+    assert canvas.take_ops() == {"coords": 5 * 3}  # bars and labels follow the new baseline
+    assert chart.layouts == 1  # the x positions only depend on the number of days
+
+    chart.update(_chart_rows(3, 61.0))
+    ops = canvas.take_ops()
+    assert ops["delete"] == 2 * 3 and "create" not in ops
+    chart.update([])
+    ops = canvas.take_ops()
+    assert ops["delete"] == 3 * 3 and "create" not in ops
+    assert len(canvas.items) == 1 + 4  # the empty-state text and the legend stay
+
+
+class FakeWidget:
+    """A tk.Label / tk.StringVar stand-in; counts `set` and creations."""
+
+    created = 0
+
+    def __init__(self, *_args, **_kwargs):
+        FakeWidget.created += 1
+        self.value = None
+        self.sets = 0
+
+    def set(self, value):
+        self.sets += 1
+        self.value = value
+
+    def grid(self, **_kwargs):
+        pass
+
+    grid_remove = destroy = grid
+
+
+def test_dashboard_table_sets_only_changed_cells(tt_env):
+    control_gui = tt_env.load("control_gui")
+    tt_env.monkeypatch.setattr(control_gui.tk, "Label", FakeWidget)
+    tt_env.monkeypatch.setattr(control_gui.tk, "StringVar", FakeWidget)
+    FakeWidget.created = 0
+    table = control_gui.DashboardTable(master=None)
+    created = FakeWidget.created
+
+    assert table.update(_chart_rows(5, 60.0)) == 5 * 3
+    assert FakeWidget.created - created == 5 * 3 * 2  # a StringVar and a Label per cell
+    created = FakeWidget.created
+    assert table.update(_chart_rows(5, 60.0)) == 0
+    assert table.update(_chart_rows(5, 61.0)) == 1  # today's active time
+    assert [var.sets for var in table._slots[0][0]] == [1, 2, 1]
+    assert table.update(_chart_rows(3, 61.0)) == 0  # rows dropped, nothing reset
+    assert FakeWidget.created == created
+    assert table.update([]) == 0 and table._slots == []
+
+
+class FakeFont:
+    def __init__(self, **_kwargs):
+        pass
+
+    def measure(self, text):
+        return 8 * len(text)
+
+    def metrics(self, _option):
+        return 16
+
+
+class FakeVar:
+    def __init__(self, value):
+        self.value = value
+        self.traces = []
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+        for func in self.traces:
+            func()
+
+    def trace_add(self, _mode, func):
+        self.traces.append(func)
+
+
+class ButtonCanvas(RecordingCanvas):
+    def __init__(self, master=None, **_kwargs):
+        super().__init__()
+
+    create_arc = RecordingCanvas._create
+
+    def config(self, **_kwargs):
+        self.ops["config"] += 1
+
+
+def test_rounded_button_redraws_only_on_a_change(tt_env):
+    # RoundedButton subclasses tk.Canvas, so the stand-in has to be in place at import
+    tt_env.monkeypatch.setattr("tkinter.Canvas", ButtonCanvas)
+    tt_env.monkeypatch.setattr("tkinter.font.Font", FakeFont)
+    control_gui = tt_env.load("control_gui")
+    text = FakeVar("Pause")
+    button = control_gui.RoundedButton(None, textvariable=text, command=None)
+    ops = button.take_ops()
+    assert ops["create"] == 4 + 2 + 1 and "delete" not in ops
+
+    button.set_style("#22c55e", "#0b1f10")  # the style it already has
+    text.set("Pause")
+    assert button.take_ops() == {}
+    button.set_style("#f59e0b", "#0b1f10")
+    assert button.take_ops() == {"itemconfigure": 6}  # the fill only
+    text.set("Resume")
+    assert button.take_ops() == {"coords": 7, "config": 1, "itemconfigure": 1}
+
+
+class Anything:
+    """Accepts any widget call; `calls` counts them by name."""
+
+    def __init__(self, calls):
+        self._calls = calls
+
+    def __getattr__(self, name):
+        def call(*_args, **_kwargs):
+            self._calls[name] += 1
+        return call
+
+
+def test_render_restyles_only_when_the_mode_changes(tt_env):
+    db, ipc, control_gui = tt_env.load("db", "ipc", "control_gui")
+    reader = db.connect(profile="reader")
+    app = control_gui.ControlApp.headless(
+        reader, daemon=ipc.IpcClient(address=str(tt_env.tmp_path / "no-daemon.sock")))
+    calls = collections.Counter()
+    for name in ("status_time_var", "status_time_label", "reminder_var", "reminder_frame",
+                 "mode_var", "mode_label", "chart", "table"):
+        setattr(app, name, Anything(calls))
+    app._rendered_mode = app._rendered_over = None
+    styled = []
+    app._apply_mode_style = styled.append
+
+    app.state.kind = "active"
+    for _ in range(3):
+        app._render()
+    assert styled == ["active"]
+    assert calls["configure"] == 1 and calls["set"] == 3 + 2  # the time each tick, once the rest
+    app.state.kind = "pause"
+    app._render()
+    assert styled == ["active", "pause"]
+    reader.close()
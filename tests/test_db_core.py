@@ -1,58 +1,14 @@
-import importlib
-import sys
 import datetime as dt
-from pathlib import Path
 
+from conftest import DummyLogger
 
-class DummyLogger:
-    def info(self, *args, **kwargs):
-        pass
-
-    def warning(self, *args, **kwargs):
-        pass
 
-    def error(self, *args, **kwargs):
-        pass
+def _setup(tt_env):
+    return tt_env.load("db", "core")
 
 
-def _setup_env(monkeypatch, tmp_path):
-    repo_root = Path(__file__).resolve().parents[1]
-    sys.path.insert(0, str(repo_root / "src"))
-    tmp_dir = tmp_path / "tmp"
-    tmp_dir.mkdir(parents=True, exist_ok=True)
-    monkeypatch.setenv("TMP", str(tmp_dir))
-    monkeypatch.setenv("TEMP", str(tmp_dir))
-
-    # Isolate dotenv to a temp file to avoid picking up repo .env
-    local_env = tmp_path / ".env"
-    local_env.write_text("", encoding="utf-8")
-    monkeypatch.setenv("TT_ENV_FILE", str(local_env))
-
-    base = tmp_path / "tt_db"
-    env = {
-        "BASE_DIR": str(base),
-        "DB_PATH": str(base / "sessions.db"),
-        "LOG_PATH": str(base / "timetracker.log"),
-        "ASSET_DIR": str(base / "assets"),
-        "ASSET_ICON": str(base / "assets" / "icon.ico"),
-    }
-    for k, v in env.items():
-        monkeypatch.setenv(k, v)
-
-    for mod in ("timetracker.config", "timetracker.db", "timetracker.core"):
-        sys.modules.pop(mod, None)
-
-    import timetracker.config as config
-    importlib.reload(config)
-    import timetracker.db as db
-    importlib.reload(db)
-    import timetracker.core as core
-    importlib.reload(core)
-    return config, db, core, base
-
-
-def test_db_schema_and_mode_switch(tmp_path, monkeypatch):
-    _, db, core, base = _setup_env(monkeypatch, tmp_path)
+def test_db_schema_and_mode_switch(tt_env):
+    db, core = _setup(tt_env)
     con = db.connect(check_same_thread=False)
 
     # ensure schema exists (no exception) and ensure_mode opens an active interval
@@ -72,8 +28,8 @@ def test_db_schema_and_mode_switch(tmp_path, monkeypatch):
     assert rows[1][1] is not None
 
 
-def test_rollover_closes_previous_day(tmp_path, monkeypatch):
-    _, db, core, _, = _setup_env(monkeypatch, tmp_path)
+def test_rollover_closes_previous_day(tt_env):
+    db, core = _setup(tt_env)
     con = db.connect(check_same_thread=False)
     logger = DummyLogger()
 
@@ -90,10 +46,509 @@ def test_rollover_closes_previous_day(tmp_path, monkeypatch):
 
     rows = con.execute("SELECT day, end_ts, kind FROM sessions ORDER BY id").fetchall()
     assert len(rows) == 2
-    # first row is yesterday, should be closed
+    # first row is yesterday, closed exactly at midnight
+    midnight = core.local_midnight(dt.date.today())
     assert rows[0][0] == yesterday
-    assert rows[0][1] is not None
-    # second row is today, same mode, open
+    assert rows[0][1] == midnight
+    # second row is today, same mode, open from midnight
     assert rows[1][0] == dt.date.today().isoformat()
     assert rows[1][2] == "active"
     assert rows[1][1] is None
+    assert con.execute("SELECT start_ts FROM sessions WHERE id=2").fetchone()[0] == midnight
+
+
+def test_rollover_splits_every_missed_midnight(tt_env):
+    db, core = _setup(tt_env)
+    con = db.connect(check_same_thread=False)
+    today = dt.date.today()
+    first = today - dt.timedelta(days=3)
+    late = dt.datetime.combine(first, dt.time(22, 0)).timestamp()
+    con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES(?,?,?)", (first.isoformat(), late, "pause"))
+    con.commit()
+
+    state = core.TrackerState.load(con)
+    commits = con.commits
+    state.ensure_rollover(con, DummyLogger())
+    assert con.commits == commits + 1  # all splits in one transaction
+
+    rows = con.execute("SELECT day, start_ts, end_ts, kind FROM sessions ORDER BY id").fetchall()
+    days = [first + dt.timedelta(days=i) for i in range(4)]
+    assert [r[0] for r in rows] == [d.isoformat() for d in days]
+    assert {r[3] for r in rows} == {"pause"}
+    for prev, row, day in zip(rows, rows[1:], days[1:]):
+        assert prev[2] == row[1] == core.local_midnight(day)
+    assert rows[-1][2] is None
+    assert (state.day, state.start_ts) == (today.isoformat(), core.local_midnight(today))
+    # the rollup gives each whole day its own share (23 or 25 h on DST days)
+    pause = {day: p for day, _a, p in db.daily_breakdown(con, days[1].isoformat())}
+    assert pause[days[1].isoformat()] == core.local_midnight(days[2]) - core.local_midnight(days[1])
+
+
+def test_migrations_upgrade_legacy_db_in_place(tt_env):
+    db, _core = _setup(tt_env)
+    import sqlite3
+
+    # a pre-migration DB: bare table, user_version 0, some history
+    db.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    legacy = sqlite3.connect(str(db.DB_PATH))
+    legacy.execute("""CREATE TABLE sessions(
+        id INTEGER PRIMARY KEY,
+        day TEXT NOT NULL,
+        start_ts REAL NOT NULL,
+        end_ts REAL,
+        kind TEXT NOT NULL CHECK(kind in ('active','pause'))
+    )""")
+    legacy.execute("INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES('2024-01-02',1.0,2.0,'active')")
+    legacy.commit()
+    legacy.close()
+
+    con = db.connect(check_same_thread=False)
+    assert db.schema_version(con) == db.SCHEMA_VERSION
+    indexes = {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert {"idx_intervals_open", "idx_intervals_day"} <= indexes
+    # the v1 columns read back unchanged through the `sessions` view
+    assert con.execute("SELECT day, start_ts, end_ts, kind FROM sessions").fetchall() == [
+        ("2024-01-02", 1.0, 2.0, "active"),
+    ]
+    assert con.execute("SELECT * FROM intervals").fetchall() == [(1, 19724, 1000, 2000, 0)]
+
+    # reconnecting is a no-op
+    con.close()
+    con = db.connect(check_same_thread=False)
+    assert db.schema_version(con) == db.SCHEMA_VERSION
+
+
+def test_v2_migration_streams_and_keeps_concurrent_writes(tt_env):
+    db, _core = _setup(tt_env)
+    import sqlite3
+
+    # a v1 DB (schema version 3) with some history and an open interval
+    db.DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    legacy = sqlite3.connect(str(db.DB_PATH))
+    for _version, migrate in db.MIGRATIONS[:3]:
+        migrate(legacy)
+    legacy.execute("PRAGMA user_version=3")
+    # time.time()-style timestamps, not whole milliseconds
+    t0 = 1704067200.0123456
+    rows = [("2024-01-%02d" % (1 + i // 4), t0 + i * 900.0004321, t0 + (i + 1) * 900.0004321,
+             db.KINDS[i % 2]) for i in range(40)]
+    rows[-1] = rows[-1][:2] + (None, rows[-1][3])
+    legacy.executemany("INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES(?,?,?,?)", rows)
+    legacy.commit()
+
+    # the bulk copy resumes after an interrupted run, in small chunks
+    db._create_intervals(legacy)
+    legacy.execute(db._COPY_V1 + " WHERE id <= 10")
+    legacy.commit()
+    db._m4_copy_rows(legacy, chunk=7)
+    assert legacy.execute("SELECT COUNT(*) FROM intervals").fetchone()[0] == 40
+
+    # a v1 tracker keeps writing before the final step
+    t_end = t0 + 40 * 900.0004321
+    legacy.execute("UPDATE sessions SET end_ts=? WHERE end_ts IS NULL", (t_end,))
+    legacy.execute("UPDATE sessions SET kind='active' WHERE id=2")
+    legacy.execute("DELETE FROM sessions WHERE id=3")
+    legacy.execute("INSERT INTO sessions(day,start_ts,kind) VALUES('2024-01-10',?,'pause')", (t_end,))
+    legacy.commit()
+    expected = [(day, db.stored_ts(start), end if end is None else db.stored_ts(end), kind)
+                for day, start, end, kind in legacy.execute(
+                    "SELECT day, start_ts, end_ts, kind FROM sessions ORDER BY id")]
+    assert db.check_rollup(legacy) == []
+    legacy.close()
+
+    tt_env.monkeypatch.setattr(db, "MIGRATION_CHUNK", 5)
+    con = db.connect(check_same_thread=False)
+    assert db.schema_version(con) == db.SCHEMA_VERSION
+    assert con.execute("SELECT day, start_ts, end_ts, kind FROM sessions ORDER BY id").fetchall() == expected
+    assert db.check_rollup(con) == []
+    assert db.open_interval(con) == (41, "2024-01-10", "pause", db.stored_ts(t_end))
+    names = {r[0] for r in con.execute("SELECT name FROM sqlite_master")}
+    assert "_v2_changed" not in names and "trg_v2_changed_insert" not in names
+
+    # v1 statements keep working through the view
+    con.execute("INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES('2024-01-11',1.5,2.5,'pause')")
+    con.execute("UPDATE sessions SET kind='active' WHERE day='2024-01-11'")
+    assert con.execute("SELECT day, start_ms, end_ms, kind FROM intervals WHERE id=42").fetchone() == (
+        db.epoch_day("2024-01-11"), 1500, 2500, 0)
+    con.execute("DELETE FROM sessions WHERE day='2024-01-11'")
+    con.commit()
+    assert db.check_rollup(con) == []
+    con.close()
+
+
+def _plan(con, sql, params=()):
+    return " / ".join(r[3] for r in con.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+
+def test_hot_queries_use_indexes(tt_env):
+    db, _core = _setup(tt_env)
+    con = db.connect(check_same_thread=False)
+
+    open_plan = _plan(con, "SELECT kind FROM intervals WHERE end_ms IS NULL ORDER BY id DESC LIMIT 1")
+    assert "USING INDEX idx_intervals_open" in open_plan
+    assert "TEMP B-TREE" not in open_plan
+
+    close_plan = _plan(con, "UPDATE intervals SET end_ms=? WHERE end_ms IS NULL", (1,))
+    assert "idx_intervals_open" in close_plan
+
+    day_plan = _plan(con, """
+        SELECT day,
+               SUM(CASE WHEN kind=0 THEN (COALESCE(end_ms, ?) - start_ms) ELSE 0 END),
+               SUM(CASE WHEN kind=1 THEN (COALESCE(end_ms, ?) - start_ms) ELSE 0 END)
+        FROM intervals WHERE day >= ? GROUP BY day ORDER BY day DESC
+    """, (1, 1, 19723))
+    assert "USING COVERING INDEX idx_intervals_day" in day_plan
+    assert "SCAN intervals" not in day_plan
+
+
+def test_daily_rollup_tracks_closed_intervals(tt_env):
+    db, _core = _setup(tt_env)
+    con = db.connect(check_same_thread=False)
+
+    con.execute("INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES('2024-01-01',0,100,'active')")
+    con.execute("INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES('2024-01-01',100,130,'pause')")
+    db.start_interval(con, "2024-01-02", 1000.0, "active")
+    assert con.execute("SELECT * FROM daily_rollup ORDER BY day").fetchall() == [
+        ("2024-01-01", 100.0, 30.0, 2),
+    ]
+
+    # the open interval only shows up live, and lands in the rollup once closed
+    assert db.daily_breakdown(con, "2024-01-01", now_ts=1060.0) == [
+        ("2024-01-02", 60.0, 0),
+        ("2024-01-01", 100.0, 30.0),
+    ]
+    db.close_open_interval(con)
+    row = con.execute("SELECT active_sec, intervals FROM daily_rollup WHERE day='2024-01-02'").fetchone()
+    assert row[1] == 1 and row[0] > 0
+
+    # edits and deletes on the raw table are reflected too
+    con.execute("UPDATE sessions SET end_ts=50 WHERE day='2024-01-01' AND kind='active'")
+    con.execute("DELETE FROM sessions WHERE day='2024-01-02'")
+    con.commit()
+    assert con.execute("SELECT * FROM daily_rollup").fetchall() == [("2024-01-01", 50.0, 30.0, 2)]
+    assert db.check_rollup(con) == []
+
+
+def test_rollup_check_and_rebuild(tt_env):
+    db, _core = _setup(tt_env)
+    con = db.connect(check_same_thread=False)
+    con.execute("INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES('2024-01-01',0,100,'active')")
+    con.execute("UPDATE daily_rollup SET active_sec=5")
+    con.commit()
+
+    assert [bad[0] for bad in db.check_rollup(con)] == ["2024-01-01"]
+    assert db.rebuild_rollup(con) == 1
+    assert db.check_rollup(con) == []
+    assert db.daily_totals(con, "2024-01-01") == [("2024-01-01", 100.0)]
+
+
+def test_daily_totals_reads_rollup_not_history(tt_env):
+    db, _core = _setup(tt_env)
+    con = db.connect(check_same_thread=False)
+    plans = [r[3] for r in con.execute(
+        "EXPLAIN QUERY PLAN SELECT day FROM daily_rollup WHERE day >= ? "
+        "UNION ALL SELECT day FROM intervals WHERE end_ms IS NULL AND day >= ?",
+        ("2024-01-01", 19723),
+    )]
+    assert not any(p.startswith("SCAN intervals") for p in plans)
+
+
+def test_tracker_state_skips_db_when_nothing_changes(tt_env):
+    db, core = _setup(tt_env)
+    con = db.connect(check_same_thread=False)
+    logger = DummyLogger()
+    state = core.TrackerState.load(con)
+    state.ensure_rollover(con, logger)
+    first_id = state.id
+    assert (state.kind, state.day) == ("active", dt.date.today().isoformat())
+
+    statements = []
+    con.set_trace_callback(statements.append)
+    state.ensure_rollover(con, logger)
+    state.ensure_mode(con, "active", logger)
+    assert statements == []
+
+    state.ensure_mode(con, "pause", logger)
+    # trigger bodies are traced under their parent statement; collapse repeats
+    verbs = [s.split()[0] for i, s in enumerate(statements) if i == 0 or s != statements[i - 1]]
+    assert verbs == ["BEGIN", "UPDATE", "INSERT", "COMMIT"]
+    con.set_trace_callback(None)
+
+    assert state.kind == "pause" and state.id != first_id
+    assert db.open_interval(con) == (state.id, state.day, "pause", state.start_ts)
+
+
+def test_tracker_state_resync_picks_up_external_writes(tt_env):
+    db, core = _setup(tt_env)
+    con = db.connect(check_same_thread=False)
+    other = db.connect(check_same_thread=False)
+    logger = DummyLogger()
+    state = core.TrackerState.load(con)
+    state.ensure_mode(con, "active", logger)
+
+    core.ensure_mode(other, "pause", logger)  # e.g. the control GUI process
+    assert state.kind == "active"
+    state.resync(con)
+    assert state.kind == "pause"
+    assert state.id == db.open_interval(other)[0]
+
+
+def test_db_service_groups_concurrent_writes(tt_env):
+    db, core = _setup(tt_env)
+    import threading
+
+    service = db.DBService(batch_window=0.05).start()
+    try:
+        owner = service.call(lambda con: threading.get_ident())
+        assert owner != threading.get_ident()
+
+        def insert(con, i):
+            con.execute(
+                "INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES('2024-01-01',?,?,'active')",
+                (i, i + 1),
+            )
+            con.commit()  # deferred to the batch
+            return i
+
+        commits_before = service.call(lambda con: con.commits)
+        futures = [service.submit(insert, i, write=True) for i in range(20)]
+        assert [f.result(5) for f in futures] == list(range(20))
+        # a read queued after the writes sees all of them
+        assert service.call(lambda con: con.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]) == 20
+        assert service.call(lambda con: con.commits) - commits_before < 20
+    finally:
+        service.stop()
+    assert isinstance(service.submit(lambda con: None).exception(), RuntimeError)
+
+
+def test_db_service_isolates_failing_write(tt_env):
+    db, _core = _setup(tt_env)
+    service = db.DBService(batch_window=0.05).start()
+    try:
+        def good(con):
+            con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES('2024-01-01',1,'pause')")
+
+        def bad(con):
+            con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES('2024-01-01',2,'pause')")
+            con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES('2024-01-01',3,'bogus')")
+
+        f1 = service.submit(good, write=True)
+        f2 = service.submit(bad, write=True)
+        f3 = service.submit(good, write=True)
+        f1.result(5), f3.result(5)
+        try:
+            f2.result(5)
+            raise AssertionError("expected the CHECK constraint to fail")
+        except Exception as e:
+            assert "CHECK" in str(e)
+        starts = service.call(lambda con: [r[0] for r in con.execute("SELECT start_ts FROM sessions")])
+        assert starts == [1.0, 1.0]
+    finally:
+        service.stop()
+
+
+def test_db_service_resyncs_state_after_a_rolled_back_job(tt_env):
+    db, core = _setup(tt_env)
+    service = db.DBService(batch_window=0.05).start()
+    state = core.TrackerState()
+    service.rollback_listeners.append(state.resync)
+    try:
+        service.call(state.ensure_mode, "active", DummyLogger(), write=True)
+        active_id = state.id
+
+        def broken(_con, _state):
+            raise RuntimeError("listener failed")
+
+        state.listeners.append(broken)
+        try:
+            service.call(state.ensure_mode, "pause", DummyLogger(), write=True)
+            raise AssertionError("expected the listener to fail")
+        except RuntimeError:
+            pass
+        # the switch was rolled back, and the state followed the DB
+        assert (state.id, state.kind) == (active_id, "active")
+        state.listeners.remove(broken)
+        assert service.call(db.current_mode) == "active"
+    finally:
+        service.stop()
+
+
+def test_connection_profiles(tt_env):
+    tt_env.monkeypatch.setenv("DB_CACHE_SIZE", "-1234")
+    db, _core = _setup(tt_env)
+    import sqlite3
+
+    writer = db.connect(check_same_thread=False)
+    assert writer.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert writer.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert writer.execute("PRAGMA cache_size").fetchone()[0] == -1234
+
+    reader = db.connect(profile="reader", timeout=0.25, mmap_size=1 << 20)
+    assert reader.execute("PRAGMA query_only").fetchone()[0] == 1
+    assert reader.execute("PRAGMA busy_timeout").fetchone()[0] == 250
+    try:
+        reader.execute("INSERT INTO sessions(day,start_ts,kind) VALUES('2024-01-01',1,'active')")
+        raise AssertionError("reader accepted a write")
+    except sqlite3.OperationalError:
+        pass
+
+    # WAL: the reader sees committed data while a write transaction is open
+    db.start_interval(writer, "2024-01-01", 1.0, "active")
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("UPDATE sessions SET end_ts=2 WHERE end_ts IS NULL")
+    assert reader.execute("SELECT COUNT(*) FROM sessions WHERE end_ts IS NULL").fetchone()[0] == 1
+    writer.commit()
+    assert reader.execute("SELECT COUNT(*) FROM sessions WHERE end_ts IS NULL").fetchone()[0] == 0
+
+
+def test_reader_profile_initializes_missing_db(tt_env):
+    db, _core = _setup(tt_env)
+    assert not db.DB_PATH.exists()
+    reader = db.connect(profile="reader")
+    assert db.schema_version(reader) == db.SCHEMA_VERSION
+    assert db.daily_totals(reader, "2024-01-01") == []
+
+
+def test_connection_pool_reuses_per_thread_connections(tt_env):
+    db, _core = _setup(tt_env)
+    import threading
+
+    db.connect().close()  # schema setup happens once per process...
+    calls = []
+    tt_env.monkeypatch.setattr(db, "_ensure_schema", lambda con: calls.append(con))
+
+    pool = db.ConnectionPool(profile="reader", max_size=2)
+    with pool.connection() as a:
+        pass
+    for _ in range(10):
+        with pool.connection() as again:
+            assert again is a
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(pool.acquire()))
+    t.start(), t.join()
+    assert seen[0] is not a
+    assert pool.stats() == {"opened": 2, "reused": 10, "discarded": 0, "open": 2}
+
+    # both slots taken, but the other thread is gone: its slot gets reaped
+    t = threading.Thread(target=lambda: seen.append(pool.acquire()))
+    t.start(), t.join()
+    assert pool.stats()["open"] == 2
+
+    pool.close_all()
+    assert pool.stats()["open"] == 0
+    # a closed connection fails its checkout check and is replaced
+    with pool.connection() as fresh:
+        assert fresh is not a
+    db.connect().close()
+    assert calls == []  # ...not on every connect
+
+
+def test_active_counter_reads_without_queries(tt_env):
+    db, core, counter_mod = tt_env.load("db", "core", "counter")
+    from contextlib import nullcontext
+
+    con = db.connect(check_same_thread=False)
+    logger = DummyLogger()
+    today = dt.date.today().isoformat()
+    now = dt.datetime.now().timestamp()
+    con.execute(
+        "INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES(?,?,?,'active')",
+        (today, now - 1000, now - 400),
+    )
+    con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES(?,?,'active')", (today, now - 100))
+    con.commit()
+
+    mono = [50.0]
+    counter = counter_mod.ActiveCounter(lambda: nullcontext(con), resync_every=None, clock=lambda: mono[0])
+    assert 699 <= counter.seconds() <= 702
+    statements = []
+    con.set_trace_callback(statements.append)
+    mono[0] += 30
+    assert 729 <= counter.seconds() <= 732
+    assert statements == []
+    con.set_trace_callback(None)
+
+    # a transition reloads it through the state listener; pause stops the clock
+    state = core.TrackerState.load(con)
+    state.listeners.append(lambda c, _s: counter.load(c))
+    state.ensure_mode(con, "pause", logger)
+    paused = counter.seconds()
+    mono[0] += 300
+    assert counter.seconds() == paused
+    assert counter.loads == 2
+
+
+def test_day_totals_cache_reloads_only_on_change(tt_env):
+    db, _core = _setup(tt_env)
+    writer = db.connect(check_same_thread=False)
+    reader = db.connect(profile="reader")
+    today = dt.date(2024, 3, 10)
+    for back in range(1, 40):
+        day = (today - dt.timedelta(days=back)).isoformat()
+        writer.execute(
+            "INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES(?,0,3600,'active')", (day,)
+        )
+    writer.execute("INSERT INTO sessions(day,start_ts,kind) VALUES(?,1000,'active')", (today.isoformat(),))
+    writer.commit()
+
+    cache = db.DayTotalsCache(days=30)
+    first = cache.closed_totals(reader, today)
+    assert len(first) == 29 and today.isoformat() not in first  # today's only interval is open
+    assert cache.closed_totals(reader, today) == first
+    assert cache.loads == 1
+
+    # another connection edits a closed day -> data_version moves -> reload
+    writer.execute("UPDATE sessions SET end_ts=60 WHERE day=?", ((today - dt.timedelta(days=2)).isoformat(),))
+    writer.commit()
+    edited = cache.closed_totals(reader, today)
+    assert edited[(today - dt.timedelta(days=2)).isoformat()] == (60.0, 0)
+    assert cache.loads == 2
+
+    # rollover: a new day reloads the closed range
+    cache.closed_totals(reader, today + dt.timedelta(days=1))
+    assert cache.loads == 3
+
+
+def test_change_watcher_sees_local_and_external_writes(tt_env):
+    db, _core = _setup(tt_env)
+    writer = db.connect()
+    reader = db.connect(profile="reader")
+    watcher = db.ChangeWatcher(reader)
+    assert not watcher.changed()
+
+    # reads and empty commits change nothing
+    reader.execute("SELECT COUNT(*) FROM sessions").fetchone()
+    writer.commit()
+    assert not watcher.changed()
+
+    db.start_interval(writer, "2024-03-10", 100.0, "active")
+    assert watcher.changed()
+    assert not watcher.changed()
+
+    # a write from another process
+    other = db.sqlite3.connect(str(db.DB_PATH))
+    other.execute("UPDATE sessions SET kind='pause'")
+    other.commit()
+    other.close()
+    assert watcher.changed()
+
+
+def test_day_totals_cache_closed_totals(tt_env):
+    db, _core = _setup(tt_env)
+    writer = db.connect()
+    reader = db.connect(profile="reader")
+    today = dt.date(2024, 3, 10)
+    writer.execute("INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES('2024-03-09',0,3600,'active')")
+    writer.execute("INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES('2024-03-10',0,60,'pause')")
+    writer.execute("INSERT INTO sessions(day,start_ts,kind) VALUES('2024-03-10',60,'active')")
+    writer.commit()
+
+    cache = db.DayTotalsCache(days=7)
+    closed = cache.closed_totals(reader, today)
+    assert closed == {"2024-03-09": (3600.0, 0.0), "2024-03-10": (0.0, 60.0)}
+    cache.closed_totals(reader, today)
+    assert cache.loads == 1
+
+    db.switch_interval(writer, "2024-03-10", 160.0, "pause")
+    assert cache.closed_totals(reader, today)["2024-03-10"] == (100.0, 60.0)
+    assert cache.loads == 2
@@ -0,0 +1,78 @@
+import gzip
+import io
+import json
+import math
+import tracemalloc
+
+
+def _setup(tt_env):
+    return tt_env.load("db", "export")
+
+
+def _fill(con, n):
+    con.executemany(
+        "INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES(?,?,?,?)",
+        (
+            (f"2024-01-{1 + i % 28:02d}", float(i), float(i) + 10.0, "active" if i % 2 else "pause")
+            for i in range(n)
+        ),
+    )
+    con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES('2024-01-28',5.0,'active')")
+    con.commit()
+
+
+def test_export_formats_and_filters(tt_env):
+    db, export = _setup(tt_env)
+    con = db.connect(check_same_thread=False)
+    _fill(con, 56)
+
+    out = io.BytesIO()
+    assert export.export(con, out, "sessions", "csv", since="2024-01-27", batch=7) == 5
+    lines = out.getvalue().decode().splitlines()
+    assert lines[0] == "id,day,start_ts,end_ts,kind"
+    assert lines[-1].endswith(",2024-01-28,5.0,,active")
+
+    out = io.BytesIO()
+    export.export(con, out, "daily", "jsonl", until="2024-01-02", now_ts=15.0)
+    rows = [json.loads(line) for line in out.getvalue().decode().splitlines()]
+    assert rows == [
+        {"day": "2024-01-01", "active_sec": 0.0, "pause_sec": 20.0, "intervals": 2},
+        {"day": "2024-01-02", "active_sec": 20.0, "pause_sec": 0.0, "intervals": 2},
+    ]
+
+    out = io.BytesIO()
+    with gzip.GzipFile(fileobj=out, mode="wb") as gz:
+        assert export.export(con, gz, "sessions", "ttcol", batch=10) == 57
+    blocks = list(export.read_columnar(io.BytesIO(gzip.decompress(out.getvalue()))))
+    assert [len(b["id"]) for b in blocks] == [10] * 5 + [7]
+    last = blocks[-1]
+    assert last["day"][-1] == 19750  # 2024-01-28 as days since 1970-01-01
+    assert math.isnan(last["end_ts"][-1]) and last["kind"][-1] == db.KIND_CODES["active"]
+
+    out = io.BytesIO()
+    export.export(con, out, "daily", "ttcol", until="2024-01-02", now_ts=15.0)
+    (block,) = export.read_columnar(io.BytesIO(out.getvalue()))
+    assert list(block["day"]) == [19723, 19724]  # rollup days packed as epoch days
+    assert list(block["pause_sec"]) == [20.0, 0.0] and list(block["intervals"]) == [2, 2]
+
+
+def test_export_memory_is_flat(tt_env):
+    db, export = _setup(tt_env)
+    con = db.connect(check_same_thread=False)
+
+    class Sink(io.RawIOBase):
+        def writable(self):
+            return True
+
+        def write(self, b):
+            return len(b)
+
+    peaks = []
+    for n in (1_000, 20_000):
+        con.execute("DELETE FROM sessions")
+        _fill(con, n)
+        tracemalloc.start()
+        export.export(con, Sink(), "sessions", "jsonl", batch=500)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert peaks[1] < peaks[0] * 2
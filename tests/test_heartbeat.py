@@ -0,0 +1,102 @@
+import datetime as dt
+import time
+
+from conftest import DummyLogger
+
+
+def _setup(tt_env):
+    return (*tt_env.load("db", "core", "heartbeat"), tt_env.base)
+
+
+def test_journal_writes_one_record_at_a_bounded_rate(tt_env):
+    _db, _core, heartbeat, base = _setup(tt_env)
+    journal = heartbeat.HeartbeatJournal(interval=60)
+    assert journal.path == base / "heartbeat" and journal.read() is None
+
+    for ts in (1000.0, 1001.0, 1002.5):
+        journal.beat(ts)  # memory only
+    assert not journal.path.exists()
+    assert journal.flush() and not journal.flush()  # nothing new the second time
+    assert journal.read() == 1002.5
+    journal.beat(1062.5)
+    journal.flush()
+    assert journal.read() == 1062.5
+    assert journal.path.stat().st_size == heartbeat.RECORD_SIZE
+    assert journal.flushes == 2 and journal.bytes_written == 2 * heartbeat.RECORD_SIZE
+
+    # a torn or foreign record is no heartbeat
+    data = journal.path.read_bytes()
+    journal.path.write_bytes(data[:10] + b"9" + data[11:])
+    assert journal.read() is None
+    journal.path.write_bytes(b"\0" * heartbeat.RECORD_SIZE)
+    assert journal.read() is None
+
+    journal.stop(clean=True)
+    assert journal.path.stat().st_size == 0 and journal.read() is None
+
+
+def test_journal_thread(tt_env):
+    _db, _core, heartbeat, _base = _setup(tt_env)
+    journal = heartbeat.HeartbeatJournal(interval=0.05).start()
+    try:
+        t0 = journal.read()
+        assert t0 is not None
+        time.sleep(0.3)
+        assert journal.read() > t0
+        assert 3 <= journal.flushes <= 8
+    finally:
+        journal.stop(clean=False)
+    assert journal.read() is not None  # an unclean stop keeps it for recovery
+
+
+def test_recover_closes_the_orphan_at_the_last_heartbeat(tt_env):
+    db, core, heartbeat, _base = _setup(tt_env)
+    con = db.connect()
+    log = DummyLogger()
+    day = dt.date(2024, 5, 6)
+    nine = core.local_midnight(day) + 9 * 3600
+    con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES(?,?,?)", (day.isoformat(), nine, "active"))
+    con.commit()
+    journal = heartbeat.HeartbeatJournal(interval=60)
+    assert heartbeat.recover(con, journal, log) is None  # no heartbeat: leave it as it was
+
+    journal.beat(nine + 3600)
+    journal.flush()
+    assert heartbeat.recover(con, journal, log) == nine + 3600
+    assert db.open_interval(con) is None
+    assert db.daily_totals(con, day.isoformat()) == [(day.isoformat(), 3600.0)]
+    assert heartbeat.recover(con, journal, log) is None
+
+    # the next start opens a fresh interval as usual
+    state = core.TrackerState.load(con)
+    state.ensure_rollover(con, log)
+    assert state.kind == "active" and state.start_ts > nine + 3600
+    con.close()
+
+
+def test_recover_splits_at_midnight_and_spares_newer_intervals(tt_env):
+    db, core, heartbeat, _base = _setup(tt_env)
+    con = db.connect()
+    log = DummyLogger()
+    day = dt.date(2024, 5, 6)
+    midnight = core.local_midnight(day + dt.timedelta(days=1))
+    con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES(?,?,?)",
+                (day.isoformat(), midnight - 600, "pause"))
+    con.commit()
+    journal = heartbeat.HeartbeatJournal(interval=60)
+    journal.beat(midnight + 300)
+    journal.flush()
+    assert heartbeat.recover(con, journal, log) == midnight + 300
+    rows = con.execute("SELECT day, kind, start_ts, end_ts FROM sessions ORDER BY id").fetchall()
+    assert rows == [(day.isoformat(), "pause", midnight - 600, midnight),
+                    ((day + dt.timedelta(days=1)).isoformat(), "pause", midnight, midnight + 300)]
+    assert db.check_rollup(con) == []
+
+    # opened well after the last beat (e.g. the control window without a daemon)
+    later = midnight + 7200
+    con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES(?,?,?)",
+                ((day + dt.timedelta(days=1)).isoformat(), later, "active"))
+    con.commit()
+    assert heartbeat.recover(con, journal, log) is None
+    assert db.open_interval(con)[3] == later
+    con.close()
@@ -0,0 +1,167 @@
+import datetime as dt
+import threading
+import time
+
+import pytest
+
+from conftest import DummyLogger
+
+
+def _setup(tt_env):
+    return tt_env.load("db", "core", "idle")
+
+
+class FakeDesk:
+    """A fake clock and a last-input probe driven by a list of input times."""
+
+    def __init__(self, inputs):
+        self.t = 0.0
+        self.inputs = sorted(inputs)
+        self.probed = 0
+
+    def clock(self):
+        return self.t
+
+    def probe(self):
+        self.probed += 1
+        last = max((i for i in self.inputs if i <= self.t), default=0.0)
+        return self.t - last
+
+
+def _drive(detector, desk, until):
+    """Run the detector's own schedule on the fake clock; return the sample times."""
+    times = []
+    while desk.t < until:
+        times.append(desk.t)
+        desk.t += detector.step()
+    return times
+
+
+def test_idle_is_detected_on_time_and_backdated(tt_env):
+    _db, _core, idle = _setup(tt_env)
+    # typing every 10 s until t=1000, away until t=2000, typing again until 3000
+    desk = FakeDesk([*range(0, 1001, 10), *range(2000, 3001, 10)])
+    events = []
+    detector = idle.IdleDetector(desk.probe, lambda since: events.append(("idle", since, desk.t)),
+                                 lambda since: events.append(("active", since, desk.t)),
+                                 threshold=300, clock=desk.clock)
+    times = _drive(detector, desk, 3600)
+
+    (kind1, since1, seen1), (kind2, since2, seen2), (kind3, since3, seen3) = events
+    assert (kind1, since1) == ("idle", 1000)
+    assert 1300 <= seen1 <= 1300 + detector.min_interval
+    assert (kind2, since2) == ("active", 2000)
+    assert seen2 - 2000 <= detector.idle_interval
+    assert (kind3, since3) == ("idle", 3000)
+
+    # adaptive: a handful of samples while typing, dense only near the
+    # threshold and while idle
+    active_samples = [t for t in times if t <= 1000]
+    assert len(active_samples) <= 6
+    idle_samples = [t for t in times if seen1 <= t <= seen2]
+    assert len(idle_samples) == pytest.approx((seen2 - seen1) / detector.idle_interval, abs=2)
+
+
+def test_hysteresis_and_lock(tt_env):
+    _db, _core, idle = _setup(tt_env)
+    desk = FakeDesk([0])
+    events = []
+    detector = idle.IdleDetector(desk.probe, lambda since: events.append("idle"),
+                                 lambda since: events.append("active"),
+                                 threshold=60, resume_below=5, clock=desk.clock)
+    desk.t = 60
+    assert detector.step() == detector.idle_interval and events == ["idle"]
+    # a stale reading (input 30 s ago, e.g. a coarse probe) does not end idleness
+    desk.inputs.append(40)
+    desk.t = 70
+    detector.step()
+    assert events == ["idle"]
+    desk.inputs.append(69)
+    desk.t = 71
+    assert detector.step() == 60 - 2 and events == ["idle", "active"]
+
+    # while locked nothing is sampled; unlock resets and samples at once
+    detector.set_locked(True)
+    probed = desk.probed
+    desk.t = 1000
+    assert detector.step() is None and desk.probed == probed
+    detector.set_locked(False)
+    assert not detector.idle
+    detector.step()
+    assert events == ["idle", "active", "idle"]
+
+    with pytest.raises(ValueError):
+        idle.IdleDetector(desk.probe, None, None, threshold=5, resume_below=5)
+
+
+def test_detector_thread(tt_env):
+    _db, _core, idle = _setup(tt_env)
+    last_input = [time.time()]
+    went_idle = threading.Event()
+    detector = idle.IdleDetector(lambda: time.time() - last_input[0], lambda since: went_idle.set(),
+                                 lambda since: None, threshold=0.2, resume_below=0.05,
+                                 min_interval=0.01, idle_interval=0.01).start()
+    try:
+        assert went_idle.wait(3.0)
+        assert detector.idle
+    finally:
+        detector.stop()
+
+
+def test_idle_pause_is_backdated_and_resumed_through_core(tt_env):
+    db, core, _idle = _setup(tt_env)
+    con = db.connect()
+    log = DummyLogger()
+    t = db.stored_ts(time.time())  # the DB keeps milliseconds
+    start = db.stored_ts(max(t - 100, core.local_midnight(dt.date.today())))
+    con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES(?,?,?)",
+                (dt.date.today().isoformat(), start, "active"))
+    con.commit()
+    state = core.TrackerState.load(con)
+
+    state.ensure_idle(con, True, start - 50, log)  # never before the open interval
+    assert state.kind == "pause" and state.idle_pause and state.start_ts == start
+    state.ensure_idle(con, True, t, log)  # already paused: nothing happens
+    state.ensure_idle(con, False, t + 60, log)  # nor after now
+    assert state.kind == "active" and not state.idle_pause
+    rows = con.execute("SELECT kind, start_ts, end_ts FROM sessions ORDER BY id").fetchall()
+    assert [r[0] for r in rows] == ["active", "pause", "active"]
+    assert rows[0][1] == rows[0][2] == rows[1][1] == start
+    assert t <= rows[1][2] == rows[2][1] <= db.stored_ts(time.time())
+
+    # a lock's pause is not ended by input
+    state.ensure_mode(con, "pause", log)
+    state.ensure_idle(con, False, time.time(), log)
+    assert state.kind == "pause"
+    # nor is a pause whose idleness a toggle already ended
+    state.ensure_mode(con, "active", log)
+    state.ensure_idle(con, True, time.time(), log)
+    state.ensure_mode(con, "active", log)
+    assert not state.idle_pause
+    con.close()
+
+
+def test_idle_since_before_midnight_lands_on_the_old_day(tt_env):
+    db, core, _idle = _setup(tt_env)
+    con = db.connect()
+    log = DummyLogger()
+    yesterday = dt.date.today() - dt.timedelta(days=1)
+    eleven = dt.datetime.combine(yesterday, dt.time(23, 0)).timestamp()
+    con.execute("INSERT INTO sessions(day,start_ts,kind) VALUES(?,?,?)",
+                (yesterday.isoformat(), eleven, "active"))
+    con.commit()
+
+    state = core.TrackerState.load(con)
+    state.ensure_idle(con, True, eleven + 1800, log)  # idle since 23:30, noticed today
+    state.ensure_rollover(con, log)
+    midnight = core.local_midnight(dt.date.today())
+    rows = con.execute("SELECT day, kind, start_ts, end_ts FROM sessions ORDER BY id").fetchall()
+    assert rows == [
+        (yesterday.isoformat(), "active", eleven, eleven + 1800),
+        (yesterday.isoformat(), "pause", eleven + 1800, midnight),
+        (dt.date.today().isoformat(), "pause", midnight, None),
+    ]
+    assert state.idle_pause  # the midnight split keeps it resumable
+    state.ensure_idle(con, False, time.time(), log)
+    assert state.kind == "active"
+    con.close()
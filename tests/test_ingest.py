@@ -0,0 +1,115 @@
+import datetime as dt
+import time
+
+from conftest import DummyLogger
+
+
+def _setup(tt_env):
+    return tt_env.load("db", "core", "ingest")
+
+
+def test_coalesce(tt_env):
+    _db, core, _ingest = _setup(tt_env)
+    c = core.coalesce
+    assert c([], "active", 2) == []
+    assert c([(10, "active"), (11, "active")], "active", 2) == []
+    assert c([(10, "pause"), (20, "active")], "active", 2) == [(10, "pause"), (20, "active")]
+    # a 0.3 s lock leaves nothing, a run of flaps ends in the settled mode
+    assert c([(10, "pause"), (10.3, "active")], "active", 2) == []
+    assert c([(10, "pause"), (10.5, "active"), (11, "pause"), (11.2, "active"), (11.4, "pause")],
+             "active", 2) == [(11.4, "pause")]
+    # only the short interval goes; the long one before it stays
+    assert c([(10, "pause"), (30, "active"), (30.5, "pause")], "active", 2) == [(10, "pause")]
+    assert c([(10, "pause"), (10.3, "active")], "active", 0) == [(10, "pause"), (10.3, "active")]
+
+
+def test_ingest_writes_one_transaction(tt_env):
+    db, core, _ingest = _setup(tt_env)
+    con = db.connect()
+    clock = core.ManualClock(core.local_midnight(dt.date(2024, 5, 6)) + 12 * 3600)
+    state = core.TrackerState(clock)
+    log = DummyLogger()
+    state.ensure_mode(con, "active", log)
+    t = clock.t
+    clock.t = t + 60
+    events = [(t + 10, "pause"), (t + 10.2, "active"), (t + 10.4, "pause"), (t + 10.6, "active"),
+              (t + 20, "pause"), (t + 20.1, "pause"), (t + 50, "active")]
+    commits = con.commits
+    assert state.ingest(con, events, log, debounce=2) == [(t + 20, "pause"), (t + 50, "active")]
+    assert con.commits == commits + 1
+    assert len(log.lines) == 2  # the initial switch, then one line for the batch
+    rows = con.execute("SELECT kind, start_ts, end_ts FROM sessions ORDER BY id").fetchall()
+    assert rows == [("active", t, t + 20), ("pause", t + 20, t + 50), ("active", t + 50, None)]
+    # a burst that settles where it started writes nothing
+    assert state.ingest(con, [(t + 55, "pause"), (t + 55.5, "active")], log, debounce=2) == []
+    assert con.commits == commits + 1
+    con.close()
+
+
+def test_ingester_batches_a_burst(tt_env):
+    db, core, ingest = _setup(tt_env)
+    service = db.DBService().start()
+    state = core.TrackerState()
+    log = DummyLogger()
+    service.call(state.ensure_mode, "active", log, write=True)
+    jobs = []
+
+    def submit(fn, *args):
+        jobs.append(args)
+        return service.submit(fn, *args, write=True)
+
+    ingester = ingest.EventIngester(state, submit, debounce=0.2, log=log).start()
+    try:
+        t = time.time()
+        for i, mode in enumerate(["pause", "active"] * 5 + ["pause"]):
+            ingester.add(mode, t + i * 0.01)  # RDP-style flapping, settling on locked
+        assert _wait_for(lambda: state.kind == "pause")
+        assert len(jobs) == 1 and ingester.events == 11
+        # a toggle on the DB thread writes what is pending first, in order
+        ingester.debounce = 30.0
+        ingester.add("active", time.time())
+        service.call(ingester.flush, write=True)
+        assert state.kind == "active" and len(jobs) == 1
+    finally:
+        ingester.stop()
+        service.stop()
+    con = db.connect(profile="reader")
+    kinds = [r[0] for r in con.execute("SELECT kind FROM sessions ORDER BY id")]
+    con.close()
+    assert kinds == ["active", "pause", "active"]
+    assert ingester.batches == 2 and ingester.events == 12
+
+
+def test_toggle_queued_before_the_batch_is_not_overridden(tt_env):
+    db, core, ingest = _setup(tt_env)
+    con = db.connect()
+    state = core.TrackerState()
+    log = DummyLogger()
+    state.ensure_mode(con, "active", log)
+    queue = []  # the DB thread's queue, run by hand below
+    ingester = ingest.EventIngester(state, lambda fn, *args: queue.append((fn, args)),
+                                    debounce=0.05, log=log).start()
+    try:
+        ingester.add("pause")
+
+        def toggle(con):  # an IPC toggle, queued before the debounce expires
+            ingester.flush(con)
+            state.ensure_mode(con, "active", log)
+
+        queue.append((toggle, ()))
+        assert _wait_for(lambda: len(queue) == 2)
+    finally:
+        ingester.stop()
+    for fn, args in queue:
+        fn(con, *args)
+    assert state.kind == "active"
+    kinds = [r[0] for r in con.execute("SELECT kind FROM sessions ORDER BY id")]
+    assert kinds == ["active", "pause", "active"]
+    con.close()
+
+
+def _wait_for(pred, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not pred() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return pred()
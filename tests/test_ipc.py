@@ -0,0 +1,157 @@
+import os
+import shutil
+import socket
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import DummyLogger
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets only")
+
+
+@pytest.fixture
+def daemon(tt_env, monkeypatch):
+    """A headless tracker daemon: DBService + TrackerState + counter + IpcServer."""
+    # pytest's tmp_path can exceed the ~100 byte AF_UNIX limit; keep the socket short
+    sock_dir = tempfile.mkdtemp(prefix="tt-", dir="/tmp")
+    monkeypatch.setenv("IPC_ADDRESS", str(Path(sock_dir) / "tt.sock"))
+    db, core, counter, ipc = tt_env.load("db", "core", "counter", "ipc")
+
+    service = db.DBService().start()
+    state = core.TrackerState()
+    active = counter.ActiveCounter(resync_every=None)
+    state.listeners.append(lambda con, _state: active.load(con))
+
+    def apply_mode(con, mode):
+        state.ensure_rollover(con, DummyLogger())
+        state.ensure_mode(con, mode, DummyLogger())
+
+    service.call(active.load)
+    service.call(apply_mode, "active", write=True)
+    server = ipc.IpcServer(ipc.TrackerCommands(service, state, active, apply_mode)).start()
+    yield ipc, db, server
+    server.stop()
+    service.stop()
+    shutil.rmtree(sock_dir, ignore_errors=True)
+
+
+def test_status_toggle_today(daemon):
+    ipc, db, server = daemon
+    client = ipc.IpcClient()
+    status = client.request("status")
+    assert status["ok"] and status["mode"] == "active"
+
+    assert client.request("toggle")["mode"] == "pause"
+    assert client.request("toggle")["mode"] == "active"
+    assert client.request("toggle", mode="active")["mode"] == "active"
+    today = client.request("today")
+    assert today["active"] >= 0 and today["pause"] >= 0
+
+    # every write went through the daemon's DB thread
+    con = db.connect(profile="reader")
+    kinds = [k for (k,) in con.execute("SELECT kind FROM sessions ORDER BY id")]
+    con.close()
+    assert kinds == ["active", "pause", "active"]
+
+    with pytest.raises(ipc.IpcError, match="unknown command"):
+        client.request("format-disk")
+    with pytest.raises(ipc.IpcError, match="unknown mode"):
+        client.request("toggle", mode="asleep")
+
+
+def test_subscribe_gets_every_transition(daemon):
+    ipc, _db, server = daemon
+    client = ipc.IpcClient()
+    stop = threading.Event()
+    events = []
+    first = threading.Event()
+
+    def listen():
+        for event in client.subscribe(stop, poll=0.05):
+            events.append(event["mode"])
+            first.set()
+
+    t = threading.Thread(target=listen)
+    t.start()
+    assert first.wait(5.0)
+    client.request("toggle")
+    client.request("toggle")
+    deadline = time.monotonic() + 5.0
+    while len(events) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stop.set()
+    t.join(5.0)
+    assert events == ["active", "pause", "active"]
+
+
+def test_client_without_daemon_and_stale_socket(daemon):
+    ipc, _db, server = daemon
+    address = server.address
+    server.stop()
+    assert not Path(address).exists()
+    client = ipc.IpcClient()
+    assert not client.available()
+    with pytest.raises(ipc.DaemonUnavailable):
+        client.request("status")
+
+    # a socket file left by a crashed daemon is replaced, a live one is not
+    leftover = socket.socket(socket.AF_UNIX)
+    leftover.bind(address)
+    leftover.close()
+    assert Path(address).exists()
+    server.start()
+    assert client.available()
+    with pytest.raises(RuntimeError, match="another tracker daemon"):
+        ipc.IpcServer(server.commands, address).start()
+
+
+def test_lost_reply_is_not_daemon_unavailable(daemon):
+    ipc, _db, server = daemon
+    from multiprocessing.connection import Listener
+
+    # a daemon that takes the request but is too slow to answer
+    address = str(Path(server.address).with_name("slow.sock"))
+    listener = Listener(address, family="AF_UNIX")
+    received = []
+    accepted = threading.Event()
+
+    def slow():
+        conn = listener.accept()
+        received.append(conn.recv_bytes())
+        accepted.wait(5.0)
+        conn.close()
+
+    t = threading.Thread(target=slow, daemon=True)
+    t.start()
+    client = ipc.IpcClient(address, timeout=0.2)
+    with pytest.raises(ipc.NoReply) as err:
+        client.request("toggle")
+    assert not isinstance(err.value, ipc.DaemonUnavailable)  # callers must not redo the write
+    assert received
+    accepted.set()
+    t.join(5.0)
+    listener.close()
+
+
+def test_socket_is_private_from_the_moment_it_is_bound(daemon, monkeypatch):
+    ipc, _db, server = daemon
+    server.stop()
+    modes = []
+    real_listener = ipc.Listener
+
+    def listener(address, **kwargs):
+        bound = real_listener(address, **kwargs)
+        modes.append(stat.S_IMODE(os.stat(address).st_mode))
+        return bound
+    monkeypatch.setattr(ipc, "Listener", listener)
+    umask = os.umask(0o022)
+    try:
+        server.start()
+    finally:
+        assert os.umask(umask) == 0o022  # the process umask is restored
+    assert modes == [0o600]
@@ -0,0 +1,171 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "mkfifo") or not hasattr(socket, "AF_UNIX"),
+                                reason="POSIX only")
+
+DBUS_OUTPUT = """\
+signal time=1700000000.1 sender=org.freedesktop.DBus -> destination=:1.90 serial=2 path=/org/freedesktop/DBus; interface=org.freedesktop.DBus; member=NameAcquired
+   string ":1.90"
+signal time=1700000001.2 sender=:1.3 -> destination=(null destination) serial=811 path=/org/freedesktop/login1/session/_32; interface=org.freedesktop.login1.Session; member=Lock
+signal time=1700000001.3 sender=:1.3 -> destination=(null destination) serial=812 path=/org/freedesktop/login1/session/_32; interface=org.freedesktop.DBus.Properties; member=PropertiesChanged
+   string "org.freedesktop.login1.Session"
+   array [
+      dict entry(
+         string "IdleHint"
+         variant             boolean false
+      )
+      dict entry(
+         string "LockedHint"
+         variant             boolean true
+      )
+   ]
+   array [
+   ]
+signal time=1700000002.0 sender=:1.3 -> destination=(null destination) serial=813 path=/org/freedesktop/login1; interface=org.freedesktop.login1.Manager; member=PrepareForSleep
+   boolean true
+signal time=1700000900.0 sender=:1.3 -> destination=(null destination) serial=814 path=/org/freedesktop/login1; interface=org.freedesktop.login1.Manager; member=PrepareForSleep
+   boolean false
+signal time=1700000901.0 sender=:1.3 -> destination=(null destination) serial=815 path=/org/freedesktop/login1/session/c7; interface=org.freedesktop.login1.Session; member=Unlock
+signal time=1700000902.0 sender=:1.3 -> destination=(null destination) serial=816 path=/org/freedesktop/login1/session/_32; interface=org.freedesktop.login1.Session; member=Unlock
+signal time=1700000903.0 sender=:1.3 -> destination=(null destination) serial=817 path=/org/freedesktop/login1; interface=org.freedesktop.login1.Manager; member=PrepareForSleep
+   boolean true
+signal time=1700000950.0 sender=:1.3 -> destination=(null destination) serial=818 path=/org/freedesktop/login1; interface=org.freedesktop.login1.Manager; member=PrepareForSleep
+   boolean false
+"""
+
+
+@pytest.fixture
+def linux(tt_env, monkeypatch):
+    sock_dir = tempfile.mkdtemp(prefix="tt-", dir="/tmp")
+    for k, v in {
+        "IPC_ADDRESS": str(Path(sock_dir) / "tt.sock"),
+        "LINUX_EVENT_SOURCE": "",
+        "EVENT_DEBOUNCE_SEC": "0",  # every event is a row; test_ingest covers debouncing
+    }.items():
+        monkeypatch.setenv(k, v)
+    db, _core, ipc, _ingest, _heartbeat, _engine, linux = tt_env.load(
+        "db", "core", "ipc", "ingest", "heartbeat", "engine", "platform.linux")
+    yield linux, db, ipc, tt_env.base
+    shutil.rmtree(sock_dir, ignore_errors=True)
+
+
+def _kinds(db):
+    con = db.connect(profile="reader")
+    rows = con.execute("SELECT kind, end_ts IS NULL FROM sessions ORDER BY id").fetchall()
+    con.close()
+    return rows
+
+
+def _wait_for(pred, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not pred() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return pred()
+
+
+def test_logind_parser(linux):
+    mod = linux[0]
+    assert mod.session_path("2") == "/org/freedesktop/login1/session/_32"
+    assert mod.session_path("c7") == "/org/freedesktop/login1/session/c7"
+
+    parser = mod.LogindParser(mod.session_path("2"))
+    events = [e for line in DBUS_OUTPUT.splitlines() for e in parser.feed(line)]
+    # Lock, LockedHint, sleep, resume (still locked), Unlock, sleep, resume
+    assert events == ["pause", "pause", "pause", "resume", "active", "pause", "resume", "active"]
+
+    # without a session every session counts, including c7's Unlock
+    parser = mod.LogindParser()
+    events = [e for line in DBUS_OUTPUT.splitlines() for e in parser.feed(line)]
+    assert events == ["pause", "pause", "pause", "resume", "active", "active", "pause", "resume", "active"]
+
+
+def test_default_source_is_a_fifo_under_base_dir(linux, monkeypatch):
+    mod, _db, _ipc, base = linux
+    monkeypatch.setattr(mod.LogindSource, "available", staticmethod(lambda: False))
+    source = mod.default_source()
+    assert isinstance(source, mod.FileSource) and source.path == base / "events"
+    monkeypatch.setattr(mod, "LINUX_EVENT_SOURCE", "logind")
+    assert isinstance(mod.default_source(), mod.LogindSource)
+
+    # a source without run() fails where it is built, not on the event thread
+    class Incomplete(mod.EventSource):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_fifo_driven_tracker(linux):
+    mod, db, ipc, base = linux
+    fifo = base / "events"
+    tracker = mod.LinuxTracker(mod.FileSource(fifo, poll=0.05))
+    stop = threading.Event()
+    t = threading.Thread(target=tracker.run, args=(stop,))
+    t.start()
+    assert _wait_for(fifo.exists)
+
+    def send(word):
+        with open(fifo, "w") as f:  # one writer per event, like `echo lock > events`
+            f.write(word + "\n")
+
+    send("lock")
+    assert _wait_for(lambda: [k for k, _ in _kinds(db)] == ["active", "pause"])
+    assert ipc.IpcClient().request("status")["mode"] == "pause"
+    send("bogus")
+    send("resume")  # re-arms the rollover timer, no write
+    send("unlock")
+    assert _wait_for(lambda: [k for k, _ in _kinds(db)] == ["active", "pause", "active"])
+
+    stop.set()
+    t.join(10.0)
+    assert not t.is_alive()
+    assert not any(is_open for _, is_open in _kinds(db))
+    assert not ipc.IpcClient().available()
+    assert tracker.engine.rollover.rearmed == 1
+    assert tracker.engine.heartbeat.read() is None  # a clean stop leaves nothing to recover
+
+
+def test_file_replay_ends_the_tracker(linux):
+    mod, db, _ipc, base = linux
+    events = base / "replay.txt"
+    base.mkdir(parents=True, exist_ok=True)
+    events.write_text("# load test\n" + "lock\nunlock\n" * 200 + "lock", encoding="utf-8")
+
+    tracker = mod.LinuxTracker(mod.FileSource(events, from_start=True, follow=False))
+    t = threading.Thread(target=tracker.run)
+    t.start()
+    t.join(30.0)
+    assert not t.is_alive()
+    rows = _kinds(db)
+    assert len(rows) == 1 + 401
+    assert rows[-1] == ("pause", 0)
+
+
+def test_clean_stop_closes_the_interval_while_ipc_is_up(linux):
+    mod, db, ipc, base = linux
+    tracker = mod.LinuxTracker(mod.FileSource(base / "events", poll=0.05))
+    stop = threading.Event()
+    t = threading.Thread(target=tracker.run, args=(stop,), kwargs={"detect_idle": False})
+    t.start()
+    assert _wait_for(ipc.IpcClient().available)
+
+    modes = []
+    sub = threading.Thread(target=lambda: modes.extend(e["mode"] for e in ipc.IpcClient().subscribe()))
+    sub.start()
+    assert _wait_for(lambda: modes == ["active"])
+    stop.set()
+    t.join(10.0)
+    sub.join(5.0)
+    # a GUI following the daemon sees it stop tracking before it sees it go away
+    assert modes == ["active", None]
+    assert not any(is_open for _, is_open in _kinds(db))
+    with pytest.raises(RuntimeError):
+        tracker.engine._apply_mode(None, "active")  # a toggle racing stop() is refused
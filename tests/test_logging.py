@@ -0,0 +1,86 @@
+import logging
+import threading
+
+
+def _setup(tt_env, level="INFO"):
+    monkeypatch = tt_env.monkeypatch
+    log_path = tt_env.base / "logs" / "timetracker.log"
+    monkeypatch.setenv("LOG_PATH", str(log_path))
+    monkeypatch.setenv("LOG_LEVEL", level)
+    # a fresh `tt` logger for this test; the previous one comes back afterwards
+    root = logging.getLogger("tt")
+    monkeypatch.setattr(root, "handlers", [])
+    monkeypatch.setattr(root, "_configured", False, raising=False)
+    monkeypatch.setattr(root, "level", root.level)
+    logging_setup = tt_env.load("logging_setup")
+    for h in logging.getLogger("tt").handlers:
+        if type(h) is logging.StreamHandler:
+            monkeypatch.setattr(h, "stream", open(tt_env.tmp_path / "console.txt", "w"))
+    return logging_setup, log_path
+
+
+def test_log_file_is_created_on_first_record(tt_env):
+    logging_setup, log_path = _setup(tt_env)
+    log = logging_setup.get_logger("tt.test")
+    assert log.handlers == []  # children propagate to the shared `tt` handlers
+    assert not log_path.parent.exists()
+
+    log.debug("per-event detail")  # gated at INFO: never formatted or written
+    assert not log_path.parent.exists()
+    log.info("hello %s", "file")
+    text = log_path.read_text(encoding="utf-8")
+    assert "hello file" in text and "per-event detail" not in text
+
+
+def test_async_mode_writes_off_thread_and_flushes_on_stop(tt_env, monkeypatch):
+    logging_setup, log_path = _setup(tt_env)
+    log = logging_setup.get_logger("tt.test")
+    root = logging.getLogger("tt")
+    direct = list(root.handlers)
+
+    writers = set()
+    file_handler = next(h for h in direct if type(h) is not logging.StreamHandler)
+    original_emit = file_handler.emit
+
+    def spy(record):
+        writers.add(threading.current_thread().name)
+        original_emit(record)
+    monkeypatch.setattr(file_handler, "emit", spy)
+
+    logging_setup.start_async()
+    logging_setup.start_async()  # idempotent
+    assert len(root.handlers) == 1 and type(root.handlers[0]).__name__ == "QueueHandler"
+    for i in range(500):
+        log.info("event %d", i)
+    logging_setup.stop_async()
+
+    assert root.handlers == direct
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 500 and lines[-1].endswith("event 499")
+    assert threading.current_thread().name not in writers
+
+    log.info("direct again")
+    assert log_path.read_text(encoding="utf-8").splitlines()[-1].endswith("direct again")
+
+
+def test_debug_level_enables_per_event_lines(tt_env):
+    logging_setup, log_path = _setup(tt_env, level="DEBUG")
+    logging_setup.get_logger("tt.db").debug("Switched interval: id=%s", 7)
+    assert "Switched interval: id=7" in log_path.read_text(encoding="utf-8")
+
+
+def test_records_logged_while_the_listener_stops_are_kept(tt_env, monkeypatch):
+    logging_setup, log_path = _setup(tt_env)
+    log = logging_setup.get_logger("tt.test")
+    logging_setup.start_async()
+    listener = logging_setup._listener
+    real_stop = listener.stop
+
+    def stop_then_log():
+        real_stop()  # the sentinel is queued: nothing reads the queue any more
+        t = threading.Thread(target=log.info, args=("logged by the DB thread at shutdown",))
+        t.start()
+        t.join()
+    monkeypatch.setattr(listener, "stop", stop_then_log)
+    logging_setup.stop_async()
+    assert "logged by the DB thread at shutdown" in log_path.read_text(encoding="utf-8")
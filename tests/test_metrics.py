@@ -0,0 +1,73 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+from conftest import DummyLogger
+
+
+def _setup(tt_env):
+    return (*tt_env.load("metrics", "db", "core"), tt_env.base)
+
+
+def test_histogram_quantiles():
+    repo_root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(repo_root / "src"))
+    from timetracker import metrics
+
+    reg = metrics.Registry()
+    for _ in range(90):
+        reg.observe("x", 0.0002)  # 100-250 us bucket
+    for _ in range(10):
+        reg.observe("x", 0.2)  # 100-250 ms bucket
+    hist = reg.snapshot()["x"]
+    assert hist["count"] == 100
+    assert abs(hist["sum"] - (90 * 0.0002 + 10 * 0.2)) < 1e-9
+    assert 1e-4 <= metrics.quantile(hist, 0.5) <= 2.5e-4
+    assert 0.1 <= metrics.quantile(hist, 0.95) <= 0.2
+    assert metrics.quantile(hist, 1.0) == hist["max"] == 0.2
+    assert metrics.quantile({"count": 0, "buckets": [], "max": 0}, 0.5) == 0.0
+
+
+def test_hot_paths_are_recorded_and_flushed(tt_env, monkeypatch, capsys):
+    metrics, db, core, base = _setup(tt_env)
+    con = db.connect()
+    state = core.TrackerState.load(con)
+    state.ensure_rollover(con, DummyLogger())
+    for mode in ("pause", "pause", "active"):
+        state.ensure_mode(con, mode, DummyLogger())
+    db.daily_totals(con, "2000-01-01")
+
+    snap = metrics.REGISTRY.snapshot()
+    assert snap["core.ensure_mode"]["count"] == 3
+    assert snap["core.ensure_rollover"]["count"] == 1
+    assert snap["db.switch_interval"]["count"] == 3
+    assert snap["db.daily_totals"]["count"] == 1
+
+    metrics.REGISTRY.flush()
+    assert not (base / "metrics").exists()  # nothing is written before init()
+
+    monkeypatch.setattr(metrics.REGISTRY, "process", None)  # restored after the test
+    # observe() stays in memory; the registry's own thread writes, even when idle
+    metrics.REGISTRY.start("test", interval=0.05)
+    try:
+        path = base / "metrics" / "test.json"
+        deadline = time.monotonic() + 5.0
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        metrics.REGISTRY.stop()
+    assert metrics.REGISTRY._thread is None
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["process"] == "test"
+    assert data["metrics"]["core.ensure_mode"]["count"] == 3
+
+    prom = (base / "metrics" / "test.prom").read_text(encoding="utf-8")
+    assert "# TYPE timetracker_call_seconds histogram" in prom
+    assert 'timetracker_call_seconds_count{process="test",name="core.ensure_mode"} 3' in prom
+    assert 'name="core.ensure_mode",le="+Inf"} 3' in prom
+
+    metrics.main([])
+    out = capsys.readouterr().out
+    assert "[test]" in out and "core.ensure_mode" in out and "p95 ms" in out
+    con.close()
@@ -0,0 +1,85 @@
+import datetime as dt
+
+import pytest
+
+
+def _setup(tt_env):
+    return (*tt_env.load("db", "core", "replay"), tt_env.base)
+
+
+def test_hand_written_trace_across_midnight(tt_env):
+    db, core, replay, base = _setup(tt_env)
+    day = dt.date(2024, 3, 9)
+    m = core.local_midnight(day + dt.timedelta(days=1))
+    trace = base / "trace.txt"
+    base.mkdir(parents=True)
+    trace.write_text("\n".join([
+        "# a late evening",
+        f"{m - 3600} unlock",    # starts active at 23:00
+        f"{m - 1800} lock",      # pause 23:30
+        f"{m - 1200} suspend",   # still pause
+        f"{m - 600} resume",     # locked: stays paused
+        f"{m} tick",             # the midnight timer
+        f"{m + 900} unlock",     # active 00:15
+        f"{m + 2700} lock",      # pause 00:45
+        f"{m + 3600} tick",
+    ]) + "\n", encoding="utf-8")
+
+    con = db.connect(path=base / "replay.db")
+    report = replay.replay(replay.read_trace(trace), con)
+    assert report["mismatches"] == {}
+    assert report["totals"] == {
+        day.isoformat(): (1800.0, 1800.0),
+        (day + dt.timedelta(days=1)).isoformat(): (1800.0, 1800.0),
+    }
+    # active, pause, midnight split, active, pause: one commit per write + the final close
+    assert report["transitions"] == 5
+    assert report["commits"] == 6
+    assert report["rows"] == 5
+    con.close()
+
+
+def test_generated_trace_matches_and_batches(tt_env):
+    db, _core, replay, base = _setup(tt_env)
+    start = dt.date(2024, 3, 28)  # spans a DST change in most zones
+    events = list(replay.generate(3000, start, days=5, seed=7))
+    assert events == list(replay.generate(3000, start, days=5, seed=7))
+    assert len(events) == 3000
+    assert sum(1 for _, e in events if e == "tick") >= 4
+    assert all(a[0] <= b[0] for a, b in zip(events, events[1:]))
+
+    one = db.connect(path=base / "one.db")
+    report = replay.replay(iter(events), one)
+    assert report["events"] == 3000 and report["mismatches"] == {}
+    assert report["commits"] == report["transitions"] + 1
+    assert 5 <= report["days"] <= 6
+
+    batched = db.connect(path=base / "batched.db")
+    report_b = replay.replay(iter(events), batched, batch=500)
+    assert report_b["commits"] == 3000 // 500 + 1
+    assert report_b["totals"] == report["totals"] and report_b["rows"] == report["rows"]
+    one.close()
+    batched.close()
+
+
+def test_trace_files_and_cli(tt_env, capsys):
+    _db, _core, replay, base = _setup(tt_env)
+    base.mkdir(parents=True)
+    saved = base / "saved.txt"
+    report = replay.main(["--generate", "400", "--days", "2", "--save", str(saved),
+                          "--db", str(base / "cli.db"), "--batch", "50"])
+    assert report["events"] == 400 and not report["mismatches"]
+    assert len(saved.read_text(encoding="utf-8").splitlines()) == 400
+    out = capsys.readouterr().out
+    assert "events/s" in out and "per event" in out and "totals match the trace" in out
+
+    with pytest.raises(SystemExit):
+        replay.main(["--generate", "10", "--db", str(base / "cli.db")])  # not a fresh DB
+
+    bad = base / "bad.txt"
+    bad.write_text("100 lock\n50 unlock\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="time goes back"):
+        list(replay.read_trace(bad))
+    bad.write_text("100 sneeze\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="unknown event"):
+        list(replay.read_trace(bad))
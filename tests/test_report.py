@@ -62,3 +62,29 @@ def test_report_last_7_days(tmp_path, monkeypatch):
     output = buf.getvalue()
     assert "Timp activ" in output
     assert today.isoformat() in output
+
+
+def test_report_groups_periods_in_one_pass(tt_env):
+    db, report = tt_env.load("db", "report")
+    con = db.connect(check_same_thread=False)
+    # 2020-12-28 (Mon) .. 2021-01-10 (Sun): ISO weeks 2020-W53 and 2021-W01
+    start = dt.date(2020, 12, 28)
+    for i in range(14):
+        day = (start + dt.timedelta(days=i)).isoformat()
+        con.execute("INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES(?,0,3600,'active')", (day,))
+        con.execute("INSERT INTO sessions(day,start_ts,end_ts,kind) VALUES(?,0,1200,'pause')", (day,))
+    con.commit()
+
+    by_week = report.build(con, "2020-12-28", "2021-01-10", "week")
+    assert by_week == [("2021-W01", 7 * 3600.0, 7 * 1200.0), ("2020-W53", 7 * 3600.0, 7 * 1200.0)]
+    assert [r[0] for r in report.build(con, "2020-12-28", "2021-01-10", "month")] == ["2021-01", "2020-12"]
+    assert report.build(con, "2021-01-01", "2021-01-10", "year") == [("2021", 10 * 3600.0, 10 * 1200.0)]
+
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        report.main(["--from", "2020-12-28", "--to", "2021-01-10", "--by", "month",
+                     "--columns", "active,pause,ratio"])
+    lines = buf.getvalue().splitlines()
+    assert lines[0].split() == ["Luna", "Timp", "activ", "Timp", "pauză", "Activ", "%"]
+    assert lines[2].split() == ["2021-01", "10:00:00", "03:20:00", "75.0%"]
+    assert lines[3].split() == ["2020-12", "04:00:00", "01:20:00", "75.0%"]
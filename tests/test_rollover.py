@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _modules_in_tmp(tt_env):
+    tt_env.load("db", "core", "rollover")
+
+
+def _modules():
+    from timetracker import core, rollover
+    return core, rollover
+
+
+@pytest.fixture
+def berlin(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("needs time.tzset")
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_next_midnight_follows_dst(berlin):
+    core, _ = _modules()
+    # 2024-03-31 is 23 h long in Berlin, 2024-10-27 is 25 h long
+    spring = core.local_midnight("2024-03-31")
+    assert core.next_midnight(spring) - spring == 23 * 3600
+    autumn = core.local_midnight("2024-10-27")
+    assert core.next_midnight(autumn + 3600) - autumn == 25 * 3600
+    # a midnight is not its own successor
+    assert core.next_midnight(spring - 0.001) == spring
+
+
+class FakeClock:
+    """Wall clock = real time + an offset the test can jump."""
+
+    def __init__(self, until_midnight):
+        core, _ = _modules()
+        real = time.time()
+        self.offset = core.next_midnight(real) - until_midnight - real
+
+    def __call__(self):
+        return time.time() + self.offset
+
+
+def _scheduler(clock, **kwargs):
+    _, rollover = _modules()
+    fired = threading.Event()
+    sched = rollover.RolloverScheduler(fired.set, clock=clock, **kwargs)
+    return sched, fired
+
+
+def test_fires_once_at_midnight_and_rearms_for_the_next():
+    clock = FakeClock(until_midnight=0.2)
+    sched, fired = _scheduler(clock)
+    sched.start()
+    first = None
+    try:
+        deadline = time.monotonic() + 2.0
+        while first is None and time.monotonic() < deadline:
+            first = sched.deadline
+            time.sleep(0.01)
+        assert fired.wait(2.0)
+        assert clock() >= first
+        deadline = time.monotonic() + 2.0
+        while sched.deadline == first and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # the next deadline is a day (give or take DST) later, and nothing else fires
+        assert 22 * 3600 <= sched.deadline - first <= 26 * 3600
+        time.sleep(0.1)
+        assert sched.fired == 1
+    finally:
+        sched.stop()
+
+
+def test_wall_clock_jump_past_midnight_fires():
+    clock = FakeClock(until_midnight=3600)
+    sched, fired = _scheduler(clock, max_sleep=0.02)
+    sched.start()
+    try:
+        time.sleep(0.1)
+        assert not fired.is_set()
+        clock.offset += 3601  # e.g. resumed from suspend, or the clock was set
+        assert fired.wait(2.0)
+        assert sched.rearmed == 1
+    finally:
+        sched.stop()
+
+
+def test_rearm_recomputes_without_firing_early():
+    clock = FakeClock(until_midnight=3600)
+    sched, fired = _scheduler(clock)
+    sched.start()
+    try:
+        sched.rearm()
+        deadline = time.monotonic() + 2.0
+        while sched.rearmed == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sched.rearmed == 1
+        assert not fired.is_set()
+    finally:
+        sched.stop()
+    assert sched._thread is None
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _bench():
+    repo_root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(repo_root / "benchmarks"))
+    import bench_startup
+    return bench_startup
+
+
+def test_config_import_has_no_side_effects(tmp_path):
+    bench = _bench()
+    base = tmp_path / "never_created"
+    env = bench.make_env(base)
+    code = "import sys, timetracker.config as c; print('dotenv' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+    assert not base.exists()
+
+    # with a .env file, its values are loaded
+    env_file = tmp_path / "custom.env"
+    env_file.write_text("DB_CACHE_SIZE=-1234\n", encoding="utf-8")
+    env["TT_ENV_FILE"] = str(env_file)
+    env.pop("DB_CACHE_SIZE", None)
+    code = "import timetracker.config as c; print(c.DB_CACHE_SIZE)"
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "-1234"
+    assert not base.exists()
+
+
+@pytest.mark.parametrize("name", ["usage", "report", "export", "rollup", "stats", "status"])
+def test_cold_start_budget(tmp_path, name):
+    bench = _bench()
+    env = bench.prepare(tmp_path)
+    bench.measure(name, env, tmp_path)  # warm-up: writes .pyc files
+    result = min((bench.measure(name, env, tmp_path) for _ in range(3)), key=lambda r: r["import_ms"])
+    loaded = [m for m in bench.FORBIDDEN[name] if m in result["modules"]]
+    assert not loaded, f"{name} imports {loaded}"
+    assert result["import_ms"] <= bench.BUDGET_MS[name], (
+        f"{name}: {result['import_ms']:.1f} ms of imports, budget {bench.BUDGET_MS[name]} ms"
+    )
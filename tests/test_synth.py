@@ -0,0 +1,43 @@
+import datetime as dt
+import sys
+from pathlib import Path
+
+
+def _synth():
+    repo_root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(repo_root / "benchmarks"))
+    sys.path.insert(0, str(repo_root / "src"))
+    import synth
+    return synth
+
+
+def test_generate_is_deterministic_and_exact():
+    synth = _synth()
+    end = dt.date(2024, 6, 14)
+    a = list(synth.generate(5000, seed=7, end_day=end))
+    b = list(synth.generate(5000, seed=7, end_day=end))
+    assert a == b
+    assert len(a) == 5000
+    assert a != list(synth.generate(5000, seed=8, end_day=end))
+
+    # oldest first, contiguous within a day, only the last row open
+    assert [r[0] for r in a] == sorted(r[0] for r in a)
+    assert a[-1][0] == end.isoformat() and a[-1][2] is None
+    assert all(r[2] is not None and r[2] > r[1] for r in a[:-1])
+    assert {r[3] for r in a} == {"active", "pause"}
+
+    # a longer history shares the same recent days
+    assert list(synth.generate(6000, seed=7, end_day=end))[-4000:-1] == a[-4000:-1]
+    assert synth.rows_since(dt.date.fromisoformat(a[0][0]), seed=7, end_day=end) >= 5000
+
+
+def test_populate_matches_rollup(tt_env):
+    synth = _synth()
+    db = tt_env.load("db")
+
+    con = db.connect()
+    assert synth.populate(con, 3000, seed=1, end_day=dt.date(2024, 3, 1), chunk=700) == 3000
+    assert con.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 3000
+    assert con.execute("SELECT COUNT(*) FROM sessions WHERE end_ts IS NULL").fetchone()[0] == 1
+    assert db.check_rollup(con) == []
+    con.close()